@@ -2,7 +2,9 @@ from django.contrib import admin
 
 from .models import (
     IntervieweeBaselineProfile,
+    InterviewerDigest,
     InterviewPrediction,
+    PredictionBatch,
     PredictionTopic,
     PrepProfileSubmission,
     PrepSession,
@@ -58,7 +60,18 @@ class PrepSessionAdmin(ReadOnlyAdmin):
     list_filter = ("status",)
     search_fields = ("prep_id", "title", "company_name", "user__email")
     ordering = ("-created_at",)
-    readonly_fields = ("prep_id", "user", "title", "company_name", "status", "created_at", "updated_at")
+    readonly_fields = (
+        "prep_id",
+        "user",
+        "title",
+        "company_name",
+        "status",
+        "input_fingerprint",
+        "input_fingerprint_version",
+        "current_prediction",
+        "created_at",
+        "updated_at",
+    )
     inlines = [PrepProfileSubmissionInline]
 
 
@@ -89,7 +102,7 @@ class InterviewPredictionAdmin(ReadOnlyAdmin):
     ordering = ("-created_at",)
     readonly_fields = (
         "fingerprint", "prep_session", "user", "prompt_version", "regenerate_nonce",
-        "status", "result_json", "error_text", "last_success_at",
+        "status", "result_json", "error_text", "usage", "batch", "last_success_at",
         "created_at", "updated_at",
     )
     inlines = [PredictionTopicInline]
@@ -118,3 +131,26 @@ class IntervieweeBaselineProfileAdmin(ReadOnlyAdmin):
         "normalized_text", "confidence_flags", "metadata",
         "created_at", "updated_at",
     )
+
+
+@admin.register(InterviewerDigest)
+class InterviewerDigestAdmin(ReadOnlyAdmin):
+    list_display = ("profile_hash", "target", "prompt_version", "hit_count", "last_used_at", "expires_at")
+    search_fields = ("profile_hash", "target")
+    ordering = ("-last_used_at",)
+    readonly_fields = (
+        "profile_hash", "digest", "target", "prompt_version", "hit_count",
+        "created_at", "last_used_at", "expires_at",
+    )
+
+
+@admin.register(PredictionBatch)
+class PredictionBatchAdmin(ReadOnlyAdmin):
+    list_display = ("batch_id", "provider", "model", "status", "request_count", "created_at", "completed_at")
+    list_filter = ("provider", "status")
+    search_fields = ("batch_id",)
+    ordering = ("-created_at",)
+    readonly_fields = (
+        "batch_id", "provider", "model", "status", "request_count", "error_text",
+        "created_at", "updated_at", "completed_at",
+    )
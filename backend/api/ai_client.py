@@ -1,21 +1,58 @@
 # backend/api/ai_client.py
 
+import inspect
 import json
+import random
 import re
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
 
 import requests
 from django.conf import settings
 
+from .profile_trim import budget_predict_people
+from .provider_health import (
+    OUTCOME_FAILURE,
+    OUTCOME_SUCCESS,
+    OUTCOME_TRUNCATED,
+    expected_completion_seconds,
+    provider_health_snapshot,
+    record_provider_outcome,
+)
+from .provider_latency import hedge_deadline
+from .provider_transport import provider_post
+
 
 class AIClientError(Exception):
     pass
 
 
+class AIClientTimeoutError(AIClientError):
+    """The provider did not answer within PROVIDER_REQUEST_TIMEOUT."""
+
+
+class AIOutputTruncatedError(AIClientError):
+    """The model hit its output limit before finishing the payload."""
+
+
+class AIClientCancelledError(AIClientError):
+    """The call lost a hedged race and was cut off mid-response."""
+
+
 # Bump when changing PROMPT_SYSTEM so clients can pass prompt_version to invalidate cache.
 PROMPT_VERSION = "5"
 OUTPUT_MODE = "topics_v1"
 ANTHROPIC_MAX_OUTPUT_TOKENS = 3072
+PROVIDER_REQUEST_TIMEOUT = 200
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+ANTHROPIC_MESSAGES_URL = "https://api.anthropic.com/v1/messages"
+PROVIDER_DISPLAY_NAMES = {
+    "openai": "OpenAI",
+    "anthropic": "Anthropic",
+}
 
 
 PROMPT_SYSTEM = """\
@@ -78,6 +115,67 @@ Return **only** a valid JSON object (no prose before/after, no markdown code fen
 Use tasteful emojis in markdown headings. Keep the markdown concise so the JSON fits in the token budget.\
 """
 
+PROMPT_DIGEST_ADDENDUM = """
+
+## Interviewer digest input
+When `interviewer` contains `digest` instead of `education`/`experience`, step 1 (Map B) has already been done for you: treat `digest` as B's expertise, seniority, domains and tools, and anchor topics to it.\
+"""
+
+
+# Bump when changing PROMPT_INTERVIEWER_DIGEST so stored digests are regenerated.
+DIGEST_PROMPT_VERSION = "1"
+INTERVIEWER_DIGEST_MAX_OUTPUT_TOKENS = 700
+
+PROMPT_INTERVIEWER_DIGEST = """\
+You are InterviewerLens. Summarise one interviewer's LinkedIn profile into a compact digest. A later step uses the digest to predict which topics this interviewer will cover with a candidate.
+
+## Input
+One JSON object with `interviewer` — fields: `name`, `education`, `experience` (scraped LinkedIn text; may be sparse).
+
+## Output contract
+Return **only** a valid JSON object (no prose, no code fences) with these keys:
+- `expertise`: array of 3–8 short strings — B's core technical or functional strengths
+- `seniority`: short string, e.g. `"Staff engineer"` or `"Engineering manager"`
+- `domains`: array of 1–5 industry or product domains
+- `tools`: array of up to 10 tools, languages or frameworks named in the profile
+- `focus_summary`: one or two sentences on what B would most likely probe in an interview
+
+Use only facts in the profile. Do not invent employers, tools, or credentials.\
+"""
+
+
+TOPIC_MAP_TOOL_NAME = "submit_topic_map"
+
+# Output contract of PROMPT_SYSTEM as a JSON schema. Structured output mode
+# sends it as Anthropic's forced tool input schema and OpenAI's strict
+# response_format, so providers return the topic map as an object instead of
+# free text that has to be un-fenced and searched for JSON.
+TOPIC_MAP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "output_mode": {"type": "string", "enum": [OUTPUT_MODE]},
+        "markdown": {"type": "string"},
+        "topics": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "topic_key": {"type": "string"},
+                    "title": {"type": "string"},
+                    "emoji": {"type": "string"},
+                    "likelihood": {"type": "string", "enum": ["HIGH", "MEDIUM", "LOWER"]},
+                    "why": {"type": "string"},
+                    "study_anchors": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["topic_key", "title", "emoji", "likelihood", "why", "study_anchors"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["output_mode", "markdown", "topics"],
+    "additionalProperties": False,
+}
+
 
 @dataclass(frozen=True)
 class ProviderConfig:
@@ -184,17 +282,14 @@ def _normalize_topics_list(raw_topics):
     return normalized
 
 
-def _validate_prediction_payload(parsed: dict, *, raw_content: str = ""):
+def _validate_prediction_payload(parsed: dict, unwrap_nested=True):
     if not isinstance(parsed, dict):
         raise AIClientError("Model response was not a JSON object.")
 
-    if _looks_truncated_json(raw_content):
-        raise AIClientError("Model response appears truncated (incomplete JSON).")
-
     markdown = (parsed.get("markdown") or parsed.get("html") or "").strip()
     topics = _normalize_topics_list(parsed.get("topics"))
 
-    if markdown.startswith("{"):
+    if unwrap_nested and markdown.startswith("{"):
         inner = _extract_json_obj(markdown)
         if isinstance(inner, dict):
             inner_md = (inner.get("markdown") or inner.get("html") or "").strip()
@@ -223,8 +318,56 @@ def _parse_prediction_payload(content):
     parsed = _extract_json_obj(content)
     if parsed is None:
         raise AIClientError("Model response was not valid JSON.")
+    if isinstance(parsed, dict) and _looks_truncated_json(content):
+        raise AIOutputTruncatedError("Model response appears truncated (incomplete JSON).")
+
+    return _validate_prediction_payload(parsed)
+
+
+def _parse_structured_payload(content):
+    """
+    Validate output produced under the TOPIC_MAP_SCHEMA contract. It arrives
+    either as the tool input object itself or as schema-conforming JSON text,
+    so it is decoded at most once and never searched for fences or prose.
+    """
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except json.JSONDecodeError as exc:
+            raise AIClientError("Model response was not valid JSON.") from exc
+    return _validate_prediction_payload(content, unwrap_nested=False)
+
+
+def _partial_json_string(text, key):
+    """Decode the string value of `key` from possibly truncated JSON text, or ""."""
+    match = re.search(rf'"{key}"\s*:\s*"', text)
+    if match is None:
+        return ""
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, match.end() - 1)
+    except ValueError:
+        return ""
+    return value if isinstance(value, str) else ""
 
-    return _validate_prediction_payload(parsed, raw_content=content)
+
+def _salvage_truncated_payload(content):
+    """
+    Rebuild a payload from output cut off mid-way. The markdown summary comes
+    before the topics array, so every topic object that closed before the
+    cut-off is usable. Returns None when fewer than four topics survived.
+    """
+    if isinstance(content, dict):
+        # A truncated tool call still carries whatever input was decoded.
+        content = json.dumps(content)
+    text = re.sub(r"^```(?:json)?\s*\n", "", (content or "").strip())
+    parser = _TopicStreamParser()
+    parser.feed(text)
+    try:
+        return _validate_prediction_payload(
+            {"markdown": _partial_json_string(text, "markdown"), "topics": parser.topics}
+        )
+    except AIClientError:
+        return None
 
 
 def _raise_http_error(provider_name, response, exc):
@@ -301,20 +444,55 @@ def _select_cost_optimized_provider(context, available_configs):
     return ranked[0]
 
 
+def _select_adaptive_provider(context, available_configs):
+    """
+    Route to the provider with the best expected completion time from the
+    rolling health stats, skipping providers whose circuit breaker is open.
+    Providers without enough samples yet are tried first so their stats
+    fill in; ties fall back to AI_PROVIDER_PRIORITY order.
+    """
+    if not available_configs:
+        raise AIClientError("No AI provider credentials configured for adaptive selection.")
+
+    def priority(cfg):
+        if cfg.provider in context.preferred_order:
+            return context.preferred_order.index(cfg.provider)
+        return 9999
+
+    health = {provider: provider_health_snapshot(provider) for provider in available_configs}
+    candidates = [cfg for cfg in available_configs.values() if not health[cfg.provider]["circuit_open"]]
+    if not candidates:
+        # Every provider is ejected; trying one beats failing the job outright.
+        candidates = list(available_configs.values())
+
+    def rank(cfg):
+        expected = expected_completion_seconds(health[cfg.provider])
+        return (expected is not None, expected or 0.0, priority(cfg))
+
+    return min(candidates, key=rank)
+
+
 SELECTION_STRATEGIES = {
     "explicit": _select_explicit_provider,
     "auto": _select_auto_provider,
     "cost_optimized": _select_cost_optimized_provider,
+    "adaptive": _select_adaptive_provider,
 }
 
 
-def _resolve_provider_config():
+def _provider_model(provider):
+    if provider == "anthropic":
+        return (getattr(settings, "ANTHROPIC_MODEL", "") or "claude-sonnet-4-6").strip()
+    return (getattr(settings, "OPENAI_MODEL", "") or "gpt-4o-mini").strip()
+
+
+def _available_provider_configs():
     explicit_provider = (getattr(settings, "AI_PROVIDER", "") or "").strip().lower()
     ai_model = (getattr(settings, "AI_MODEL", "") or "").strip()
     anthropic_key = getattr(settings, "ANTHROPIC_API_KEY", "")
-    anthropic_model = (getattr(settings, "ANTHROPIC_MODEL", "") or "claude-sonnet-4-6").strip()
+    anthropic_model = _provider_model("anthropic")
     openai_key = getattr(settings, "OPENAI_API_KEY", "")
-    openai_model = (getattr(settings, "OPENAI_MODEL", "") or "gpt-4o-mini").strip()
+    openai_model = _provider_model("openai")
     generic_key = getattr(settings, "AI_API_KEY", "")
     context = _build_selection_context(explicit_provider)
 
@@ -359,7 +537,12 @@ def _resolve_provider_config():
         raise AIClientError(
             "No AI provider API key configured. Set ANTHROPIC_API_KEY or OPENAI_API_KEY in backend/.env"
         )
+    return context, available_configs
+
 
+def _resolve_provider_config():
+    context, available_configs = _available_provider_configs()
+    explicit_provider = context.explicit_provider
     if explicit_provider:
         return _select_explicit_provider(context, available_configs)
 
@@ -367,97 +550,633 @@ def _resolve_provider_config():
     return selector(context, available_configs)
 
 
+def _hedging_enabled():
+    return bool(getattr(settings, "AI_HEDGING", False))
+
+
+def _resolve_hedge_config(primary):
+    """
+    The provider a hedged request falls back to: the next one in
+    AI_PROVIDER_PRIORITY with credentials, or None when only the primary is
+    configured. AI_MODEL names the primary's model, so the secondary always
+    uses its own provider-specific model setting.
+    """
+    context, available_configs = _available_provider_configs()
+    for provider in [*context.preferred_order, *sorted(available_configs)]:
+        if provider != primary.provider and provider in available_configs:
+            return replace(available_configs[provider], model=_provider_model(provider))
+    return None
+
+
 def _check_stop_reason(provider: str, data: dict):
     if provider == "anthropic":
         stop_reason = data.get("stop_reason") or ""
         if stop_reason == "max_tokens":
-            raise AIClientError("Model output was truncated (max_tokens).")
+            raise AIOutputTruncatedError("Model output was truncated (max_tokens).")
+
+
+class _TopicStreamParser:
+    """
+    Incrementally extract completed objects from the `topics` array of a
+    streamed JSON response.
+
+    Text is fed as it arrives; each time a topic object closes it is
+    normalized and handed to `on_topic`. The full text is still validated
+    by `_finish_generation` once the stream ends.
+    """
+
+    _TOPICS_ARRAY_RE = re.compile(r'"topics"\s*:\s*\[')
+
+    def __init__(self, on_topic=None):
+        self.on_topic = on_topic
+        self.text = ""
+        self.topics = []
+        self._pos = 0
+        self._state = "seek"
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.text += chunk
+        if self._state == "seek":
+            match = self._TOPICS_ARRAY_RE.search(self.text)
+            if match is None:
+                return
+            self._pos = match.end()
+            self._state = "array"
+        if self._state == "array":
+            self._scan()
+
+    def _scan(self):
+        text = self.text
+        index = self._pos
+        while index < len(text):
+            char = text[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = index
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    self._emit(text[self._object_start : index + 1])
+                    self._object_start = None
+            elif char == "]" and self._depth == 0:
+                self._state = "done"
+                index += 1
+                break
+            index += 1
+        self._pos = index
+
+    def _emit(self, raw_object):
+        try:
+            item = json.loads(raw_object)
+        except json.JSONDecodeError:
+            return
+        normalized = _normalize_topics_list([item])
+        if not normalized:
+            return
+        topic = {**normalized[0], "sort_order": len(self.topics)}
+        self.topics.append(topic)
+        if self.on_topic is not None:
+            self.on_topic(topic)
+
+
+def _structured_output_enabled():
+    return bool(getattr(settings, "AI_STRUCTURED_OUTPUT", False))
+
+
+def _streaming_enabled():
+    return bool(getattr(settings, "AI_STREAM_RESPONSES", False))
+
+
+def _prompt_caching_enabled():
+    return bool(getattr(settings, "AI_PROMPT_CACHING", True))
+
+
+def _anthropic_system_blocks(system_prompt):
+    """
+    Split the system prompt into a cacheable static prefix and the remainder.
+
+    The large PROMPT_SYSTEM block is marked with `cache_control` so Anthropic
+    serves it from the prompt cache; any addendum goes after the breakpoint
+    so it never invalidates the cached prefix.
+    """
+    if not _prompt_caching_enabled():
+        return system_prompt
+    static, extra = system_prompt, ""
+    if system_prompt.startswith(PROMPT_SYSTEM):
+        static, extra = PROMPT_SYSTEM, system_prompt[len(PROMPT_SYSTEM) :]
+    blocks = [{"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}]
+    if extra:
+        blocks.append({"type": "text", "text": extra})
+    return blocks
+
+
+def _serialize_user_payload(user_payload):
+    """
+    Put the interviewer ahead of the candidate so requests against the same
+    interviewer share the longest possible prefix after the system prompt
+    (OpenAI caches automatically on exact prefixes).
+    """
+    ordered = {key: user_payload[key] for key in ("interviewer", "interview_context") if key in user_payload}
+    ordered.update(user_payload)
+    return json.dumps(ordered)
+
+
+def _anthropic_user_content(user_payload):
+    """
+    The serialized payload split after the interviewer block, with a second
+    `cache_control` breakpoint there.
+
+    PROMPT_SYSTEM alone is below Anthropic's minimum cacheable length, so the
+    system breakpoint rarely caches on its own; a breakpoint covers the whole
+    prefix before it, so this one caches system prompt plus interviewer and
+    serves every request against the same interviewer from the cache.
+    """
+    content = _serialize_user_payload(user_payload)
+    if not _prompt_caching_enabled() or "interviewer" not in user_payload:
+        return content
+    head = json.dumps({key: user_payload[key] for key in ("interviewer", "interview_context") if key in user_payload})
+    split = len(head) - 1
+    if len(content) <= len(head) or not content.startswith(head[:split]):
+        return content
+    return [
+        {"type": "text", "text": content[:split], "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": content[split:]},
+    ]
+
+
+def _normalize_openai_usage(usage):
+    if not isinstance(usage, dict):
+        return {}
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "input_tokens": int(usage.get("prompt_tokens") or 0),
+        "output_tokens": int(usage.get("completion_tokens") or 0),
+        "cached_input_tokens": int(details.get("cached_tokens") or 0),
+        "cache_write_tokens": 0,
+    }
+
+
+def _normalize_anthropic_usage(usage):
+    if not isinstance(usage, dict):
+        return {}
+    cache_read = int(usage.get("cache_read_input_tokens") or 0)
+    cache_write = int(usage.get("cache_creation_input_tokens") or 0)
+    return {
+        # Anthropic's input_tokens excludes cached reads and writes.
+        "input_tokens": int(usage.get("input_tokens") or 0) + cache_read + cache_write,
+        "output_tokens": int(usage.get("output_tokens") or 0),
+        "cached_input_tokens": cache_read,
+        "cache_write_tokens": cache_write,
+    }
+
+
+def _report_usage(on_usage, provider, usage):
+    if on_usage is None or not usage:
+        return
+    try:
+        on_usage({"provider": provider, **usage})
+    except Exception:
+        # Usage accounting must never fail an otherwise good generation.
+        pass
+
+
+def _sse_payload(line):
+    """Return the `data:` payload of one Server-Sent Event line, or None."""
+    if not line or not line.startswith("data:"):
+        return None
+    return line[len("data:") :].strip()
+
+
+def _iter_sse_data(response):
+    """Yield the `data:` payload of each Server-Sent Event line."""
+    # text/event-stream is always UTF-8, but without a charset in the
+    # Content-Type requests would decode it as ISO-8859-1.
+    response.encoding = "utf-8"
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            data = _sse_payload(line)
+            if data is not None:
+                yield data
+    finally:
+        response.close()
+
+
+class _OpenAIStreamState:
+    """Accumulates one streamed OpenAI chat completion, event by event."""
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.stop_reason = ""
+        self.usage = {}
+
+    def handle(self, data):
+        """Process one SSE payload; returns True once the stream is finished."""
+        if data == "[DONE]":
+            return True
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            return False
+        if event.get("error"):
+            message = event["error"].get("message") or "stream error"
+            raise AIClientError(f"OpenAI stream error: {message}")
+        if event.get("usage"):
+            self.usage = event["usage"]
+        for choice in event.get("choices") or []:
+            delta = choice.get("delta") or {}
+            self.parser.feed(delta.get("content") or "")
+            self.stop_reason = choice.get("finish_reason") or self.stop_reason
+        return False
+
+
+class _AnthropicStreamState:
+    """Accumulates one streamed Anthropic message, event by event."""
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.stop_reason = ""
+        self.usage = {}
+
+    def handle(self, data):
+        """Process one SSE payload; returns True once the stream is finished."""
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            return False
+        event_type = event.get("type")
+        if event_type == "message_start":
+            self.usage.update((event.get("message") or {}).get("usage") or {})
+        elif event_type == "content_block_delta":
+            delta = event.get("delta") or {}
+            if delta.get("type") == "text_delta":
+                self.parser.feed(delta.get("text") or "")
+            elif delta.get("type") == "input_json_delta":
+                # The forced topic map tool streams its input as JSON text.
+                self.parser.feed(delta.get("partial_json") or "")
+        elif event_type == "message_delta":
+            self.stop_reason = (event.get("delta") or {}).get("stop_reason") or self.stop_reason
+            self.usage.update(event.get("usage") or {})
+        elif event_type == "error":
+            message = (event.get("error") or {}).get("message") or "stream error"
+            raise AIClientError(f"Anthropic stream error: {message}")
+        elif event_type == "message_stop":
+            return True
+        return False
+
+
+STREAM_STATES = {
+    "openai": _OpenAIStreamState,
+    "anthropic": _AnthropicStreamState,
+}
 
 
-def _generate_with_openai(config, user_payload):
+def _consume_stream(provider, response, parser, cancellation=None):
+    state = STREAM_STATES[provider](parser)
+    for data in _iter_sse_data(response):
+        if cancellation is not None:
+            cancellation.check()
+        if state.handle(data):
+            break
+    return state
+
+
+def _build_openai_request(config, user_payload, system_prompt, stream):
     body = {
         "model": config.model,
         "messages": [
-            {"role": "system", "content": PROMPT_SYSTEM},
-            {"role": "user", "content": json.dumps(user_payload)},
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": _serialize_user_payload(user_payload)},
         ],
         "response_format": {"type": "json_object"},
         "max_tokens": ANTHROPIC_MAX_OUTPUT_TOKENS,
     }
+    if _structured_output_enabled():
+        body["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": TOPIC_MAP_TOOL_NAME, "strict": True, "schema": TOPIC_MAP_SCHEMA},
+        }
+    if stream:
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
     headers = {"Authorization": f"Bearer {config.api_key}", "Content-Type": "application/json"}
-
-    try:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=body,
-            timeout=200,
-        )
-        if response.status_code == 404 and config.model.lower().startswith("gpt-5"):
-            body["model"] = "gpt-4o-mini"
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=body,
-                timeout=200,
-            )
-
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.HTTPError as exc:
-        _raise_http_error("openai", response, exc)
-    except requests.exceptions.Timeout as exc:
-        raise AIClientError("OpenAI request timed out") from exc
-    except requests.exceptions.RequestException as exc:
-        raise AIClientError(f"OpenAI network error: {exc}") from exc
-    except Exception as exc:
-        raise AIClientError(f"Unexpected error talking to OpenAI: {exc}") from exc
-
-    choice = data["choices"][0]
-    finish_reason = choice.get("finish_reason") or ""
-    if finish_reason == "length":
-        raise AIClientError("Model output was truncated (max_tokens).")
-
-    content = choice["message"]["content"]
-    return _parse_prediction_payload(content)
+    return OPENAI_CHAT_URL, headers, body
 
 
-def _generate_with_anthropic(config, user_payload):
+def _build_anthropic_request(config, user_payload, system_prompt, stream):
     body = {
         "model": config.model,
         "max_tokens": ANTHROPIC_MAX_OUTPUT_TOKENS,
-        "system": PROMPT_SYSTEM,
+        "system": _anthropic_system_blocks(system_prompt),
         "messages": [
-            {"role": "user", "content": json.dumps(user_payload)},
+            {"role": "user", "content": _anthropic_user_content(user_payload)},
         ],
     }
+    if _structured_output_enabled():
+        body["tools"] = [
+            {
+                "name": TOPIC_MAP_TOOL_NAME,
+                "description": "Submit the interview prep topic map.",
+                "input_schema": TOPIC_MAP_SCHEMA,
+            }
+        ]
+        body["tool_choice"] = {"type": "tool", "name": TOPIC_MAP_TOOL_NAME}
+    if stream:
+        body["stream"] = True
     headers = {
         "x-api-key": config.api_key,
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
+    return ANTHROPIC_MESSAGES_URL, headers, body
+
+
+def _build_anthropic_continuation(config, user_payload, system_prompt, partial):
+    """Resume truncated output by prefilling the assistant turn with it."""
+    url, headers, body = _build_anthropic_request(config, user_payload, system_prompt, False)
+    body["messages"].append({"role": "assistant", "content": partial})
+    return url, headers, body
+
+
+# OpenAI chat completions cannot resume an assistant turn, and a forced tool
+# call cannot be prefilled, so that output goes straight to salvage.
+CONTINUATION_BUILDERS = {
+    "anthropic": _build_anthropic_continuation,
+}
+
+REQUEST_BUILDERS = {
+    "openai": _build_openai_request,
+    "anthropic": _build_anthropic_request,
+}
+
+
+def _openai_model_fallback(config, response, body):
+    """gpt-5 models are not enabled on every account; retry once on gpt-4o-mini."""
+    if response.status_code == 404 and config.model.lower().startswith("gpt-5"):
+        body["model"] = "gpt-4o-mini"
+        return True
+    return False
+
+
+def _tool_input(content):
+    """Return the input of the topic map tool call in an Anthropic content list, or None."""
+    for block in content if isinstance(content, list) else []:
+        if isinstance(block, dict) and block.get("type") == "tool_use" and block.get("name") == TOPIC_MAP_TOOL_NAME:
+            return block.get("input")
+    return None
+
+
+def _read_provider_response(provider, data):
+    """
+    Return `(content, stop_reason, usage)` from a non-streamed response body.
+    `content` is the tool input object for an Anthropic tool call, text otherwise.
+    """
+    if provider == "anthropic":
+        content = data.get("content", [])
+        tool_input = _tool_input(content)
+        if tool_input is None:
+            tool_input = _parse_model_content(content)
+        return tool_input, data.get("stop_reason") or "", data.get("usage")
+    choice = data["choices"][0]
+    message = choice["message"]
+    if message.get("refusal"):
+        raise AIClientError(f"OpenAI refused the request: {message['refusal']}")
+    return message.get("content") or "", choice.get("finish_reason") or "", data.get("usage")
+
+
+USAGE_NORMALIZERS = {
+    "openai": _normalize_openai_usage,
+    "anthropic": _normalize_anthropic_usage,
+}
+
+TRUNCATION_STOP_REASONS = {
+    "openai": "length",
+    "anthropic": "max_tokens",
+}
+
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504, 529})
+
+
+def _retry_attempts():
+    return max(int(getattr(settings, "AI_RETRY_ATTEMPTS", 2)), 0)
 
+
+def _parse_retry_after(value):
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
     try:
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _retry_delay(response, attempt):
+    """
+    Seconds to wait before retrying a 429/5xx response, or None to give up.
+    `Retry-After` wins when present; otherwise exponential backoff with jitter.
+    """
+    max_delay = float(getattr(settings, "AI_RETRY_MAX_DELAY", 30))
+    headers = getattr(response, "headers", None)
+    retry_after = _parse_retry_after(headers.get("retry-after") if hasattr(headers, "get") else None)
+    if retry_after is not None:
+        return retry_after if retry_after <= max_delay else None
+    backoff = float(getattr(settings, "AI_RETRY_BACKOFF", 1.0)) * (2**attempt)
+    return min(backoff, max_delay) * random.uniform(0.5, 1.0)
+
+
+def _should_retry(response, attempt):
+    return attempt < _retry_attempts() and getattr(response, "status_code", None) in RETRYABLE_STATUSES
+
+
+def _post_with_retry(provider, url, headers, body, stream=False):
+    attempt = 0
+    while True:
+        response = provider_post(
+            provider,
+            url,
             headers=headers,
             json=body,
-            timeout=200,
+            timeout=PROVIDER_REQUEST_TIMEOUT,
+            stream=stream,
         )
+        if not _should_retry(response, attempt):
+            return response
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            return response
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def _truncation_recovery_enabled():
+    return bool(getattr(settings, "AI_TRUNCATION_RECOVERY", True))
+
+
+def _should_continue(provider, stop_reason, continuations):
+    return (
+        _truncation_recovery_enabled()
+        and not _structured_output_enabled()
+        and provider in CONTINUATION_BUILDERS
+        and stop_reason == TRUNCATION_STOP_REASONS[provider]
+        and continuations < int(getattr(settings, "AI_TRUNCATION_CONTINUATIONS", 1))
+    )
+
+
+def _merge_usage(first, second):
+    """Sum the raw token counts of an original call and its continuation."""
+    if not isinstance(first, dict):
+        return second
+    if not isinstance(second, dict):
+        return first
+    merged = dict(first)
+    for key, value in second.items():
+        if isinstance(value, int) and isinstance(merged.get(key, 0), int):
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _finish_generation(provider, content, stop_reason, usage, on_usage, continuations=0):
+    """
+    Shared tail of every provider call, sync or async: usage, truncation,
+    validation. Output that is still truncated after any continuations is
+    salvaged down to its complete topics when enough of them survived.
+    """
+    report = USAGE_NORMALIZERS[provider](usage)
+    if continuations and report:
+        report["continuations"] = continuations
+    try:
+        if stop_reason == TRUNCATION_STOP_REASONS[provider]:
+            raise AIOutputTruncatedError("Model output was truncated (max_tokens).")
+        if _structured_output_enabled():
+            payload = _parse_structured_payload(content)
+        else:
+            payload = _parse_prediction_payload(content)
+    except AIOutputTruncatedError:
+        payload = _salvage_truncated_payload(content) if _truncation_recovery_enabled() else None
+        if payload is None:
+            _report_usage(on_usage, provider, report)
+            raise
+        if report:
+            report["salvaged"] = True
+    _report_usage(on_usage, provider, report)
+    return payload
+
+
+def _request_generation(
+    provider,
+    config,
+    user_payload,
+    on_topic=None,
+    system_prompt=PROMPT_SYSTEM,
+    on_usage=None,
+    cancellation=None,
+):
+    provider_name = PROVIDER_DISPLAY_NAMES[provider]
+    # A cancellable call always streams: a buffered body is read inside the
+    # POST, where closing the response cannot stop it.
+    stream = _streaming_enabled() or cancellation is not None
+    url, headers, body = REQUEST_BUILDERS[provider](config, user_payload, system_prompt, stream)
+    parser = _TopicStreamParser(on_topic)
+
+    continuations = 0
+
+    try:
+        response = _post_with_retry(provider, url, headers, body, stream)
+        if provider == "openai" and _openai_model_fallback(config, response, body):
+            response = _post_with_retry(provider, url, headers, body, stream)
+
+        if cancellation is not None:
+            cancellation.track(response)
         response.raise_for_status()
-        data = response.json()
+        if stream:
+            state = _consume_stream(provider, response, parser, cancellation)
+            content, stop_reason, usage = parser.text, state.stop_reason, state.usage
+        else:
+            content, stop_reason, usage = _read_provider_response(provider, response.json())
+
+        while _should_continue(provider, stop_reason, continuations):
+            if cancellation is not None:
+                cancellation.check()
+            partial = content.rstrip()
+            url, headers, body = CONTINUATION_BUILDERS[provider](config, user_payload, system_prompt, partial)
+            response = _post_with_retry(provider, url, headers, body)
+            response.raise_for_status()
+            more, stop_reason, more_usage = _read_provider_response(provider, response.json())
+            if stream:
+                # Keep emitting topics that complete in the continuation.
+                parser.feed(more)
+            content, usage = partial + more, _merge_usage(usage, more_usage)
+            continuations += 1
+    except AIClientError:
+        raise
     except requests.exceptions.HTTPError as exc:
-        _raise_http_error("anthropic", response, exc)
+        _raise_http_error(provider, response, exc)
     except requests.exceptions.Timeout as exc:
-        raise AIClientError("Anthropic request timed out") from exc
+        raise AIClientTimeoutError(f"{provider_name} request timed out") from exc
     except requests.exceptions.RequestException as exc:
-        raise AIClientError(f"Anthropic network error: {exc}") from exc
+        raise AIClientError(f"{provider_name} network error: {exc}") from exc
     except Exception as exc:
-        raise AIClientError(f"Unexpected error talking to Anthropic: {exc}") from exc
+        raise AIClientError(f"Unexpected error talking to {provider_name}: {exc}") from exc
+
+    return _finish_generation(provider, content, stop_reason, usage, on_usage, continuations)
+
 
-    _check_stop_reason("anthropic", data)
-    content = _parse_model_content(data.get("content", []))
-    return _parse_prediction_payload(content)
+def _call_outcome(exc=None):
+    """Map a finished call to its health outcome and whether its duration is a latency sample."""
+    if exc is None:
+        return OUTCOME_SUCCESS, True
+    if isinstance(exc, AIOutputTruncatedError):
+        return OUTCOME_TRUNCATED, True
+    return OUTCOME_FAILURE, isinstance(exc, AIClientTimeoutError)
+
+
+def _generate_with_provider(provider, config, user_payload, **kwargs):
+    """One provider call, with its outcome and latency fed to the rolling health stats."""
+    started = time.monotonic()
+    cancellation = kwargs.get("cancellation")
+    try:
+        result = _request_generation(provider, config, user_payload, **kwargs)
+    except AIClientError as exc:
+        if cancellation is not None and cancellation.cancelled:
+            # Closing the stream under a loser surfaces as a read error;
+            # it says nothing about the provider's health.
+            raise AIClientCancelledError(f"{PROVIDER_DISPLAY_NAMES[provider]} call was cancelled") from exc
+        outcome, timed = _call_outcome(exc)
+        record_provider_outcome(provider, outcome, time.monotonic() - started if timed else None)
+        raise
+    record_provider_outcome(provider, OUTCOME_SUCCESS, time.monotonic() - started)
+    return result
+
+
+def _generate_with_openai(config, user_payload, **kwargs):
+    return _generate_with_provider("openai", config, user_payload, **kwargs)
+
+
+def _generate_with_anthropic(config, user_payload, **kwargs):
+    return _generate_with_provider("anthropic", config, user_payload, **kwargs)
 
 
 PROVIDER_HANDLERS = {
@@ -466,6 +1185,337 @@ PROVIDER_HANDLERS = {
 }
 
 
+class _CallCancellation:
+    """
+    Lets a hedged race stop a losing sync call. `cancel` closes the response
+    the call is streaming, which ends the read on the provider's side and
+    stops it billing output tokens; `check` raises between stream events and
+    before any continuation request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._response = None
+        self.cancelled = False
+
+    def track(self, response):
+        with self._lock:
+            self._response = response
+            cancelled = self.cancelled
+        if cancelled:
+            response.close()
+        self.check()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            response = self._response
+        if response is not None:
+            response.close()
+
+    def check(self):
+        if self.cancelled:
+            raise AIClientCancelledError("Hedged call was cancelled")
+
+
+class _HedgeRace:
+    """
+    Callback gate for a hedged pair of provider calls, shared by the sync and
+    async paths. The first provider to stream a topic owns the topic stream;
+    usage is held back per provider and only the winner's is reported. The
+    winner is decided once, under the lock, by `claim`; from then on every
+    callback is muted and the other calls' cancellations fire, so a losing
+    call still running cannot write topics after the result. Topics the
+    losing owner streamed before that are replaced by the caller along with
+    the final result (`replace_prediction_topics`).
+    """
+
+    def __init__(self, on_topic, on_usage):
+        self._on_topic = on_topic
+        self._on_usage = on_usage
+        self._lock = threading.Lock()
+        self._topic_owner = None
+        self._usage = {}
+        self._cancellations = {}
+        self.winner = None
+        self.finished = False
+        self.hedged = False
+
+    def cancellation(self, provider):
+        """A `_CallCancellation` the race fires if `provider` loses."""
+        cancellation = _CallCancellation()
+        with self._lock:
+            self._cancellations[provider] = cancellation
+            finished = self.finished
+        if finished:
+            cancellation.cancel()
+        return cancellation
+
+    def _owns_topics(self, provider):
+        if self.finished:
+            return False
+        if self._topic_owner is None:
+            self._topic_owner = provider
+        return self._topic_owner == provider
+
+    def callbacks(self, provider):
+        def on_topic(topic):
+            # Held across the callback so `claim` cannot return while a
+            # topic write is still in progress.
+            with self._lock:
+                if not self._owns_topics(provider):
+                    return None
+                written = self._on_topic(topic)
+            if inspect.isawaitable(written):
+                # An async callback only runs once awaited, after the lock is
+                # gone; on the event loop nothing can claim the race between
+                # this re-check and the write starting.
+                return self._write_unless_finished(written)
+            return written
+
+        def on_usage(usage):
+            with self._lock:
+                if not self.finished:
+                    self._usage[provider] = usage
+
+        return {
+            "on_topic": on_topic if self._on_topic is not None else None,
+            "on_usage": on_usage if self._on_usage is not None else None,
+        }
+
+    async def _write_unless_finished(self, written):
+        if self.finished:
+            if inspect.iscoroutine(written):
+                written.close()
+            return None
+        return await written
+
+    def claim(self, provider):
+        """
+        Make `provider` the winner unless another call already won; returns
+        whether it did. The losers are cancelled and the winner's usage is
+        reported outside the lock.
+        """
+        with self._lock:
+            if self.finished:
+                return False
+            self.finished = True
+            self.winner = provider
+            usage = self._usage.get(provider)
+            losers = [c for p, c in self._cancellations.items() if p != provider]
+        for cancellation in losers:
+            cancellation.cancel()
+        if usage is not None and self._on_usage is not None:
+            self._on_usage({**usage, "hedged": self.hedged})
+        return True
+
+
+def _generate_hedged(
+    config,
+    hedge_config,
+    user_payload,
+    *,
+    on_topic=None,
+    system_prompt=PROMPT_SYSTEM,
+    on_usage=None,
+):
+    """
+    Call the primary provider; if it has not answered within its p95 deadline,
+    or fails first, send the same request to `hedge_config` and return the
+    first valid result. Hedged calls stream, and once a winner is claimed the
+    loser's response is closed so it stops reading (and billing) mid-answer.
+    """
+    race = _HedgeRace(on_topic, on_usage)
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="provider-hedge")
+
+    def submit(target):
+        return executor.submit(
+            PROVIDER_HANDLERS[target.provider],
+            target,
+            user_payload,
+            system_prompt=system_prompt,
+            cancellation=race.cancellation(target.provider),
+            **race.callbacks(target.provider),
+        )
+
+    futures = {submit(config): config.provider}
+    errors = {}
+    try:
+        done, _ = wait(futures, timeout=hedge_deadline(config.provider))
+        if not done or next(iter(done)).exception() is not None:
+            race.hedged = True
+            futures[submit(hedge_config)] = hedge_config.provider
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = futures[future]
+                try:
+                    result = future.result()
+                except AIClientError as exc:
+                    errors[provider] = exc
+                    continue
+                if race.claim(provider):
+                    return result
+    finally:
+        # Cancels anything still running if the loop exits without a winner.
+        race.claim(None)
+        executor.shutdown(wait=False, cancel_futures=True)
+    raise errors.get(config.provider) or next(iter(errors.values()))
+
+
+def _draft_tier_enabled():
+    return bool(getattr(settings, "AI_DRAFT_TIER", False))
+
+
+def _resolve_draft_config(config):
+    """The fast DRAFT-tier model on the same provider, or None when it would be the same model."""
+    setting = "AI_DRAFT_MODEL_ANTHROPIC" if config.provider == "anthropic" else "AI_DRAFT_MODEL_OPENAI"
+    model = (getattr(settings, setting, "") or "").strip()
+    if not model or model == config.model:
+        return None
+    return replace(config, model=model)
+
+
+def _with_draft_usage(on_usage, draft_usage):
+    """Attach the draft call's token counts to the refined call's usage report."""
+    if on_usage is None:
+        return None
+
+    def report(usage):
+        on_usage({**usage, "draft": dict(draft_usage)} if draft_usage else usage)
+
+    return report
+
+
+def _generate_with_draft(draft_config, user_payload, system_prompt, on_draft, on_usage, refine):
+    """
+    Run the refined generation (`refine(on_usage)`) and the fast draft model
+    side by side. If the draft finishes first, `on_draft(result)` is called on
+    the caller's thread before waiting for the refined result, which is always
+    what this returns. Draft failures are ignored, and draft calls stay out
+    of the provider health stats since their model is faster.
+    """
+    draft_usage = {}
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="provider-draft")
+    try:
+        draft = executor.submit(
+            _request_generation,
+            draft_config.provider,
+            draft_config,
+            user_payload,
+            system_prompt=system_prompt,
+            on_usage=draft_usage.update,
+        )
+        refined = executor.submit(refine, _with_draft_usage(on_usage, draft_usage))
+        done, _ = wait({draft, refined}, return_when=FIRST_COMPLETED)
+        if refined not in done and draft.exception() is None:
+            try:
+                on_draft(draft.result())
+            except Exception:
+                pass
+        return refined.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _complete_text(config, system_prompt, user_content, max_tokens):
+    """Plain non-streaming completion returning the model's text output."""
+    if config.provider == "anthropic":
+        provider_name = "Anthropic"
+        url = ANTHROPIC_MESSAGES_URL
+        headers = {
+            "x-api-key": config.api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        }
+        body = {
+            "model": config.model,
+            "max_tokens": max_tokens,
+            "system": _anthropic_system_blocks(system_prompt),
+            "messages": [{"role": "user", "content": user_content}],
+        }
+    elif config.provider == "openai":
+        provider_name = "OpenAI"
+        url = OPENAI_CHAT_URL
+        headers = {"Authorization": f"Bearer {config.api_key}", "Content-Type": "application/json"}
+        body = {
+            "model": config.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": max_tokens,
+        }
+    else:
+        raise AIClientError(f"Unsupported AI provider '{config.provider}'")
+
+    try:
+        response = _post_with_retry(config.provider, url, headers, body)
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.HTTPError as exc:
+        _raise_http_error(config.provider, response, exc)
+    except requests.exceptions.Timeout as exc:
+        raise AIClientTimeoutError(f"{provider_name} request timed out") from exc
+    except requests.exceptions.RequestException as exc:
+        raise AIClientError(f"{provider_name} network error: {exc}") from exc
+    except Exception as exc:
+        raise AIClientError(f"Unexpected error talking to {provider_name}: {exc}") from exc
+
+    try:
+        if config.provider == "anthropic":
+            _check_stop_reason("anthropic", data)
+            return _parse_model_content(data.get("content", []))
+        choice = data["choices"][0]
+        if (choice.get("finish_reason") or "") == "length":
+            raise AIOutputTruncatedError("Model output was truncated (max_tokens).")
+        content = choice["message"]["content"]
+    except (AttributeError, IndexError, KeyError, TypeError) as exc:
+        raise AIClientError(f"{provider_name} returned an unexpected response body.") from exc
+    if not isinstance(content, str):
+        raise AIClientError(f"{provider_name} returned no text content.")
+    return content
+
+
+def _string_list(value, limit):
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()][:limit]
+
+
+def _normalize_interviewer_digest(parsed):
+    if not isinstance(parsed, dict):
+        raise AIClientError("Interviewer digest was not a JSON object.")
+    digest = {
+        "expertise": _string_list(parsed.get("expertise"), 8),
+        "seniority": str(parsed.get("seniority") or "").strip(),
+        "domains": _string_list(parsed.get("domains"), 5),
+        "tools": _string_list(parsed.get("tools"), 10),
+        "focus_summary": str(parsed.get("focus_summary") or "").strip(),
+    }
+    if not digest["expertise"] and not digest["focus_summary"]:
+        raise AIClientError("Interviewer digest missing expertise and focus summary.")
+    return digest
+
+
+def generate_interviewer_digest(interviewer):
+    """Stage one of the two-stage pipeline: a reusable 'Map B' for one interviewer."""
+    config = _resolve_provider_config()
+    _, interviewer, _ = budget_predict_people(None, interviewer, provider=config.provider)
+    content = _complete_text(
+        config,
+        PROMPT_INTERVIEWER_DIGEST,
+        json.dumps({"interviewer": interviewer}),
+        INTERVIEWER_DIGEST_MAX_OUTPUT_TOKENS,
+    )
+    return _normalize_interviewer_digest(_extract_json_obj(_strip_markdown_fence(content)))
+
+
 def _normalize_interview_context(interview_context):
     ctx = interview_context or {}
     return {
@@ -474,14 +1524,110 @@ def _normalize_interview_context(interview_context):
     }
 
 
-def generate_questions(interviewee, interviewer, interview_context=None):
+def resolve_generation_target():
+    """`provider:model` that generate_questions would call with current settings."""
     config = _resolve_provider_config()
+    return f"{config.provider}:{config.model}"
+
+
+def _with_trim_report(on_usage, trim_report):
+    def report(usage):
+        on_usage(
+            {
+                **usage,
+                "profile_tokens": trim_report["output_tokens"],
+                "profile_tokens_saved": trim_report["tokens_saved"],
+            }
+        )
+
+    return report
+
+
+def _prepare_generation(interviewee, interviewer, interview_context, interviewer_digest, on_usage, config=None):
+    """Resolve the provider and build the request inputs shared by the sync, async and batch paths."""
+    config = config or _resolve_provider_config()
+    if config.provider not in PROVIDER_HANDLERS:
+        raise AIClientError(f"Unsupported AI provider '{config.provider}'")
+    system_prompt = PROMPT_SYSTEM
+    if interviewer_digest:
+        interviewer = {
+            "name": str((interviewer or {}).get("name") or ""),
+            "digest": interviewer_digest,
+        }
+        system_prompt = PROMPT_SYSTEM + PROMPT_DIGEST_ADDENDUM
+    interviewee, interviewer, trim_report = budget_predict_people(
+        interviewee,
+        interviewer,
+        provider=config.provider,
+    )
+    if on_usage is not None:
+        on_usage = _with_trim_report(on_usage, trim_report)
     user_payload = {
         "interviewee": interviewee,
         "interviewer": interviewer,
         "interview_context": _normalize_interview_context(interview_context),
     }
-    handler = PROVIDER_HANDLERS.get(config.provider)
-    if handler is None:
-        raise AIClientError(f"Unsupported AI provider '{config.provider}'")
-    return handler(config, user_payload)
+    return config, user_payload, system_prompt, on_usage
+
+
+def generate_questions(
+    interviewee,
+    interviewer,
+    interview_context=None,
+    on_topic=None,
+    interviewer_digest=None,
+    on_usage=None,
+    on_draft=None,
+):
+    """
+    Generate the topic map for a candidate/interviewer pair.
+
+    When AI_STREAM_RESPONSES is enabled the provider response is streamed and
+    `on_topic(topic)` is called for each topic as soon as it is complete.
+    `on_usage(usage)` receives the provider's token counts, including how many
+    input tokens were served from the prompt cache, plus the estimated profile
+    tokens kept and saved by AI_PROFILE_TOKEN_BUDGET trimming.
+
+    Passing `interviewer_digest` (from generate_interviewer_digest) runs the
+    cheaper second stage of the two-stage pipeline: the interviewer's full
+    profile text is replaced by the pre-computed digest.
+
+    With AI_HEDGING enabled and a second provider configured, a slow or
+    failing primary is hedged to the secondary (see `_generate_hedged`).
+
+    With AI_DRAFT_TIER enabled, passing `on_draft(result)` also asks the
+    provider's fast draft model for the same topic map; its result is handed
+    to `on_draft` as soon as it arrives, while the return value is always the
+    refined result (see `_generate_with_draft`).
+    """
+    config, user_payload, system_prompt, on_usage = _prepare_generation(
+        interviewee,
+        interviewer,
+        interview_context,
+        interviewer_digest,
+        on_usage,
+    )
+    hedge_config = _resolve_hedge_config(config) if _hedging_enabled() else None
+
+    def refine(on_usage):
+        if hedge_config is not None:
+            return _generate_hedged(
+                config,
+                hedge_config,
+                user_payload,
+                on_topic=on_topic,
+                system_prompt=system_prompt,
+                on_usage=on_usage,
+            )
+        return PROVIDER_HANDLERS[config.provider](
+            config,
+            user_payload,
+            on_topic=on_topic,
+            system_prompt=system_prompt,
+            on_usage=on_usage,
+        )
+
+    draft_config = _resolve_draft_config(config) if on_draft is not None and _draft_tier_enabled() else None
+    if draft_config is None:
+        return refine(on_usage)
+    return _generate_with_draft(draft_config, user_payload, system_prompt, on_draft, on_usage, refine)
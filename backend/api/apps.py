@@ -5,3 +5,7 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        # Registers the User save/delete handlers that keep the user cache fresh.
+        from . import user_cache  # noqa: F401
@@ -0,0 +1,305 @@
+"""
+Async provider client used by the event-loop execution mode.
+
+Request building, stream parsing, usage reporting and payload validation are
+shared with `ai_client`; only the HTTP I/O differs, so both paths return the
+same payloads and raise the same `AIClientError` messages.
+"""
+
+import asyncio
+import inspect
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+
+from .ai_client import (
+    CONTINUATION_BUILDERS,
+    PROMPT_SYSTEM,
+    PROVIDER_DISPLAY_NAMES,
+    PROVIDER_REQUEST_TIMEOUT,
+    REQUEST_BUILDERS,
+    STREAM_STATES,
+    AIClientError,
+    AIClientTimeoutError,
+    _call_outcome,
+    _draft_tier_enabled,
+    _finish_generation,
+    _HedgeRace,
+    _hedging_enabled,
+    _merge_usage,
+    _openai_model_fallback,
+    _prepare_generation,
+    _raise_http_error,
+    _read_provider_response,
+    _resolve_draft_config,
+    _resolve_hedge_config,
+    _retry_delay,
+    _should_continue,
+    _should_retry,
+    _sse_payload,
+    _streaming_enabled,
+    _TopicStreamParser,
+    _with_draft_usage,
+)
+from .provider_health import OUTCOME_SUCCESS, record_provider_outcome
+from .provider_latency import hedge_deadline
+from .provider_transport import get_async_provider_client
+
+# Health and latency bookkeeping only touch the cache, so may run on any thread.
+_arecord_provider_outcome = sync_to_async(record_provider_outcome, thread_sensitive=False)
+_ahedge_deadline = sync_to_async(hedge_deadline, thread_sensitive=False)
+
+
+async def _aiter_sse_data(response):
+    async for line in response.aiter_lines():
+        data = _sse_payload(line)
+        if data is not None:
+            yield data
+
+
+async def _emit_topics(pending, on_topic):
+    """Hand parsed topics to `on_topic`, which may be sync or async."""
+    while pending:
+        result = on_topic(pending.pop(0))
+        if inspect.isawaitable(result):
+            await result
+
+
+async def _asend(client, url, headers, body, stream=False):
+    """Send one request, retrying 429/5xx responses like `ai_client._post_with_retry`."""
+    attempt = 0
+    while True:
+        request = client.build_request(
+            "POST",
+            url,
+            headers=headers,
+            json=body,
+            timeout=PROVIDER_REQUEST_TIMEOUT,
+        )
+        response = await client.send(request, stream=stream)
+        if not _should_retry(response, attempt):
+            return response
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            return response
+        await response.aclose()
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _arequest_generation(
+    provider,
+    config,
+    user_payload,
+    on_topic=None,
+    system_prompt=PROMPT_SYSTEM,
+    on_usage=None,
+):
+    provider_name = PROVIDER_DISPLAY_NAMES[provider]
+    stream = _streaming_enabled()
+    url, headers, body = REQUEST_BUILDERS[provider](config, user_payload, system_prompt, stream)
+    pending = []
+    parser = _TopicStreamParser(pending.append if on_topic is not None else None)
+    client = get_async_provider_client(provider)
+    response = None
+    continuations = 0
+
+    try:
+        response = await _asend(client, url, headers, body, stream)
+        if provider == "openai" and _openai_model_fallback(config, response, body):
+            await response.aclose()
+            response = await _asend(client, url, headers, body, stream)
+
+        if response.is_error:
+            # Streamed error bodies must be read before they can be parsed.
+            await response.aread()
+        response.raise_for_status()
+        if stream:
+            state = STREAM_STATES[provider](parser)
+            async for data in _aiter_sse_data(response):
+                done = state.handle(data)
+                await _emit_topics(pending, on_topic)
+                if done:
+                    break
+            content, stop_reason, usage = parser.text, state.stop_reason, state.usage
+        else:
+            content, stop_reason, usage = _read_provider_response(provider, response.json())
+
+        while _should_continue(provider, stop_reason, continuations):
+            partial = content.rstrip()
+            url, headers, body = CONTINUATION_BUILDERS[provider](config, user_payload, system_prompt, partial)
+            await response.aclose()
+            response = await _asend(client, url, headers, body)
+            response.raise_for_status()
+            more, stop_reason, more_usage = _read_provider_response(provider, response.json())
+            if stream:
+                parser.feed(more)
+                await _emit_topics(pending, on_topic)
+            content, usage = partial + more, _merge_usage(usage, more_usage)
+            continuations += 1
+    except AIClientError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        _raise_http_error(provider, response, exc)
+    except httpx.TimeoutException as exc:
+        raise AIClientTimeoutError(f"{provider_name} request timed out") from exc
+    except httpx.RequestError as exc:
+        raise AIClientError(f"{provider_name} network error: {exc}") from exc
+    except Exception as exc:
+        raise AIClientError(f"Unexpected error talking to {provider_name}: {exc}") from exc
+    finally:
+        if response is not None:
+            await response.aclose()
+
+    return _finish_generation(provider, content, stop_reason, usage, on_usage, continuations)
+
+
+async def agenerate_with_provider(provider, config, user_payload, **kwargs):
+    """Async twin of `ai_client._generate_with_provider`; cancelled calls are not counted."""
+    started = time.monotonic()
+    try:
+        result = await _arequest_generation(provider, config, user_payload, **kwargs)
+    except AIClientError as exc:
+        outcome, timed = _call_outcome(exc)
+        await _arecord_provider_outcome(
+            provider, outcome, time.monotonic() - started if timed else None
+        )
+        raise
+    await _arecord_provider_outcome(provider, OUTCOME_SUCCESS, time.monotonic() - started)
+    return result
+
+
+async def _agenerate_hedged(
+    config,
+    hedge_config,
+    user_payload,
+    *,
+    on_topic=None,
+    system_prompt=PROMPT_SYSTEM,
+    on_usage=None,
+):
+    """Async twin of `ai_client._generate_hedged`; the losing call is cancelled."""
+    race = _HedgeRace(on_topic, on_usage)
+
+    def start(target):
+        return asyncio.ensure_future(
+            agenerate_with_provider(
+                target.provider,
+                target,
+                user_payload,
+                system_prompt=system_prompt,
+                **race.callbacks(target.provider),
+            )
+        )
+
+    primary = start(config)
+    tasks = {primary: config.provider}
+    pending = {primary}
+    errors = {}
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=await _ahedge_deadline(config.provider))
+        if not done or primary.exception() is not None:
+            race.hedged = True
+            secondary = start(hedge_config)
+            tasks[secondary] = hedge_config.provider
+            pending.add(secondary)
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exc = task.exception()
+                if isinstance(exc, AIClientError):
+                    errors[tasks[task]] = exc
+                    continue
+                if exc is not None:
+                    raise exc
+                if race.claim(tasks[task]):
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Let cancelled calls run their cleanup so pooled connections are released.
+        await asyncio.gather(*pending, return_exceptions=True)
+    raise errors.get(config.provider) or next(iter(errors.values()))
+
+
+async def _agenerate_with_draft(draft_config, user_payload, system_prompt, on_draft, on_usage, refine):
+    """
+    Async twin of `ai_client._generate_with_draft`; `on_draft` may be a
+    coroutine function, and an unfinished draft is cancelled once the refined
+    result is in.
+    """
+    draft_usage = {}
+    draft = asyncio.ensure_future(
+        _arequest_generation(
+            draft_config.provider,
+            draft_config,
+            user_payload,
+            system_prompt=system_prompt,
+            on_usage=draft_usage.update,
+        )
+    )
+    refined = asyncio.ensure_future(refine(_with_draft_usage(on_usage, draft_usage)))
+    try:
+        done, _ = await asyncio.wait({draft, refined}, return_when=asyncio.FIRST_COMPLETED)
+        if refined not in done and draft.exception() is None:
+            try:
+                delivered = on_draft(draft.result())
+                if inspect.isawaitable(delivered):
+                    await delivered
+            except Exception:
+                pass
+        return await refined
+    finally:
+        pending = [task for task in (draft, refined) if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def agenerate_questions(
+    interviewee,
+    interviewer,
+    interview_context=None,
+    on_topic=None,
+    interviewer_digest=None,
+    on_usage=None,
+    on_draft=None,
+):
+    """
+    Async twin of `ai_client.generate_questions`; `on_topic` and `on_draft`
+    may be coroutine functions.
+    """
+    config, user_payload, system_prompt, on_usage = _prepare_generation(
+        interviewee,
+        interviewer,
+        interview_context,
+        interviewer_digest,
+        on_usage,
+    )
+    hedge_config = _resolve_hedge_config(config) if _hedging_enabled() else None
+
+    async def refine(on_usage):
+        if hedge_config is not None:
+            return await _agenerate_hedged(
+                config,
+                hedge_config,
+                user_payload,
+                on_topic=on_topic,
+                system_prompt=system_prompt,
+                on_usage=on_usage,
+            )
+        return await agenerate_with_provider(
+            config.provider,
+            config,
+            user_payload,
+            on_topic=on_topic,
+            system_prompt=system_prompt,
+            on_usage=on_usage,
+        )
+
+    draft_config = _resolve_draft_config(config) if on_draft is not None and _draft_tier_enabled() else None
+    if draft_config is None:
+        return await refine(on_usage)
+    return await _agenerate_with_draft(draft_config, user_payload, system_prompt, on_draft, on_usage, refine)
@@ -0,0 +1,145 @@
+"""
+Event-loop execution mode for prediction jobs.
+
+With PREDICTION_EXECUTION_MODE=asyncio, `run_prediction_task` does not run
+the job itself: it hands it to a per-process asyncio loop running in a
+background thread and returns. Provider calls — the slow 10–60s part — are
+awaited on that loop, so one `--pool=solo` worker keeps up to
+AI_ASYNC_CONCURRENCY generations in flight instead of one.
+
+When every slot is taken `submit_prediction_job` blocks, which stops the
+worker from pulling more messages than it can run (Celery backpressure).
+
+Database work inside a job goes through `db_phase`, which runs it off the
+loop and applies the request-style `close_old_connections` hygiene around
+it; Celery only does that for the worker's main thread.
+
+The task is acknowledged as soon as the job is on the loop. A warm shutdown
+drains in-flight jobs, but a hard kill loses them; their rows stay RUNNING
+until a poll finds them older than PREDICTION_RUNNING_TIMEOUT and fails
+them (see `prediction_service._expire_interrupted_job`).
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+_lock = threading.Lock()
+_loop = None
+_slots = None
+_owner_pid = None
+_inflight = set()
+
+
+def async_execution_enabled():
+    mode = (getattr(settings, "PREDICTION_EXECUTION_MODE", "") or "sync").strip().lower()
+    return mode == "asyncio"
+
+
+def close_old_connections():
+    """
+    `django.db.close_old_connections` for this thread, except that a
+    connection inside an open transaction is never closed.
+    """
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+def db_phase(func, thread_sensitive=True):
+    """
+    Wrap a blocking function for use from a job on the loop. Set
+    `thread_sensitive=False` for slow calls (e.g. a provider request) so they
+    do not hold the shared thread every other job's DB phases run on.
+    """
+
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=thread_sensitive)
+
+
+def _ensure_loop():
+    """Start the loop thread on first use, and again in a forked child."""
+    global _loop, _slots, _owner_pid
+    pid = os.getpid()
+    with _lock:
+        if _loop is None or _owner_pid != pid:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="prediction-event-loop",
+                daemon=True,
+            )
+            thread.start()
+            concurrency = max(int(getattr(settings, "AI_ASYNC_CONCURRENCY", 32)), 1)
+            _loop = loop
+            _slots = threading.BoundedSemaphore(concurrency)
+            _owner_pid = pid
+            _inflight.clear()
+        return _loop, _slots
+
+
+async def _run_in_slot(job, slots):
+    try:
+        return await job()
+    finally:
+        slots.release()
+
+
+def _forget(future):
+    with _lock:
+        _inflight.discard(future)
+
+
+def submit_prediction_job(job):
+    """
+    Schedule `job` (a zero-argument coroutine function) on the event loop and
+    return a `concurrent.futures.Future`. Blocks while the loop is full.
+    """
+    loop, slots = _ensure_loop()
+    slots.acquire()
+    try:
+        future = asyncio.run_coroutine_threadsafe(_run_in_slot(job, slots), loop)
+    except Exception:
+        slots.release()
+        raise
+    with _lock:
+        _inflight.add(future)
+    future.add_done_callback(_forget)
+    return future
+
+
+def inflight_prediction_jobs():
+    with _lock:
+        return len(_inflight)
+
+
+def drain_prediction_jobs(timeout=None):
+    """Wait for in-flight jobs to finish; used on worker shutdown."""
+    with _lock:
+        pending = list(_inflight)
+    if pending:
+        concurrent.futures.wait(pending, timeout=timeout)
+
+
+def reset_async_executor():
+    """Stop this process's event loop and forget it (tests, settings changes)."""
+    global _loop, _slots, _owner_pid
+    with _lock:
+        loop, owner = _loop, _owner_pid
+        _loop = None
+        _slots = None
+        _owner_pid = None
+        _inflight.clear()
+    if loop is not None and owner == os.getpid():
+        loop.call_soon_threadsafe(loop.stop)
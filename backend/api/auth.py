@@ -1,10 +1,19 @@
 # backend/api/auth.py
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from jose import jwt
+from jose import jwk, jwt
 from rest_framework import authentication, exceptions
 
+from .models import User
+from .user_cache import aget_cached_user, cache_user_on_commit, get_cached_user
+
 
 class Auth0User:
     """
@@ -25,12 +34,171 @@ class Auth0User:
         return True
 
 
+def get_or_create_db_user(request):
+    """
+    Return the `User` row for the request's Auth0 subject. The row is kept on
+    the request, so the throttle and the view share one lookup, and in the
+    user cache, so repeat requests usually skip the user table entirely.
+    """
+    db_user = getattr(request, "_db_user", None)
+    if db_user is None:
+        sub = str(request.user.id)
+        db_user = get_cached_user(sub)
+        if db_user is None:
+            payload = getattr(request.user, "payload", None) or {}
+            db_user, created = User.objects.get_or_create(
+                auth0_sub=sub,
+                defaults={"email": payload.get("email") or None},
+            )
+            if not created:
+                # New rows are cached by the post_save handler.
+                cache_user_on_commit(db_user)
+        request._db_user = db_user
+    return db_user
+
+
+async def aget_or_create_db_user(request):
+    db_user = getattr(request, "_db_user", None)
+    if db_user is None:
+        sub = str(request.user.id)
+        db_user = await aget_cached_user(sub)
+        if db_user is None:
+            payload = getattr(request.user, "payload", None) or {}
+            db_user, created = await User.objects.aget_or_create(
+                auth0_sub=sub,
+                defaults={"email": payload.get("email") or None},
+            )
+            if not created:
+                await sync_to_async(cache_user_on_commit)(db_user)
+        request._db_user = db_user
+    return db_user
+
+
+class _JWKSCache:
+    """
+    Process-wide Auth0 signing keys, constructed once per `kid`.
+
+    The key set is re-fetched after AUTH0_JWKS_TTL seconds, or sooner when a
+    token names a `kid` we have not seen (key rotation) — at most once per
+    AUTH0_JWKS_MIN_REFRESH seconds so unknown kids cannot hammer Auth0. One
+    thread fetches while the others wait for its result; if the fetch fails
+    the previous keys keep being served.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._domain = None
+        self._keys = {}
+        self._expires_at = 0.0
+        self._attempted_at = float("-inf")
+
+    def clear(self):
+        with self._lock:
+            self._domain, self._keys = None, {}
+            self._expires_at, self._attempted_at = 0.0, float("-inf")
+
+    def _fetch(self, domain):
+        url = f"https://{domain}/.well-known/jwks.json"
+        r = requests.get(url, timeout=5)
+        r.raise_for_status()
+        keys = {}
+        for key in r.json().get("keys", []):
+            if key.get("kty") != "RSA" or not key.get("kid"):
+                continue
+            try:
+                keys[key["kid"]] = jwk.construct(key, "RS256")
+            except Exception:
+                continue
+        return keys
+
+    def _refresh(self, domain):
+        now = time.monotonic()
+        self._attempted_at = now
+        try:
+            keys = self._fetch(domain)
+        except Exception:
+            if self._domain != domain or not self._keys:
+                raise
+            # Keep serving the previous keys; try again after the minimum interval.
+            self._expires_at = now + float(getattr(settings, "AUTH0_JWKS_MIN_REFRESH", 30))
+            return
+        self._domain, self._keys = domain, keys
+        self._expires_at = now + float(getattr(settings, "AUTH0_JWKS_TTL", 3600))
+
+    def _lookup(self, domain, kid):
+        """Return `(usable, key)`: whether the cached key set answers for `kid` without a refresh."""
+        now = time.monotonic()
+        if self._domain != domain or now >= self._expires_at:
+            return False, None
+        key = self._keys.get(kid)
+        min_refresh = float(getattr(settings, "AUTH0_JWKS_MIN_REFRESH", 30))
+        return key is not None or now - self._attempted_at < min_refresh, key
+
+    def get_key(self, domain, kid):
+        """Return the verification key for `kid`, or None when Auth0 does not publish it."""
+        usable, key = self._lookup(domain, kid)
+        if usable:
+            return key
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock.
+            usable, key = self._lookup(domain, kid)
+            if not usable:
+                self._refresh(domain)
+            return self._keys.get(kid) if self._domain == domain else None
+
+
+class _VerifiedTokenLRU:
+    """
+    Bounded LRU of recently verified tokens, keyed by a hash of the token and
+    the audience/issuer it was verified against. Entries expire with the
+    token's `exp`, so a cached payload is never served past the token's life.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def cache_key(token, audience, issuer):
+        return hashlib.sha256(f"{audience}\n{issuer}\n{token}".encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key, payload):
+        size = int(getattr(settings, "AUTH0_TOKEN_CACHE_SIZE", 1024))
+        expires_at = payload.get("exp")
+        if size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+
+jwks_cache = _JWKSCache()
+verified_tokens = _VerifiedTokenLRU()
+
+
 class Auth0JWTAuthentication(authentication.BaseAuthentication):
     """
     Validates Auth0-issued access tokens (RS256) using the tenant JWKS.
     Expects: Authorization: Bearer <token>
     """
-    _jwks_cache = None
 
     def authenticate(self, request):
         auth_header = authentication.get_authorization_header(request).decode("utf-8")
@@ -50,22 +218,22 @@ class Auth0JWTAuthentication(authentication.BaseAuthentication):
         if not issuer.endswith("/"):
             issuer = issuer + "/"
 
+        cache_key = verified_tokens.cache_key(token, audience, issuer)
+        payload = verified_tokens.get(cache_key)
+        if payload is not None:
+            return (Auth0User(payload), payload)
+
         # Pick JWKS key
         try:
             unverified_header = jwt.get_unverified_header(token)
         except Exception:
             raise exceptions.AuthenticationFailed("Invalid token header")
 
-        jwks = self._get_jwks(domain)
-        rsa_key = {}
-        for key in jwks.get("keys", []):
-            if key.get("kid") == unverified_header.get("kid"):
-                rsa_key = {
-                    "kty": key["kty"], "kid": key["kid"], "use": key["use"],
-                    "n": key["n"], "e": key["e"],
-                }
-                break
-        if not rsa_key:
+        try:
+            rsa_key = jwks_cache.get_key(domain, unverified_header.get("kid"))
+        except Exception:
+            raise exceptions.AuthenticationFailed("Unable to fetch signing keys")
+        if rsa_key is None:
             raise exceptions.AuthenticationFailed("Appropriate key not found")
 
         # Verify token
@@ -81,16 +249,8 @@ class Auth0JWTAuthentication(authentication.BaseAuthentication):
             )
         except Exception:
             raise exceptions.AuthenticationFailed("Token validation failed")
+        verified_tokens.put(cache_key, payload)
 
         # Return authenticated user-like object
         user = Auth0User(payload)
         return (user, payload)
-
-    def _get_jwks(self, domain: str):
-        if self._jwks_cache:
-            return self._jwks_cache
-        url = f"https://{domain}/.well-known/jwks.json"
-        r = requests.get(url, timeout=5)
-        r.raise_for_status()
-        self._jwks_cache = r.json()
-        return self._jwks_cache
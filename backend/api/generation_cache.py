@@ -0,0 +1,248 @@
+"""
+Content-addressed generation cache shared across users.
+
+`InterviewPrediction` stays the per-user ownership record (its fingerprint
+mixes in the user identifier). This cache sits underneath it and is keyed
+only on what is actually sent to the provider, so identical jobs from
+different users coalesce into one upstream call and later ones are served
+from Redis.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .ai_client import (
+    OUTPUT_MODE,
+    _normalize_interview_context,
+    resolve_generation_target,
+)
+from .result_codec import decode_result, encode_result
+
+try:
+    from django_redis import get_redis_connection
+except ImportError:  # pragma: no cover - django-redis is in requirements.txt
+    get_redis_connection = None
+
+# KEYS[1] = lock key, ARGV[1] = the releasing leader's token. Deletes the lock
+# only while it is still that leader's, so a leader that outlived the TTL
+# cannot release the lock a later leader took.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+_release_script = None
+
+
+def shared_generation_enabled():
+    return bool(getattr(settings, "AI_SHARED_GENERATION_CACHE", False))
+
+
+def shared_generation_input(person):
+    """
+    Drop per-user identifiers that do not inform topic prediction, so two
+    users with otherwise identical inputs map to the same cache entry.
+    """
+    if not isinstance(person, dict):
+        return person
+    return {key: value for key, value in person.items() if key != "email"}
+
+
+def normalize_value(value):
+    """Collapse whitespace in every string of a JSON-like value, so cache keys ignore formatting."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {key: normalize_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [normalize_value(item) for item in value]
+    return value
+
+
+def build_shared_generation_key(
+    interviewee,
+    interviewer,
+    interview_context,
+    *,
+    prompt_version,
+    interviewer_digest=None,
+):
+    material = {
+        "interviewee": normalize_value(interviewee),
+        "interviewer": normalize_value(interviewer),
+        "interview_context": _normalize_interview_context(interview_context),
+        "prompt_version": str(prompt_version or ""),
+        "output_mode": OUTPUT_MODE,
+        "target": resolve_generation_target(),
+    }
+    if interviewer_digest:
+        # Two-stage runs use a different prompt, so they never share entries
+        # with single-stage ones.
+        material["interviewer_digest"] = interviewer_digest
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _shared_generation_wait():
+    # Kept well under the lock TTL: waiters hold a worker (the solo pool's
+    # only one) while they sleep, so a slow leader should cost a duplicate
+    # provider call rather than minutes of blocked queue.
+    return max(float(getattr(settings, "AI_SHARED_GENERATION_WAIT", 20)), 0)
+
+
+def _build_shared_result_key(key):
+    return f"predict:gen:result:{key}"
+
+
+def _build_shared_lock_key(key):
+    return f"predict:gen:lock:{key}"
+
+
+def _redis_connection():
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _acquire_lock(lock_key, token, ttl):
+    """Take `lock_key` for `token` if it is free; raises when the cache is down."""
+    connection = _redis_connection()
+    if connection is not None:
+        return bool(connection.set(cache.make_key(lock_key), token, nx=True, ex=ttl))
+    return cache.add(lock_key, token, timeout=ttl)
+
+
+def _release_lock(lock_key, token):
+    """Compare-and-delete: drop `lock_key` only while `token` still holds it."""
+    global _release_script
+    try:
+        connection = _redis_connection()
+        if connection is not None:
+            if _release_script is None:
+                _release_script = connection.register_script(RELEASE_LOCK_SCRIPT)
+            _release_script(keys=[cache.make_key(lock_key)], args=[token], client=connection)
+        elif cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    except Exception:
+        pass
+
+
+def _read_shared_result(key):
+    try:
+        cached = cache.get(_build_shared_result_key(key))
+    except Exception:
+        return None
+    if not cached:
+        return None
+    return decode_result(cached)
+
+
+def generate_single_flight(key, generate, *, poll_interval=0.5):
+    """
+    Return `(result, from_cache)` for `key`, calling `generate()` at most once
+    across concurrent callers.
+
+    The first caller takes a Redis lock and generates; the others wait for
+    the shared result. If the leader fails (lock released with no result) a
+    waiter takes over. If the cache itself is unavailable, or waiting exceeds
+    AI_SHARED_GENERATION_WAIT, the caller simply generates on its own.
+    """
+    cached = _read_shared_result(key)
+    if cached is not None:
+        return cached, True
+
+    lock_key = _build_shared_lock_key(key)
+    lock_ttl = getattr(settings, "CACHE_TTL_RUNNING", 300)
+    result_ttl = getattr(settings, "CACHE_TTL_SHARED_GENERATION", 86400)
+    deadline = time.monotonic() + _shared_generation_wait()
+    token = uuid.uuid4().hex
+
+    while True:
+        try:
+            is_leader = _acquire_lock(lock_key, token, lock_ttl)
+        except Exception:
+            return generate(), False
+
+        if is_leader:
+            try:
+                cached = _read_shared_result(key)
+                if cached is not None:
+                    return cached, True
+                result = generate()
+                try:
+                    cache.set(_build_shared_result_key(key), encode_result(result), timeout=result_ttl)
+                except Exception:
+                    pass
+                return result, False
+            finally:
+                _release_lock(lock_key, token)
+
+        if time.monotonic() >= deadline:
+            return generate(), False
+        time.sleep(poll_interval)
+        cached = _read_shared_result(key)
+        if cached is not None:
+            return cached, True
+
+
+async def _aread_shared_result(key):
+    try:
+        cached = await cache.aget(_build_shared_result_key(key))
+    except Exception:
+        return None
+    if not cached:
+        return None
+    return decode_result(cached)
+
+
+async def agenerate_single_flight(key, agenerate, *, poll_interval=0.5):
+    """Async twin of `generate_single_flight`; waiting yields to the event loop."""
+    cached = await _aread_shared_result(key)
+    if cached is not None:
+        return cached, True
+
+    lock_key = _build_shared_lock_key(key)
+    lock_ttl = getattr(settings, "CACHE_TTL_RUNNING", 300)
+    result_ttl = getattr(settings, "CACHE_TTL_SHARED_GENERATION", 86400)
+    deadline = time.monotonic() + _shared_generation_wait()
+    token = uuid.uuid4().hex
+    acquire_lock = sync_to_async(_acquire_lock, thread_sensitive=False)
+
+    while True:
+        try:
+            is_leader = await acquire_lock(lock_key, token, lock_ttl)
+        except Exception:
+            return await agenerate(), False
+
+        if is_leader:
+            try:
+                cached = await _aread_shared_result(key)
+                if cached is not None:
+                    return cached, True
+                result = await agenerate()
+                try:
+                    await cache.aset(_build_shared_result_key(key), encode_result(result), timeout=result_ttl)
+                except Exception:
+                    pass
+                return result, False
+            finally:
+                await sync_to_async(_release_lock, thread_sensitive=False)(lock_key, token)
+
+        if time.monotonic() >= deadline:
+            return await agenerate(), False
+        await asyncio.sleep(poll_interval)
+        cached = await _aread_shared_result(key)
+        if cached is not None:
+            return cached, True
@@ -0,0 +1,103 @@
+"""
+Interviewer digest store for the two-stage prediction pipeline.
+
+Stage one condenses an interviewer profile into a small digest ("Map B") and
+stores it keyed on a hash of the profile; stage two matches each candidate
+against that digest instead of re-sending and re-analysing the full
+interviewer text. Popular interviewers therefore pay for stage one once per
+TTL rather than once per candidate.
+"""
+
+import hashlib
+import json
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from .ai_client import (
+    DIGEST_PROMPT_VERSION,
+    generate_interviewer_digest,
+    resolve_generation_target,
+)
+from .generation_cache import normalize_value
+from .models import InterviewerDigest
+
+
+def interviewer_digest_enabled():
+    return bool(getattr(settings, "AI_INTERVIEWER_DIGEST", False))
+
+
+def build_interviewer_profile_hash(interviewer):
+    """
+    Hash the interviewer profile together with the digest prompt version.
+    The generation target is left out: it can change per request under the
+    auto provider strategy, and a digest is plain JSON any model can read.
+    Bump DIGEST_PROMPT_VERSION to regenerate stored digests.
+    """
+    material = {
+        "interviewer": normalize_value(interviewer),
+        "digest_prompt_version": DIGEST_PROMPT_VERSION,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _should_evict():
+    """Sample INTERVIEWER_DIGEST_EVICT_RATE of misses to run eviction on."""
+    rate = float(getattr(settings, "INTERVIEWER_DIGEST_EVICT_RATE", 0.05))
+    return rate > 0 and random.random() < rate
+
+
+def evict_interviewer_digests(now=None):
+    """Drop expired digests, then trim least-recently-used rows beyond the cap."""
+    now = now or timezone.now()
+    InterviewerDigest.objects.filter(expires_at__lte=now).delete()
+
+    max_rows = getattr(settings, "INTERVIEWER_DIGEST_MAX_ROWS", 5000)
+    if max_rows <= 0:
+        return
+    stale_ids = list(
+        InterviewerDigest.objects.order_by("-last_used_at", "-id").values_list("id", flat=True)[max_rows:]
+    )
+    if stale_ids:
+        InterviewerDigest.objects.filter(id__in=stale_ids).delete()
+
+
+def get_or_create_interviewer_digest(interviewer):
+    """
+    Return the stored digest for `interviewer`, generating and storing it on a
+    miss. Raises AIClientError when generation fails.
+    """
+    profile_hash = build_interviewer_profile_hash(interviewer)
+    now = timezone.now()
+
+    row = InterviewerDigest.objects.filter(profile_hash=profile_hash, expires_at__gt=now).first()
+    if row is not None:
+        InterviewerDigest.objects.filter(pk=row.pk).update(
+            hit_count=F("hit_count") + 1,
+            last_used_at=now,
+        )
+        return row.digest
+
+    digest = generate_interviewer_digest(interviewer)
+    ttl = getattr(settings, "INTERVIEWER_DIGEST_TTL", 30 * 86400)
+    defaults = {
+        "digest": digest,
+        "target": resolve_generation_target(),
+        "prompt_version": DIGEST_PROMPT_VERSION,
+        "hit_count": 0,
+        "last_used_at": now,
+        "expires_at": now + timedelta(seconds=ttl),
+    }
+    try:
+        InterviewerDigest.objects.update_or_create(profile_hash=profile_hash, defaults=defaults)
+    except IntegrityError:
+        # A concurrent job stored the same digest first; ours is equivalent.
+        pass
+    if _should_evict():
+        evict_interviewer_digests(now)
+    return digest
@@ -0,0 +1,55 @@
+"""
+Small per-process LRU with a TTL, used as the first tier in front of Redis.
+
+Entries are not shared between processes and are not invalidated by writes
+made elsewhere, so callers keep the TTL short or only store values that
+cannot change. Size and TTL are read from settings on every write so tests
+and deploys can tune them without a restart.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class LocalLRU:
+    def __init__(self, size_setting, default_size, ttl_setting, default_ttl):
+        self._size_setting = size_setting
+        self._default_size = default_size
+        self._ttl_setting = ttl_setting
+        self._default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = int(getattr(settings, self._size_setting, self._default_size))
+        ttl = float(getattr(settings, self._ttl_setting, self._default_ttl))
+        if size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
@@ -0,0 +1,131 @@
+from django.core.management.base import BaseCommand
+
+from api.models import InterviewPrediction, PrepSession
+from api.prediction_batch import (
+    batch_max_requests,
+    expire_stale_prediction_batches,
+    fail_queued_batch,
+    queue_prediction_batch,
+)
+from api.prediction_service import (
+    compute_fingerprint,
+    get_prediction_state_by_fingerprint,
+    mark_prediction_enqueue_failed,
+    reserve_prediction_job,
+)
+from api.tasks import submit_prediction_batch_task
+from api.views import (
+    build_predict_payload_from_profile_state,
+    resolve_session_profile_state,
+    store_prep_session_fingerprint,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate predictions for active prep sessions whose current inputs or "
+        "PROMPT_VERSION have no prediction yet, through the provider batch API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=0, help="Stop after this many jobs (0 = no limit).")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the sessions that would be regenerated.",
+        )
+        parser.add_argument(
+            "--expire-stale",
+            action="store_true",
+            help="Only fail queued or submitted batches older than AI_BATCH_MAX_AGE, then exit.",
+        )
+
+    def _stale_session_payloads(self):
+        """Yield `(prep_session, interviewee, interviewer, interview_context)` for previously generated sessions."""
+        sessions = (
+            PrepSession.objects.filter(status=PrepSession.STATUS_ACTIVE, predictions__isnull=False)
+            .distinct()
+            .select_related("user")
+            .prefetch_related("profile_submissions")
+            .order_by("id")
+        )
+        for prep_session in sessions.iterator(chunk_size=200):
+            db_user = prep_session.user
+            profile_state = resolve_session_profile_state(prep_session, db_user)
+            if not profile_state["can_generate_prep"]:
+                continue
+            interviewee, interviewer, interview_context = build_predict_payload_from_profile_state(
+                profile_state,
+                user_email=db_user.email,
+                prep_session=prep_session,
+            )
+            yield prep_session, interviewee, interviewer, interview_context
+
+    def _reserve(self, prep_session, interviewee, interviewer, interview_context):
+        db_user = prep_session.user
+        _, _, fingerprint, should_enqueue = reserve_prediction_job(
+            user_identifier=db_user.auth0_sub,
+            db_user=db_user,
+            interviewee=interviewee,
+            interviewer=interviewer,
+            prep_session=prep_session,
+            interview_context=interview_context,
+        )
+        if not should_enqueue:
+            return None
+        prediction = InterviewPrediction.objects.get(fingerprint=fingerprint, user=db_user)
+        store_prep_session_fingerprint(prep_session, fingerprint, prediction)
+        return {
+            "prediction_id": prediction.pk,
+            "interviewee": interviewee,
+            "interviewer": interviewer,
+            "interview_context": interview_context,
+        }
+
+    def handle(self, *args, **options):
+        if options["expire_stale"]:
+            expired = expire_stale_prediction_batches()
+            self.stdout.write(self.style.SUCCESS(f"Expired {expired} stale batch(es)."))
+            return
+
+        limit = options["limit"]
+        dry_run = options["dry_run"]
+        jobs = []
+        for prep_session, interviewee, interviewer, interview_context in self._stale_session_payloads():
+            if limit and len(jobs) >= limit:
+                break
+            if dry_run:
+                fingerprint = compute_fingerprint(
+                    prep_session.user.auth0_sub,
+                    interviewee,
+                    interviewer,
+                    interview_context=interview_context,
+                )
+                payload, _ = get_prediction_state_by_fingerprint(prep_session.user, fingerprint)
+                if payload is None:
+                    jobs.append(prep_session.prep_id)
+                continue
+            job = self._reserve(prep_session, interviewee, interviewer, interview_context)
+            if job is not None:
+                jobs.append(job)
+
+        if dry_run:
+            self.stdout.write(f"{len(jobs)} prep session(s) would be regenerated.")
+            return
+
+        size = batch_max_requests()
+        batches = 0
+        for start in range(0, len(jobs), size):
+            chunk = jobs[start : start + size]
+            batch = queue_prediction_batch([job["prediction_id"] for job in chunk])
+            try:
+                submit_prediction_batch_task.delay(jobs=chunk)
+            except Exception as exc:
+                for job in chunk:
+                    prediction = InterviewPrediction.objects.select_related("user").get(pk=job["prediction_id"])
+                    mark_prediction_enqueue_failed(prediction.user, prediction.fingerprint, f"Queue error: {exc}")
+                fail_queued_batch(batch, f"Queue error: {exc}")
+                self.stderr.write(f"Could not queue batch of {len(chunk)} job(s): {exc}")
+                continue
+            batches += 1
+        self.stdout.write(self.style.SUCCESS(f"Queued {len(jobs)} prediction job(s) in {batches} batch(es)."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_prediction_topic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prepsession',
+            name='current_prediction',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.interviewprediction'),
+        ),
+        migrations.AddField(
+            model_name='prepsession',
+            name='input_fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name='prepsession',
+            name='input_fingerprint_version',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_prepsession_input_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewerDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile_hash', models.CharField(db_index=True, max_length=64, unique=True)),
+                ('digest', models.JSONField(default=dict)),
+                ('target', models.CharField(blank=True, default='', max_length=200)),
+                ('prompt_version', models.CharField(blank=True, default='', max_length=40)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
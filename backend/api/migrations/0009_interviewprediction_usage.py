@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_interviewerdigest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewprediction',
+            name='usage',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
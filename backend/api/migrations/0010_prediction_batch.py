@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_interviewprediction_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=20)),
+                ('model', models.CharField(max_length=100)),
+                ('batch_id', models.CharField(max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('SUBMITTED', 'SUBMITTED'), ('COMPLETED', 'COMPLETED'), ('FAILED', 'FAILED')], default='SUBMITTED', max_length=20)),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('error_text', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='interviewprediction',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='predictions', to='api.predictionbatch'),
+        ),
+    ]
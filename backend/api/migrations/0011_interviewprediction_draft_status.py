@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_prediction_batch'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interviewprediction',
+            name='status',
+            field=models.CharField(choices=[('RUNNING', 'RUNNING'), ('DRAFT', 'DRAFT'), ('COMPLETED', 'COMPLETED'), ('FAILED', 'FAILED')], default='RUNNING', max_length=20),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:33
+
+import json
+
+from django.db import migrations, models
+
+
+def quote_unparseable_results(apps, schema_editor):
+    """
+    Store results that are not valid JSON as JSON strings so the jsonb cast
+    cannot fail. Readers only use dict results, so these read as missing.
+    """
+    InterviewPrediction = apps.get_model('api', 'InterviewPrediction')
+    rows = InterviewPrediction.objects.exclude(result_json__isnull=True).values_list('id', 'result_json')
+    for row_id, raw in rows.iterator():
+        try:
+            json.loads(raw)
+        except (TypeError, ValueError):
+            InterviewPrediction.objects.filter(id=row_id).update(result_json=json.dumps(raw))
+
+
+def unquote_string_results(apps, schema_editor):
+    """Reverse: the column is text again; restore the raw text of quoted results."""
+    InterviewPrediction = apps.get_model('api', 'InterviewPrediction')
+    rows = InterviewPrediction.objects.exclude(result_json__isnull=True).values_list('id', 'result_json')
+    for row_id, raw in rows.iterator():
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(value, str):
+            InterviewPrediction.objects.filter(id=row_id).update(result_json=value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_interviewprediction_draft_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(quote_unparseable_results, reverse_code=unquote_string_results),
+        migrations.AlterField(
+            model_name='interviewprediction',
+            name='result_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
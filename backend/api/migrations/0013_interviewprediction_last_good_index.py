@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_interviewprediction_result_jsonfield'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewprediction',
+            index=models.Index(fields=['user', 'status', '-last_success_at'], name='api_pred_user_status_success'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_interviewprediction_last_good_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='predictionbatch',
+            name='batch_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='predictionbatch',
+            name='status',
+            field=models.CharField(choices=[('QUEUED', 'QUEUED'), ('SUBMITTED', 'SUBMITTED'), ('COMPLETED', 'COMPLETED'), ('FAILED', 'FAILED')], default='SUBMITTED', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_prediction_batch_queued'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interviewerdigest',
+            name='profile_hash',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
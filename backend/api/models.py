@@ -1,6 +1,7 @@
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 
 class User(models.Model):
@@ -33,13 +34,16 @@ class InterviewPrediction(models.Model):
       - Return cached results to users who revisit (durable storage)
       - Mark RUNNING / FAILED so UI can poll status
       - Provide a last_good_fallback if OpenAI fails
+      - Show a fast-model DRAFT result while the refined one is generated
     """
     STATUS_RUNNING = "RUNNING"
+    STATUS_DRAFT = "DRAFT"
     STATUS_COMPLETED = "COMPLETED"
     STATUS_FAILED = "FAILED"
 
     STATUS_CHOICES = [
         (STATUS_RUNNING, "RUNNING"),
+        (STATUS_DRAFT, "DRAFT"),
         (STATUS_COMPLETED, "COMPLETED"),
         (STATUS_FAILED, "FAILED"),
     ]
@@ -56,16 +60,68 @@ class InterviewPrediction(models.Model):
     prompt_version = models.CharField(max_length=40, blank=True, null=True)
     regenerate_nonce = models.CharField(max_length=64, blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_RUNNING)
-    result_json = models.TextField(blank=True, null=True)  # JSON string of the response
+    result_json = models.JSONField(blank=True, null=True)  # topics_v1 result (JSONB on Postgres)
     error_text = models.TextField(blank=True, null=True)
+    # Provider token counts for the run, including prompt-cache reads/writes.
+    usage = models.JSONField(default=dict, blank=True)
+    # Set while the job is queued in a provider batch (see api/prediction_batch.py).
+    batch = models.ForeignKey(
+        "PredictionBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="predictions",
+    )
     last_success_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves the newest-COMPLETED lookup behind last_good_fallback.
+            models.Index(
+                fields=["user", "status", "-last_success_at"],
+                name="api_pred_user_status_success",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.fingerprint} ({self.status})"
 
 
+class PredictionBatch(models.Model):
+    """
+    One provider batch submission of prediction jobs, used for bulk and
+    offline regeneration instead of the interactive per-request path.
+    """
+
+    STATUS_QUEUED = "QUEUED"
+    STATUS_SUBMITTED = "SUBMITTED"
+    STATUS_COMPLETED = "COMPLETED"
+    STATUS_FAILED = "FAILED"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "QUEUED"),
+        (STATUS_SUBMITTED, "SUBMITTED"),
+        (STATUS_COMPLETED, "COMPLETED"),
+        (STATUS_FAILED, "FAILED"),
+    ]
+
+    provider = models.CharField(max_length=20)
+    model = models.CharField(max_length=100)
+    # Empty while QUEUED: the rows are reserved but the submit task has not run yet.
+    batch_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_SUBMITTED)
+    request_count = models.PositiveIntegerField(default=0)
+    error_text = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.provider}:{self.batch_id} ({self.status})"
+
+
 class PredictionTopic(models.Model):
     """One predicted interview topic from a completed InterviewPrediction run."""
 
@@ -106,6 +162,25 @@ class PredictionTopic(models.Model):
         return f"{self.prediction_id}::{self.topic_key}"
 
 
+class InterviewerDigest(models.Model):
+    """
+    Stage-one analysis of an interviewer profile ("Map B"), shared by every
+    prediction against the same interviewer until it expires.
+    """
+
+    profile_hash = models.CharField(max_length=64, unique=True)
+    digest = models.JSONField(default=dict)
+    target = models.CharField(max_length=200, blank=True, default="")
+    prompt_version = models.CharField(max_length=40, blank=True, default="")
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.profile_hash[:12]} ({self.hit_count} hits)"
+
+
 class PrepSession(models.Model):
     """
     Represents one interview-preparation session for a user.
@@ -125,6 +200,17 @@ class PrepSession(models.Model):
     title = models.CharField(max_length=200, blank=True, null=True)
     company_name = models.CharField(max_length=200, blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_ACTIVE)
+    # Materialised on every write that changes the prediction inputs, so reads
+    # can find the current prediction without rebuilding and rehashing profiles.
+    input_fingerprint = models.CharField(max_length=128, blank=True, null=True, db_index=True)
+    input_fingerprint_version = models.CharField(max_length=40, blank=True, null=True)
+    current_prediction = models.ForeignKey(
+        InterviewPrediction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -0,0 +1,247 @@
+"""
+Bulk prediction generation through provider batch APIs.
+
+Jobs are reserved exactly like interactive ones (a RUNNING `InterviewPrediction`
+row), but instead of one provider call per Celery task they are submitted
+together as a provider batch. Reserved rows join a QUEUED batch right away so
+the interactive running timeout does not apply to them while the submit task
+waits in the queue. Polling picks the results up and completes each
+row through the same path as an interactive run, so topics, the result cache
+and status events behave identically. Rows that finished some other way in
+the meantime (e.g. a user regenerated interactively) are left alone.
+
+The two-stage interviewer digest is not used here: batch requests use the
+single-stage prompt so submission never makes an interactive provider call.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .ai_client import (
+    REQUEST_BUILDERS,
+    AIClientError,
+    _available_provider_configs,
+    _finish_generation,
+    _prepare_generation,
+    _read_provider_response,
+    _resolve_provider_config,
+)
+from .models import InterviewPrediction, PredictionBatch
+from .prediction_service import (
+    _complete_prediction_job,
+    _fail_prediction_job,
+    batch_max_age,
+)
+from .profile_trim import trim_predict_person
+from .provider_batch import BATCH_ENDED, BATCH_FAILED, get_batch_api
+
+
+def batch_max_requests():
+    return max(int(getattr(settings, "AI_BATCH_MAX_REQUESTS", 1000)), 1)
+
+
+def batch_custom_id(prediction):
+    return f"prediction-{prediction.pk}"
+
+
+def resolve_batch_config():
+    """AI_BATCH_PROVIDER when set, otherwise the provider interactive jobs would use."""
+    provider = (getattr(settings, "AI_BATCH_PROVIDER", "") or "").strip().lower()
+    if not provider:
+        return _resolve_provider_config()
+    _, available_configs = _available_provider_configs()
+    if provider not in available_configs:
+        raise AIClientError(f"AI_BATCH_PROVIDER is '{provider}' but credentials are unavailable.")
+    return available_configs[provider]
+
+
+def _batch_provider_config(batch):
+    _, available_configs = _available_provider_configs()
+    config = available_configs.get(batch.provider)
+    if config is None:
+        raise AIClientError(f"Credentials for batch provider '{batch.provider}' are unavailable.")
+    return config
+
+
+def build_batch_request(config, prediction, interviewee, interviewer, interview_context):
+    """Return `(custom_id, body)` with the same body an interactive call would send."""
+    _, user_payload, system_prompt, _ = _prepare_generation(
+        trim_predict_person(interviewee),
+        trim_predict_person(interviewer),
+        interview_context,
+        None,
+        None,
+        config=config,
+    )
+    _, _, body = REQUEST_BUILDERS[config.provider](config, user_payload, system_prompt, False)
+    return batch_custom_id(prediction), body
+
+
+def _fail_predictions(predictions, exc):
+    for prediction in predictions:
+        _fail_prediction_job(prediction, prediction.user, exc)
+
+
+def queue_prediction_batch(prediction_ids):
+    """
+    Attach reserved rows to a QUEUED batch before their submit task is
+    enqueued, so a backed-up queue cannot expire them as interrupted
+    interactive jobs (PREDICTION_RUNNING_TIMEOUT) while they wait.
+    """
+    batch = PredictionBatch.objects.create(status=PredictionBatch.STATUS_QUEUED, request_count=len(prediction_ids))
+    InterviewPrediction.objects.filter(pk__in=prediction_ids).update(batch=batch)
+    return batch
+
+
+def _queued_batch(predictions):
+    batches = {prediction.batch for prediction in predictions if prediction.batch_id is not None}
+    if len(batches) == 1:
+        batch = batches.pop()
+        if batch.status == PredictionBatch.STATUS_QUEUED:
+            return batch
+    return None
+
+
+def fail_queued_batch(batch, error):
+    """Close a QUEUED batch that will never be submitted."""
+    batch.status = PredictionBatch.STATUS_FAILED
+    batch.error_text = str(error)
+    batch.completed_at = timezone.now()
+    batch.save(update_fields=["status", "error_text", "completed_at", "updated_at"])
+
+
+def submit_prediction_batch(jobs, config=None):
+    """
+    Submit reserved jobs as one provider batch and return the `PredictionBatch`.
+
+    Each job is a dict with `prediction_id`, `interviewee`, `interviewer` and
+    `interview_context`. Jobs whose row is no longer RUNNING are skipped; if
+    submission fails every remaining row is marked FAILED and the error raised.
+    The QUEUED batch the rows were reserved into becomes the submitted one.
+    """
+    predictions = InterviewPrediction.objects.select_related("user", "batch").in_bulk(
+        [job["prediction_id"] for job in jobs]
+    )
+    queued = _queued_batch(predictions.values())
+    pending = []
+    for job in jobs:
+        prediction = predictions.get(job["prediction_id"])
+        if prediction is not None and prediction.status == InterviewPrediction.STATUS_RUNNING:
+            pending.append((prediction, job))
+    if not pending:
+        if queued is not None:
+            fail_queued_batch(queued, "No reserved prediction was still running.")
+        return None
+
+    try:
+        config = config or resolve_batch_config()
+        batch_requests = [
+            build_batch_request(
+                config,
+                prediction,
+                job["interviewee"],
+                job["interviewer"],
+                job.get("interview_context"),
+            )
+            for prediction, job in pending
+        ]
+        batch_id = get_batch_api(config).submit(batch_requests)
+    except Exception as exc:
+        _fail_predictions([prediction for prediction, _ in pending], exc)
+        if queued is not None:
+            fail_queued_batch(queued, exc)
+        raise
+
+    batch = queued or PredictionBatch()
+    batch.provider = config.provider
+    batch.model = config.model
+    batch.batch_id = batch_id
+    batch.status = PredictionBatch.STATUS_SUBMITTED
+    batch.request_count = len(pending)
+    batch.save()
+    InterviewPrediction.objects.filter(pk__in=[prediction.pk for prediction, _ in pending]).update(batch=batch)
+    return batch
+
+
+def _complete_from_result(batch, prediction, item):
+    if item.data is None:
+        raise AIClientError(item.error or "Batch request failed.")
+    content, stop_reason, usage = _read_provider_response(batch.provider, item.data)
+    report = {}
+    result = _finish_generation(batch.provider, content, stop_reason, usage, report.update)
+    return _complete_prediction_job(prediction, result, {**report, "batch": True})
+
+
+def apply_batch_results(batch, results):
+    """Complete or fail every still-RUNNING prediction of `batch` from its results."""
+    predictions = {
+        batch_custom_id(prediction): prediction
+        for prediction in batch.predictions.select_related("user").filter(
+            status=InterviewPrediction.STATUS_RUNNING
+        )
+    }
+    for item in results:
+        prediction = predictions.pop(item.custom_id, None)
+        if prediction is None:
+            continue
+        try:
+            _complete_from_result(batch, prediction, item)
+        except Exception as exc:
+            _fail_prediction_job(prediction, prediction.user, exc)
+    _fail_predictions(predictions.values(), AIClientError("Batch ended without a result for this prediction."))
+
+
+def _fail_batch(batch, error):
+    _fail_predictions(
+        batch.predictions.select_related("user").filter(status=InterviewPrediction.STATUS_RUNNING),
+        error,
+    )
+    batch.status = PredictionBatch.STATUS_FAILED
+    batch.error_text = str(error)
+
+
+def batch_expired(batch):
+    return (timezone.now() - batch.created_at).total_seconds() > batch_max_age()
+
+
+def expire_prediction_batch(batch):
+    """Give up on a batch older than AI_BATCH_MAX_AGE and fail its remaining rows."""
+    label = f"{batch.provider.title()} batch {batch.batch_id}" if batch.batch_id else "Queued prediction batch"
+    _fail_batch(batch, AIClientError(f"{label} did not finish in time."))
+    batch.completed_at = timezone.now()
+    batch.save(update_fields=["status", "error_text", "completed_at", "updated_at"])
+
+
+def expire_stale_prediction_batches():
+    """Expire every QUEUED or SUBMITTED batch past AI_BATCH_MAX_AGE; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=batch_max_age())
+    stale = PredictionBatch.objects.filter(
+        status__in=[PredictionBatch.STATUS_QUEUED, PredictionBatch.STATUS_SUBMITTED],
+        created_at__lt=cutoff,
+    )
+    expired = 0
+    for batch in stale.iterator():
+        expire_prediction_batch(batch)
+        expired += 1
+    return expired
+
+
+def poll_prediction_batch(batch):
+    """
+    Check a submitted batch once and return its provider state. Ended batches
+    have their results applied; failed ones fail their predictions.
+    """
+    api = get_batch_api(_batch_provider_config(batch))
+    state, info = api.poll(batch.batch_id)
+    if state == BATCH_ENDED:
+        apply_batch_results(batch, api.results(batch.batch_id, info))
+        batch.status = PredictionBatch.STATUS_COMPLETED
+    elif state == BATCH_FAILED:
+        _fail_batch(batch, AIClientError(f"{batch.provider.title()} batch {batch.batch_id} failed."))
+    else:
+        return state
+    batch.completed_at = timezone.now()
+    batch.save(update_fields=["status", "error_text", "completed_at", "updated_at"])
+    return state
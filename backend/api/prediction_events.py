@@ -0,0 +1,119 @@
+"""
+Prediction progress events over Redis pub/sub.
+
+`execute_prediction_job` publishes status transitions (and streamed topics)
+on a per-fingerprint channel; the SSE endpoint relays them to the dashboard
+so clients no longer need to poll while a job is RUNNING.
+"""
+
+import json
+import time
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer
+
+try:
+    from django_redis import get_redis_connection
+except ImportError:  # pragma: no cover - django-redis is in requirements.txt
+    get_redis_connection = None
+
+EVENT_STATUS = "status"
+EVENT_TOPIC = "topic"
+
+TERMINAL_STATUSES = {"COMPLETED", "FAILED"}
+
+
+def _build_events_channel(fingerprint):
+    return f"predict:events:{fingerprint}"
+
+
+def _redis_connection():
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        # Non-Redis cache backends (e.g. LocMemCache in tests) have no pub/sub.
+        return None
+
+
+def publish_prediction_event(fingerprint, event_type, data):
+    """Best-effort publish; a Redis outage must never fail the prediction job."""
+    try:
+        connection = _redis_connection()
+        if connection is None:
+            return
+        message = json.dumps({"event": event_type, "data": data})
+        connection.publish(_build_events_channel(fingerprint), message)
+    except Exception:
+        pass
+
+
+def publish_prediction_status(fingerprint, status):
+    publish_prediction_event(fingerprint, EVENT_STATUS, {"status": status, "fingerprint": fingerprint})
+
+
+def subscribe_prediction_events(fingerprint):
+    """Return a subscribed pub/sub handle, or None when Redis is unavailable."""
+    try:
+        connection = _redis_connection()
+        if connection is None:
+            return None
+        pubsub = connection.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(_build_events_channel(fingerprint))
+        return pubsub
+    except Exception:
+        return None
+
+
+def iter_prediction_events(pubsub, *, timeout=None, keepalive=None, stop=None):
+    """
+    Yield `(event_type, data)` tuples from a subscription until `timeout`,
+    or until the `stop` event is set. Yields `(None, None)` every `keepalive`
+    seconds of silence so the caller can emit an SSE comment and keep proxies
+    from closing the connection. The subscription is closed on the way out,
+    by whichever thread is reading it.
+    """
+    timeout = timeout if timeout is not None else getattr(settings, "PREDICTION_EVENTS_TIMEOUT", 60)
+    keepalive = keepalive if keepalive is not None else getattr(settings, "PREDICTION_EVENTS_KEEPALIVE", 15)
+    deadline = time.monotonic() + timeout
+    last_sent = time.monotonic()
+    try:
+        while time.monotonic() < deadline and not (stop is not None and stop.is_set()):
+            try:
+                message = pubsub.get_message(timeout=1.0)
+            except Exception:
+                return
+            now = time.monotonic()
+            if message is None or message.get("type") != "message":
+                if now - last_sent >= keepalive:
+                    last_sent = now
+                    yield None, None
+                continue
+            try:
+                decoded = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            last_sent = now
+            yield decoded.get("event"), decoded.get("data")
+    finally:
+        try:
+            pubsub.close()
+        except Exception:
+            pass
+
+
+def format_sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF content negotiation accept `Accept: text/event-stream`."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only reached for non-streaming responses such as 404 or 429.
+        return format_sse("error", data).encode(self.charset)
@@ -1,6 +1,9 @@
 import hashlib
 import json
+import logging
+from datetime import timedelta
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
@@ -9,12 +12,58 @@ from .ai_client import (
     OUTPUT_MODE,
     PROMPT_VERSION,
     AIClientError,
+    _draft_tier_enabled,
     _normalize_interview_context,
+    _streaming_enabled,
     generate_questions,
 )
+from .async_ai_client import agenerate_questions
+from .async_executor import db_phase
+from .generation_cache import (
+    agenerate_single_flight,
+    build_shared_generation_key,
+    generate_single_flight,
+    shared_generation_enabled,
+    shared_generation_input,
+)
+from .interviewer_digest import (
+    get_or_create_interviewer_digest,
+    interviewer_digest_enabled,
+)
 from .models import InterviewPrediction
+from .prediction_events import (
+    EVENT_STATUS,
+    EVENT_TOPIC,
+    publish_prediction_event,
+    publish_prediction_status,
+)
+from .prediction_state_cache import (
+    _build_result_key,
+    acache_last_good,
+    aget_cached_last_good,
+    aget_cached_state,
+    aremember_state,
+    cache_completed_result,
+    cache_last_good,
+    cache_status_state,
+    get_cached_last_good,
+    get_cached_state,
+    invalidate_state,
+    prediction_state_cache_enabled,
+    remember_state,
+)
 from .profile_trim import trim_predict_person
-from .topic_service import replace_prediction_topics, topics_for_prediction
+from .topic_service import (
+    append_prediction_topic,
+    atopics_for_prediction,
+    clear_prediction_topics,
+    replace_prediction_topics,
+    topics_for_prediction,
+)
+
+INTERRUPTED_ERROR = "Prediction job was interrupted before it finished."
+
+logger = logging.getLogger(__name__)
 
 
 def _effective_prompt_version(prompt_version=""):
@@ -55,66 +104,376 @@ def compute_fingerprint(
     return digest.hexdigest()
 
 
-def _build_failed_payload(error_text, db_user):
-    fallback = None
-    last_good = (
-        InterviewPrediction.objects.filter(
-            user=db_user,
-            status=InterviewPrediction.STATUS_COMPLETED,
-        )
-        .order_by("-last_success_at")
-        .first()
-    )
-    if last_good and last_good.result_json:
-        try:
-            fallback = json.loads(last_good.result_json)
-        except Exception:
-            fallback = None
+def _last_good_prediction_query(db_user):
+    return InterviewPrediction.objects.filter(
+        user=db_user,
+        status=InterviewPrediction.STATUS_COMPLETED,
+    ).order_by("-last_success_at").values("id", "fingerprint")
+
+
+def _last_good_reference(prediction):
+    return {"id": prediction.pk, "fingerprint": prediction.fingerprint}
 
+
+def get_last_good_reference(db_user):
+    """
+    Return `{"id", "fingerprint"}` of the user's newest COMPLETED prediction,
+    or None. Served from the pointer `_complete_prediction_job` maintains,
+    falling back to an index-only query that never loads the result itself.
+    """
+    reference = get_cached_last_good(db_user.pk)
+    if reference is None:
+        reference = _last_good_prediction_query(db_user).first()
+        cache_last_good(db_user.pk, reference)
+    return reference or None
+
+
+async def aget_last_good_reference(db_user):
+    reference = await aget_cached_last_good(db_user.pk)
+    if reference is None:
+        reference = await _last_good_prediction_query(db_user).afirst()
+        await acache_last_good(db_user.pk, reference)
+    return reference or None
+
+
+def _stored_result(db_obj):
+    result = db_obj.result_json
+    return result if isinstance(result, dict) else None
+
+
+def _failed_payload(error_text, last_good):
+    # The fallback is a reference; clients load the full result on demand
+    # from GET /api/predictions/<fingerprint>.
     return {
         "status": InterviewPrediction.STATUS_FAILED,
         "error": error_text or "Upstream error",
-        "last_good_fallback": fallback,
+        "last_good_fallback": last_good,
     }
 
 
+def _build_failed_payload(error_text, db_user):
+    return _failed_payload(error_text, get_last_good_reference(db_user))
+
+
+async def _abuild_failed_payload(error_text, db_user):
+    return _failed_payload(error_text, await aget_last_good_reference(db_user))
+
+
+def _streamed_topic_writer(db_obj):
+    """Persist topics as they stream in so RUNNING polls can show them early."""
+
+    def on_topic(topic):
+        # A failed early write must not abort generation: the final result
+        # replaces the streamed topics anyway.
+        try:
+            stored = append_prediction_topic(db_obj, topic)
+        except Exception:
+            logger.warning(
+                "Could not store streamed topic for prediction %s", db_obj.fingerprint, exc_info=True
+            )
+            return
+        if stored is not None:
+            invalidate_state(db_obj.fingerprint)
+            publish_prediction_event(db_obj.fingerprint, EVENT_TOPIC, stored)
+
+    return on_topic
+
+
+def _draft_writer(db_obj):
+    """Store a fast-model draft with DRAFT status until the refined result replaces it."""
+
+    def on_draft(result):
+        db_obj.result_json = result
+        db_obj.status = InterviewPrediction.STATUS_DRAFT
+        db_obj.save(update_fields=["result_json", "status", "updated_at"])
+        replace_prediction_topics(db_obj, result.get("topics") or [])
+        payload = _draft_payload(db_obj)
+        cache_status_state(db_obj.fingerprint, payload, 202)
+        publish_prediction_event(db_obj.fingerprint, EVENT_STATUS, payload)
+
+    return on_draft
+
+
+def _draft_payload(db_obj):
+    result = _stored_result(db_obj)
+    if result is None:
+        return None
+    return {"status": InterviewPrediction.STATUS_DRAFT, "fingerprint": db_obj.fingerprint, "result": result}
+
+
+def _running_timeout():
+    return getattr(settings, "PREDICTION_RUNNING_TIMEOUT", 1800)
+
+
+def batch_max_age():
+    return max(int(getattr(settings, "AI_BATCH_MAX_AGE", 90000)), 1)
+
+
+def _is_interrupted(db_obj):
+    """
+    A RUNNING or DRAFT row nothing has touched for PREDICTION_RUNNING_TIMEOUT
+    belongs to a job that died (e.g. a hard-killed worker). Rows queued in a
+    provider batch wait on the batch instead, so they only count as
+    interrupted past AI_BATCH_MAX_AGE, when its poll task has given up or died.
+    """
+    timeout = batch_max_age() if db_obj.batch_id is not None else _running_timeout()
+    if timeout <= 0 or db_obj.updated_at is None:
+        return False
+    return db_obj.updated_at <= timezone.now() - timedelta(seconds=timeout)
+
+
+def _expire_interrupted_job(db_obj):
+    """Fail an interrupted RUNNING row, unless something moved it on meanwhile."""
+    updated = InterviewPrediction.objects.filter(
+        pk=db_obj.pk,
+        status=InterviewPrediction.STATUS_RUNNING,
+        updated_at=db_obj.updated_at,
+    ).update(
+        status=InterviewPrediction.STATUS_FAILED,
+        error_text=INTERRUPTED_ERROR,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        db_obj.status = InterviewPrediction.STATUS_FAILED
+        db_obj.error_text = INTERRUPTED_ERROR
+        cache.delete(_build_lock_key(db_obj.fingerprint))
+        publish_prediction_status(db_obj.fingerprint, InterviewPrediction.STATUS_FAILED)
+    return updated
+
+
+def _settle_interrupted_draft(db_obj):
+    """
+    Keep the draft of an interrupted refine as the final result, unless
+    something moved the row on meanwhile. Returns the result or None.
+    """
+    claimed = InterviewPrediction.objects.filter(
+        pk=db_obj.pk,
+        status=InterviewPrediction.STATUS_DRAFT,
+        updated_at=db_obj.updated_at,
+    ).update(updated_at=timezone.now())
+    if not claimed:
+        return None
+    result, _status = _complete_prediction_job(
+        db_obj, _stored_result(db_obj), {**(db_obj.usage or {}), "refine_error": INTERRUPTED_ERROR}
+    )
+    return result
+
+
+def _running_payload(fingerprint):
+    return {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": fingerprint}
+
+
 def _build_lock_key(fingerprint):
     return f"predict:lock:{fingerprint}"
 
 
-def _build_result_key(fingerprint):
-    return f"predict:result:{fingerprint}"
+def _prediction_state_from_row(db_obj, db_user):
+    if db_obj.status == InterviewPrediction.STATUS_COMPLETED:
+        result = _stored_result(db_obj)
+        if result is not None:
+            return result, 200
+
+    if db_obj.status == InterviewPrediction.STATUS_FAILED:
+        return _build_failed_payload(db_obj.error_text, db_user), 502
+
+    if db_obj.status == InterviewPrediction.STATUS_DRAFT:
+        payload = _draft_payload(db_obj)
+        if payload is not None:
+            if _is_interrupted(db_obj):
+                result = _settle_interrupted_draft(db_obj)
+                if result is not None:
+                    return result, 200
+            return payload, 202
+
+    if db_obj.status == InterviewPrediction.STATUS_RUNNING:
+        if _is_interrupted(db_obj) and _expire_interrupted_job(db_obj):
+            return _build_failed_payload(INTERRUPTED_ERROR, db_user), 502
+        payload = {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": db_obj.fingerprint}
+        if _streaming_enabled():
+            partial_topics = topics_for_prediction(db_obj)
+            if partial_topics:
+                payload["topics"] = partial_topics
+        return payload, 202
+
+    return None, None
+
+
+def _cached_prediction_state(fingerprint):
+    return get_cached_state(fingerprint)
 
 
 def get_prediction_state_by_fingerprint(db_user, fingerprint):
-    result_key = _build_result_key(fingerprint)
+    """
+    Resolve state through the local tier and Redis before the DB row, filling
+    the cache from the row on a miss. With PREDICTION_STATE_CACHE_ENABLED off
+    the row is read first and the cache only covers fingerprints without one.
+    """
+    cache_first = prediction_state_cache_enabled()
+    if cache_first:
+        payload, response_status = get_cached_state(fingerprint)
+        if payload is not None:
+            return payload, response_status
 
     try:
         db_obj = InterviewPrediction.objects.get(fingerprint=fingerprint, user=db_user)
-        if db_obj.status == InterviewPrediction.STATUS_COMPLETED and db_obj.result_json:
-            try:
-                return json.loads(db_obj.result_json), 200
-            except Exception:
-                pass
-
-        if db_obj.status == InterviewPrediction.STATUS_FAILED:
-            return _build_failed_payload(db_obj.error_text, db_user), 502
-
-        if db_obj.status == InterviewPrediction.STATUS_RUNNING:
-            return {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": fingerprint}, 202
+        payload, response_status = _prediction_state_from_row(db_obj, db_user)
+        if payload is not None:
+            if cache_first:
+                remember_state(fingerprint, payload, response_status)
+            return payload, response_status
     except InterviewPrediction.DoesNotExist:
         pass
 
-    cached = cache.get(result_key)
-    if cached:
-        try:
-            return json.loads(cached), 200
-        except Exception:
-            cache.delete(result_key)
+    if cache_first:
+        return None, None
+    return _cached_prediction_state(fingerprint)
+
+
+def get_prediction_state_for_session(db_user, prep_session, fingerprint):
+    """
+    Resolve prediction state through the session's `current_prediction`
+    pointer, falling back to a fingerprint lookup (and repairing the pointer)
+    when it is missing or stale. Returns (payload, status, prediction_row).
+
+    In-flight and failed states are served from the state cache without the
+    row (prediction_row is then None); COMPLETED still reads the row for its
+    `last_success_at`, but only once per result since polling stops there.
+    """
+    cache_first = prediction_state_cache_enabled()
+    if cache_first:
+        payload, response_status = get_cached_state(fingerprint)
+        if payload is not None and response_status != 200:
+            return payload, response_status, None
+
+    db_obj = prep_session.current_prediction
+    if db_obj is None or db_obj.fingerprint != fingerprint:
+        db_obj = InterviewPrediction.objects.filter(
+            fingerprint=fingerprint, user=db_user
+        ).first()
+        if db_obj is not None:
+            link_current_prediction(prep_session, db_obj)
+
+    if db_obj is not None:
+        payload, response_status = _prediction_state_from_row(db_obj, db_user)
+        if payload is not None:
+            if cache_first:
+                remember_state(fingerprint, payload, response_status)
+            return payload, response_status, db_obj
+
+    payload, response_status = _cached_prediction_state(fingerprint)
+    return payload, response_status, db_obj
+
+
+def link_current_prediction(prep_session, prediction):
+    if prep_session is None:
+        return
+    prep_session.current_prediction = prediction
+    type(prep_session).objects.filter(pk=prep_session.pk).update(
+        current_prediction=prediction
+    )
+
+
+async def _aprediction_state_from_row(db_obj, db_user):
+    """Async twin of `_prediction_state_from_row` for the ASGI read endpoints."""
+    if db_obj.status == InterviewPrediction.STATUS_COMPLETED:
+        result = _stored_result(db_obj)
+        if result is not None:
+            return result, 200
+
+    if db_obj.status == InterviewPrediction.STATUS_FAILED:
+        return await _abuild_failed_payload(db_obj.error_text, db_user), 502
+
+    if db_obj.status == InterviewPrediction.STATUS_DRAFT:
+        payload = _draft_payload(db_obj)
+        if payload is not None:
+            if _is_interrupted(db_obj):
+                result = await sync_to_async(_settle_interrupted_draft)(db_obj)
+                if result is not None:
+                    return result, 200
+            return payload, 202
+
+    if db_obj.status == InterviewPrediction.STATUS_RUNNING:
+        if _is_interrupted(db_obj) and await sync_to_async(_expire_interrupted_job)(db_obj):
+            return await _abuild_failed_payload(INTERRUPTED_ERROR, db_user), 502
+        payload = {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": db_obj.fingerprint}
+        if _streaming_enabled():
+            partial_topics = await atopics_for_prediction(db_obj)
+            if partial_topics:
+                payload["topics"] = partial_topics
+        return payload, 202
 
     return None, None
 
 
+async def _acached_prediction_state(fingerprint):
+    return await aget_cached_state(fingerprint)
+
+
+async def alink_current_prediction(prep_session, prediction):
+    if prep_session is None:
+        return
+    prep_session.current_prediction = prediction
+    await type(prep_session).objects.filter(pk=prep_session.pk).aupdate(
+        current_prediction=prediction
+    )
+
+
+async def aget_prediction_state_for_session(db_user, prep_session, fingerprint):
+    """Async twin of `get_prediction_state_for_session`."""
+    cache_first = prediction_state_cache_enabled()
+    if cache_first:
+        payload, response_status = await aget_cached_state(fingerprint)
+        if payload is not None and response_status != 200:
+            return payload, response_status, None
+
+    db_obj = prep_session.current_prediction
+    if db_obj is None or db_obj.fingerprint != fingerprint:
+        db_obj = await InterviewPrediction.objects.filter(
+            fingerprint=fingerprint, user=db_user
+        ).afirst()
+        if db_obj is not None:
+            await alink_current_prediction(prep_session, db_obj)
+
+    if db_obj is not None:
+        payload, response_status = await _aprediction_state_from_row(db_obj, db_user)
+        if payload is not None:
+            if cache_first:
+                await aremember_state(fingerprint, payload, response_status)
+            return payload, response_status, db_obj
+
+    payload, response_status = await _acached_prediction_state(fingerprint)
+    return payload, response_status, db_obj
+
+
+async def aget_prediction_statuses_by_fingerprint(db_user, fingerprints):
+    """
+    Batched status lookup for list views: one query for every fingerprint,
+    then one cache round trip for those without a DB row.
+    Returns {fingerprint: status}; fingerprints with no known state are omitted.
+    """
+    fingerprints = [fp for fp in dict.fromkeys(fingerprints) if fp]
+    if not fingerprints:
+        return {}
+
+    statuses = {
+        fingerprint: pred_status
+        async for fingerprint, pred_status in InterviewPrediction.objects.filter(
+            user=db_user,
+            fingerprint__in=fingerprints,
+        ).values_list("fingerprint", "status")
+    }
+
+    missing = {_build_result_key(fp): fp for fp in fingerprints if fp not in statuses}
+    if missing:
+        try:
+            cached = await cache.aget_many(list(missing))
+        except Exception:
+            cached = {}
+        for key in cached:
+            statuses[missing[key]] = InterviewPrediction.STATUS_COMPLETED
+    return statuses
+
+
 def get_prediction_state(
     *,
     user_identifier,
@@ -168,7 +527,7 @@ def reserve_prediction_job(
         return {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": fingerprint}, 202, fingerprint, False
 
     try:
-        InterviewPrediction.objects.get_or_create(
+        db_obj, created = InterviewPrediction.objects.get_or_create(
             fingerprint=fingerprint,
             defaults={
                 "user": db_user,
@@ -182,6 +541,11 @@ def reserve_prediction_job(
         cache.delete(lock_key)
         return {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": fingerprint}, 202, fingerprint, False
 
+    if created:
+        cache_status_state(fingerprint, _running_payload(fingerprint), 202)
+    if prep_session is not None and prep_session.input_fingerprint == fingerprint:
+        link_current_prediction(prep_session, db_obj)
+
     return {"status": InterviewPrediction.STATUS_RUNNING, "fingerprint": fingerprint}, 202, fingerprint, True
 
 
@@ -192,9 +556,11 @@ def mark_prediction_enqueue_failed(db_user, fingerprint, error_text):
         db_obj.status = InterviewPrediction.STATUS_FAILED
         db_obj.error_text = error_text
         db_obj.save(update_fields=["status", "error_text", "updated_at"])
+        cache_status_state(fingerprint, _build_failed_payload(error_text, db_user), 502)
     except InterviewPrediction.DoesNotExist:
-        pass
+        invalidate_state(fingerprint)
     cache.delete(lock_key)
+    publish_prediction_status(fingerprint, InterviewPrediction.STATUS_FAILED)
 
 
 def run_prediction_pipeline(
@@ -230,17 +596,124 @@ def run_prediction_pipeline(
     )
 
 
-def execute_prediction_job(
+def _resolve_interviewer_digest(interviewer):
+    """
+    Stage one of the two-stage pipeline. Returns None when disabled or when
+    the digest cannot be produced, so the caller falls back to the
+    single-stage prompt instead of failing the job.
+    """
+    if not interviewer_digest_enabled():
+        return None
+    try:
+        return get_or_create_interviewer_digest(interviewer)
+    except AIClientError:
+        return None
+
+
+def _generation_kwargs(on_topic, interviewer_digest, on_usage=None, on_draft=None):
+    kwargs = {"on_topic": on_topic}
+    if on_usage is not None:
+        kwargs["on_usage"] = on_usage
+    if on_draft is not None:
+        kwargs["on_draft"] = on_draft
+    if interviewer_digest:
+        kwargs["interviewer_digest"] = interviewer_digest
+    return kwargs
+
+
+def _shared_generation_key(interviewee, interviewer, interview_context, *, prompt_version, interviewer_digest):
+    shared_interviewee = shared_generation_input(interviewee)
+    key = build_shared_generation_key(
+        shared_interviewee,
+        interviewer,
+        interview_context,
+        prompt_version=prompt_version,
+        interviewer_digest=interviewer_digest,
+    )
+    return key, shared_interviewee
+
+
+def _generate_shared(
+    interviewee,
+    interviewer,
+    interview_context,
+    *,
+    prompt_version,
+    on_topic=None,
+    interviewer_digest=None,
+    on_usage=None,
+    on_draft=None,
+):
+    """
+    Generate through the cross-user content-addressed cache. Regenerate
+    requests (with a nonce) bypass it so users can always force a fresh run.
+    """
+    key, shared_interviewee = _shared_generation_key(
+        interviewee,
+        interviewer,
+        interview_context,
+        prompt_version=prompt_version,
+        interviewer_digest=interviewer_digest,
+    )
+    result, _from_cache = generate_single_flight(
+        key,
+        lambda: generate_questions(
+            shared_interviewee,
+            interviewer,
+            interview_context,
+            **_generation_kwargs(on_topic, interviewer_digest, on_usage, on_draft),
+        ),
+    )
+    return result
+
+
+async def _agenerate_shared(
+    interviewee,
+    interviewer,
+    interview_context,
+    *,
+    prompt_version,
+    on_topic=None,
+    interviewer_digest=None,
+    on_usage=None,
+    on_draft=None,
+):
+    key, shared_interviewee = _shared_generation_key(
+        interviewee,
+        interviewer,
+        interview_context,
+        prompt_version=prompt_version,
+        interviewer_digest=interviewer_digest,
+    )
+    result, _from_cache = await agenerate_single_flight(
+        key,
+        lambda: agenerate_questions(
+            shared_interviewee,
+            interviewer,
+            interview_context,
+            **_generation_kwargs(on_topic, interviewer_digest, on_usage, on_draft),
+        ),
+    )
+    return result
+
+
+def _start_prediction_job(
     *,
     user_identifier,
     db_user,
     interviewee,
     interviewer,
-    prompt_version="",
-    regenerate_nonce="",
-    prep_session=None,
-    interview_context=None,
+    prompt_version,
+    regenerate_nonce,
+    prep_session,
+    interview_context,
 ):
+    """
+    Load or create the prediction row and announce RUNNING.
+
+    Returns `(db_obj, completed_result)`; a non-None result means the job
+    already completed and must not run again.
+    """
     fingerprint = compute_fingerprint(
         user_identifier,
         interviewee,
@@ -249,17 +722,12 @@ def execute_prediction_job(
         regenerate_nonce,
         interview_context,
     )
-    lock_key = _build_lock_key(fingerprint)
-    result_key = _build_result_key(fingerprint)
-    result_ttl = getattr(settings, "CACHE_TTL_RESULT", 86400)
-
     try:
         db_obj = InterviewPrediction.objects.get(fingerprint=fingerprint, user=db_user)
-        if db_obj.status == InterviewPrediction.STATUS_COMPLETED and db_obj.result_json:
-            try:
-                return json.loads(db_obj.result_json), 200
-            except Exception:
-                pass
+        if db_obj.status == InterviewPrediction.STATUS_COMPLETED:
+            result = _stored_result(db_obj)
+            if result is not None:
+                return db_obj, result
     except InterviewPrediction.DoesNotExist:
         db_obj = InterviewPrediction.objects.create(
             fingerprint=fingerprint,
@@ -270,42 +738,199 @@ def execute_prediction_job(
             status=InterviewPrediction.STATUS_RUNNING,
         )
 
+    if db_obj.status == InterviewPrediction.STATUS_RUNNING:
+        cache_status_state(fingerprint, _running_payload(fingerprint), 202)
+    publish_prediction_status(fingerprint, InterviewPrediction.STATUS_RUNNING)
+    return db_obj, None
+
+
+def _prepare_generation_inputs(db_obj, interviewee, interviewer):
+    """Return `(interviewee, interviewer, on_topic)` for the provider call."""
+    trimmed_interviewee = trim_predict_person(interviewee)
+    trimmed_interviewer = trim_predict_person(interviewer)
+    on_topic = None
+    # A DRAFT result owns the stored topics until the refined one replaces
+    # them, so per-topic streaming is off in the draft tier.
+    if _streaming_enabled() and not _draft_tier_enabled():
+        clear_prediction_topics(db_obj)
+        on_topic = _streamed_topic_writer(db_obj)
+    return trimmed_interviewee, trimmed_interviewer, on_topic
+
+
+def _complete_prediction_job(db_obj, result, usage):
+    fingerprint = db_obj.fingerprint
+    db_obj.result_json = result
+    db_obj.usage = usage
+    db_obj.status = InterviewPrediction.STATUS_COMPLETED
+    db_obj.error_text = ""
+    db_obj.last_success_at = timezone.now()
+    db_obj.save(
+        update_fields=["result_json", "status", "error_text", "usage", "last_success_at", "updated_at"]
+    )
+    replace_prediction_topics(db_obj, result.get("topics") or [])
+    cache_completed_result(fingerprint, result)
+    cache_last_good(db_obj.user_id, _last_good_reference(db_obj))
+    cache.delete(_build_lock_key(fingerprint))
+    publish_prediction_status(fingerprint, InterviewPrediction.STATUS_COMPLETED)
+    return result, 200
+
+
+def _promote_draft_on_failure(db_obj, usage, exc):
+    """
+    Keep a stored draft as the result when the refined run fails after it;
+    returns None when there is no usable draft.
+    """
+    draft = _stored_result(db_obj) if db_obj.status == InterviewPrediction.STATUS_DRAFT else None
+    if draft is None:
+        return None
+    return _complete_prediction_job(db_obj, draft, {**usage, "refine_error": str(exc)})
+
+
+def _fail_prediction_job(db_obj, db_user, exc):
+    if isinstance(exc, AIClientError):
+        error_text = str(exc)
+    else:
+        error_text = f"Server error: {exc}"
+    db_obj.status = InterviewPrediction.STATUS_FAILED
+    db_obj.error_text = error_text
+    db_obj.save(update_fields=["status", "error_text", "updated_at"])
+    failed = _build_failed_payload(error_text, db_user)
+    cache_status_state(db_obj.fingerprint, failed, 502)
+    cache.delete(_build_lock_key(db_obj.fingerprint))
+    publish_prediction_status(db_obj.fingerprint, InterviewPrediction.STATUS_FAILED)
+    if isinstance(exc, AIClientError):
+        return failed, 502
+    return {"status": "FAILED", "error": error_text}, 500
+
+
+def execute_prediction_job(
+    *,
+    user_identifier,
+    db_user,
+    interviewee,
+    interviewer,
+    prompt_version="",
+    regenerate_nonce="",
+    prep_session=None,
+    interview_context=None,
+):
+    db_obj, completed = _start_prediction_job(
+        user_identifier=user_identifier,
+        db_user=db_user,
+        interviewee=interviewee,
+        interviewer=interviewer,
+        prompt_version=prompt_version,
+        regenerate_nonce=regenerate_nonce,
+        prep_session=prep_session,
+        interview_context=interview_context,
+    )
+    if completed is not None:
+        return completed, 200
+
+    usage = {}
     try:
-        trimmed_interviewee = trim_predict_person(interviewee)
-        trimmed_interviewer = trim_predict_person(interviewer)
-        result = generate_questions(
-            trimmed_interviewee,
-            trimmed_interviewer,
-            interview_context,
-        )
-        db_obj.result_json = json.dumps(result)
-        db_obj.status = InterviewPrediction.STATUS_COMPLETED
-        db_obj.error_text = ""
-        db_obj.last_success_at = timezone.now()
-        db_obj.save(
-            update_fields=["result_json", "status", "error_text", "last_success_at", "updated_at"]
+        trimmed_interviewee, trimmed_interviewer, on_topic = _prepare_generation_inputs(
+            db_obj, interviewee, interviewer
         )
-        replace_prediction_topics(db_obj, result.get("topics") or [])
+        interviewer_digest = _resolve_interviewer_digest(trimmed_interviewer)
+        on_draft = _draft_writer(db_obj) if _draft_tier_enabled() else None
+        if shared_generation_enabled() and not regenerate_nonce:
+            result = _generate_shared(
+                trimmed_interviewee,
+                trimmed_interviewer,
+                interview_context,
+                prompt_version=_effective_prompt_version(prompt_version),
+                on_topic=on_topic,
+                interviewer_digest=interviewer_digest,
+                on_usage=usage.update,
+                on_draft=on_draft,
+            )
+        else:
+            result = generate_questions(
+                trimmed_interviewee,
+                trimmed_interviewer,
+                interview_context,
+                **_generation_kwargs(on_topic, interviewer_digest, usage.update, on_draft),
+            )
+        return _complete_prediction_job(db_obj, result, usage)
+    except AIClientError as exc:
+        promoted = _promote_draft_on_failure(db_obj, usage, exc)
+        if promoted is not None:
+            return promoted
+        return _fail_prediction_job(db_obj, db_user, exc)
+    except Exception as exc:
+        return _fail_prediction_job(db_obj, db_user, exc)
 
-        try:
-            cache.set(result_key, json.dumps(result), timeout=result_ttl)
-        except Exception:
-            pass
 
-        cache.delete(lock_key)
-        return result, 200
+async def aexecute_prediction_job(
+    *,
+    user_identifier,
+    db_user,
+    interviewee,
+    interviewer,
+    prompt_version="",
+    regenerate_nonce="",
+    prep_session=None,
+    interview_context=None,
+):
+    """
+    Async twin of `execute_prediction_job` for the event-loop execution mode.
+
+    The provider call is awaited on the loop; DB and cache work runs through
+    `db_phase`, so many jobs can wait on their providers concurrently. The
+    interviewer digest may make a blocking provider call, so it runs off the
+    shared thread the other jobs' DB phases use.
+    """
+    db_obj, completed = await db_phase(_start_prediction_job)(
+        user_identifier=user_identifier,
+        db_user=db_user,
+        interviewee=interviewee,
+        interviewer=interviewer,
+        prompt_version=prompt_version,
+        regenerate_nonce=regenerate_nonce,
+        prep_session=prep_session,
+        interview_context=interview_context,
+    )
+    if completed is not None:
+        return completed, 200
+
+    usage = {}
+    try:
+        trimmed_interviewee, trimmed_interviewer, on_topic = await db_phase(_prepare_generation_inputs)(
+            db_obj, interviewee, interviewer
+        )
+        interviewer_digest = await db_phase(_resolve_interviewer_digest, thread_sensitive=False)(
+            trimmed_interviewer
+        )
+        if on_topic is not None:
+            on_topic = db_phase(on_topic)
+        on_draft = db_phase(_draft_writer(db_obj)) if _draft_tier_enabled() else None
+        if shared_generation_enabled() and not regenerate_nonce:
+            result = await _agenerate_shared(
+                trimmed_interviewee,
+                trimmed_interviewer,
+                interview_context,
+                prompt_version=_effective_prompt_version(prompt_version),
+                on_topic=on_topic,
+                interviewer_digest=interviewer_digest,
+                on_usage=usage.update,
+                on_draft=on_draft,
+            )
+        else:
+            result = await agenerate_questions(
+                trimmed_interviewee,
+                trimmed_interviewer,
+                interview_context,
+                **_generation_kwargs(on_topic, interviewer_digest, usage.update, on_draft),
+            )
+        return await db_phase(_complete_prediction_job)(db_obj, result, usage)
     except AIClientError as exc:
-        db_obj.status = InterviewPrediction.STATUS_FAILED
-        db_obj.error_text = str(exc)
-        db_obj.save(update_fields=["status", "error_text", "updated_at"])
-        cache.delete(lock_key)
-        return _build_failed_payload(str(exc), db_user), 502
+        promoted = await db_phase(_promote_draft_on_failure)(db_obj, usage, exc)
+        if promoted is not None:
+            return promoted
+        return await db_phase(_fail_prediction_job)(db_obj, db_user, exc)
     except Exception as exc:
-        db_obj.status = InterviewPrediction.STATUS_FAILED
-        db_obj.error_text = f"Server error: {exc}"
-        db_obj.save(update_fields=["status", "error_text", "updated_at"])
-        cache.delete(lock_key)
-        return {"status": "FAILED", "error": f"Server error: {exc}"}, 500
+        return await db_phase(_fail_prediction_job)(db_obj, db_user, exc)
 
 
 def enrich_completed_result(db_obj, payload):
@@ -318,3 +943,14 @@ def enrich_completed_result(db_obj, payload):
     if not enriched.get("topics"):
         enriched["topics"] = topics_for_prediction(db_obj)
     return enriched
+
+
+async def aenrich_completed_result(db_obj, payload):
+    if not isinstance(payload, dict):
+        return payload
+    if db_obj is None:
+        return payload
+    enriched = dict(payload)
+    if not enriched.get("topics"):
+        enriched["topics"] = await atopics_for_prediction(db_obj)
+    return enriched
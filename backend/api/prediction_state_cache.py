@@ -0,0 +1,183 @@
+"""
+Read-through cache for prediction state.
+
+Polls resolve a fingerprint through three tiers: a per-process LRU, Redis,
+then the `InterviewPrediction` row. A COMPLETED result never changes for a
+fingerprint, so it lives under the long-lived result key and may also sit
+in the local tier. RUNNING, DRAFT and FAILED entries only live in Redis,
+under a short CACHE_TTL_STATUS, because another process (the worker) moves
+them on; the job rewrites them on every transition and read-through fills
+only use `add`, so a poll that raced a transition cannot overwrite it.
+
+It also keeps a per-user pointer to the newest COMPLETED prediction, which
+failure payloads return as their `last_good_fallback` reference.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .local_cache import LocalLRU
+from .result_codec import decode_result, encode_result
+
+local_results = LocalLRU("PREDICTION_STATE_LOCAL_SIZE", 1024, "PREDICTION_STATE_LOCAL_TTL", 60)
+
+
+def prediction_state_cache_enabled():
+    return bool(getattr(settings, "PREDICTION_STATE_CACHE_ENABLED", True))
+
+
+def _build_result_key(fingerprint):
+    return f"predict:result:{fingerprint}"
+
+
+def _build_state_key(fingerprint):
+    return f"predict:state:{fingerprint}"
+
+
+def _build_last_good_key(user_id):
+    return f"predict:last_good:{user_id}"
+
+
+def _result_ttl():
+    return getattr(settings, "CACHE_TTL_RESULT", 86400)
+
+
+def _status_ttl():
+    return getattr(settings, "CACHE_TTL_STATUS", 15)
+
+
+def _encode_status(payload, response_status):
+    return encode_result({"response_status": response_status, "payload": payload})
+
+
+def _decode_status(value):
+    entry = decode_result(value)
+    if entry is None or not isinstance(entry.get("payload"), dict):
+        return None, None
+    return entry["payload"], entry.get("response_status")
+
+
+def _state_from_entries(fingerprint, entries):
+    """Return `((payload, status), stale_keys)` from a `get_many` result."""
+    result_key = _build_result_key(fingerprint)
+    cached = entries.get(result_key)
+    if cached:
+        result = decode_result(cached)
+        if result is not None:
+            local_results.put(fingerprint, result)
+            return (result, 200), []
+        return _decode_status(entries.get(_build_state_key(fingerprint))), [result_key]
+    return _decode_status(entries.get(_build_state_key(fingerprint))), []
+
+
+def get_cached_state(fingerprint):
+    """Return `(payload, status)` from the local tier or Redis, or `(None, None)`."""
+    result = local_results.get(fingerprint)
+    if result is not None:
+        return result, 200
+    try:
+        entries = cache.get_many([_build_result_key(fingerprint), _build_state_key(fingerprint)])
+    except Exception:
+        return None, None
+    state, stale_keys = _state_from_entries(fingerprint, entries)
+    if stale_keys:
+        cache.delete_many(stale_keys)
+    return state
+
+
+async def aget_cached_state(fingerprint):
+    result = local_results.get(fingerprint)
+    if result is not None:
+        return result, 200
+    try:
+        entries = await cache.aget_many([_build_result_key(fingerprint), _build_state_key(fingerprint)])
+    except Exception:
+        return None, None
+    state, stale_keys = _state_from_entries(fingerprint, entries)
+    if stale_keys:
+        await cache.adelete_many(stale_keys)
+    return state
+
+
+def cache_completed_result(fingerprint, result):
+    """Write-through for COMPLETED: store the result and drop any status entry."""
+    local_results.put(fingerprint, result)
+    try:
+        cache.set(_build_result_key(fingerprint), encode_result(result), timeout=_result_ttl())
+        cache.delete(_build_state_key(fingerprint))
+    except Exception:
+        pass
+
+
+def cache_status_state(fingerprint, payload, response_status):
+    """Write-through for RUNNING, DRAFT and FAILED transitions."""
+    try:
+        cache.set(_build_state_key(fingerprint), _encode_status(payload, response_status), timeout=_status_ttl())
+    except Exception:
+        pass
+
+
+def remember_state(fingerprint, payload, response_status):
+    """Read-through fill after a DB read; never overwrites a newer entry."""
+    try:
+        if response_status == 200:
+            local_results.put(fingerprint, payload)
+            cache.add(_build_result_key(fingerprint), encode_result(payload), timeout=_result_ttl())
+        else:
+            cache.add(_build_state_key(fingerprint), _encode_status(payload, response_status), timeout=_status_ttl())
+    except Exception:
+        pass
+
+
+async def aremember_state(fingerprint, payload, response_status):
+    try:
+        if response_status == 200:
+            local_results.put(fingerprint, payload)
+            await cache.aadd(_build_result_key(fingerprint), encode_result(payload), timeout=_result_ttl())
+        else:
+            await cache.aadd(
+                _build_state_key(fingerprint), _encode_status(payload, response_status), timeout=_status_ttl()
+            )
+    except Exception:
+        pass
+
+
+def invalidate_state(fingerprint):
+    """Drop the status entry so the next poll reads the row again."""
+    try:
+        cache.delete(_build_state_key(fingerprint))
+    except Exception:
+        pass
+
+
+def get_cached_last_good(user_id):
+    """
+    Return the cached last-good reference for `user_id`: a dict, `{}` when
+    the user is known to have none, or None on a miss.
+    """
+    try:
+        return cache.get(_build_last_good_key(user_id))
+    except Exception:
+        return None
+
+
+async def aget_cached_last_good(user_id):
+    try:
+        return await cache.aget(_build_last_good_key(user_id))
+    except Exception:
+        return None
+
+
+def cache_last_good(user_id, reference):
+    """Store the last-good pointer; `reference=None` records that there is none."""
+    try:
+        cache.set(_build_last_good_key(user_id), reference or {}, timeout=_result_ttl())
+    except Exception:
+        pass
+
+
+async def acache_last_good(user_id, reference):
+    try:
+        await cache.aset(_build_last_good_key(user_id), reference or {}, timeout=_result_ttl())
+    except Exception:
+        pass
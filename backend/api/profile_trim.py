@@ -1,11 +1,19 @@
 """Trim scraped profile text before sending to the AI provider."""
 
+import math
+import re
+
+from django.conf import settings
+
+# Safety ceiling only, far above what AI_PROFILE_TOKEN_BUDGET admits: it
+# bounds pathological scrapes while `budget_predict_people` decides what is
+# actually trimmed.
 DEFAULT_MAX_FIELD_CHARS = {
-    "experience": 10_000,
-    "education": 2_000,
+    "experience": 100_000,
+    "education": 20_000,
 }
 
-DEFAULT_MAX_FIELD_CHARS_FALLBACK = 1_500
+DEFAULT_MAX_FIELD_CHARS_FALLBACK = 10_000
 
 
 def trim_profile_field(text: str, field_name: str = "") -> str:
@@ -37,3 +45,221 @@ def trim_predict_person(person: dict) -> dict:
         if field in trimmed:
             trimmed[field] = trim_profile_field(str(trimmed.get(field) or ""), field)
     return trimmed
+
+
+# ---------------------------------------------------------------------------
+# Token-budget trimming
+# ---------------------------------------------------------------------------
+#
+# The caps above only guard against runaway input when the payload is built.
+# Right before the provider call, `budget_predict_people` fits both profiles
+# into one shared input-token budget, so a long profile keeps its full text
+# whenever the other one leaves room, and otherwise loses its least useful
+# lines first.
+
+DEFAULT_PROFILE_TOKEN_BUDGET = 6_000
+
+# Approximate tokenizer: word pieces of up to N characters are one token,
+# digits group in threes, every punctuation mark is its own token. The
+# per-provider factor accounts for Claude's tokenizer producing slightly more
+# tokens than OpenAI's o200k/cl100k encodings for the same English text.
+_TOKEN_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_|\n")
+_WORD_PIECE_CHARS = 6
+_DIGIT_PIECE_CHARS = 3
+PROVIDER_TOKEN_FACTORS = {
+    "openai": 1.0,
+    "anthropic": 1.15,
+}
+
+# Relative value of each profile section when the budget is tight. Within a
+# section earlier text scores higher, since LinkedIn lists the most recent
+# roles first; the score halves every RECENCY_HALF_TOKENS tokens into the
+# section, so both profiles shrink at the same rate.
+SECTION_PRIORITY = {
+    "experience": 1.0,
+    "skills": 0.9,
+    "education": 0.6,
+    "certifications": 0.5,
+    "projects": 0.5,
+    "honors_awards": 0.3,
+}
+DEFAULT_SECTION_PRIORITY = 0.4
+RECENCY_HALF_TOKENS = 400
+
+_MAX_UNIT_TOKENS = 120
+_NOTE_RESERVE_TOKENS = 8
+
+_SECTION_HEADER_RE = re.compile(r"^([A-Z][A-Z0-9_& ]*):\n")
+_TRIM_NOTE = "[{count} lower-priority lines trimmed]"
+
+
+def _raw_token_count(text: str) -> int:
+    count = 0
+    for piece in _TOKEN_PIECE_RE.findall(text or ""):
+        if piece.isdigit():
+            count += math.ceil(len(piece) / _DIGIT_PIECE_CHARS)
+        elif piece.isalpha():
+            count += math.ceil(len(piece) / _WORD_PIECE_CHARS)
+        else:
+            count += 1
+    return count
+
+
+def estimate_tokens(text: str, provider: str = "") -> int:
+    """Estimate the provider token count of `text` without a tokenizer dependency."""
+    if not text:
+        return 0
+    factor = PROVIDER_TOKEN_FACTORS.get((provider or "").lower(), 1.0)
+    return math.ceil(_raw_token_count(text) * factor)
+
+
+def _split_sections(text, field_name):
+    """Split normalized profile text into `(section_key, header, lines)` blocks."""
+    sections = []
+    for chunk in text.split("\n\n"):
+        match = _SECTION_HEADER_RE.match(chunk)
+        if match:
+            header = match.group(0)
+            key = match.group(1).strip().lower().replace(" ", "_")
+            body = chunk[len(header) :]
+        elif sections:
+            # Blank line inside a section: keep it with the previous block.
+            sections[-1][2].append("")
+            sections[-1][2].extend(chunk.split("\n"))
+            continue
+        else:
+            header, key, body = "", field_name, chunk
+        sections.append((key, header, body.split("\n")))
+    return sections
+
+
+def _split_long_line(line, provider):
+    """Break a line into pieces of at most ~_MAX_UNIT_TOKENS tokens at word boundaries."""
+    if _raw_token_count(line) <= _MAX_UNIT_TOKENS:
+        return [(line, estimate_tokens(line, provider))]
+    pieces = []
+    current = []
+    current_tokens = 0
+    for word in line.split(" "):
+        word_tokens = _raw_token_count(word)
+        if current and current_tokens + word_tokens > _MAX_UNIT_TOKENS:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return [(piece, estimate_tokens(piece, provider)) for piece in pieces]
+
+
+def _collect_units(people, provider):
+    """Flatten every line (or piece of a long line) of every budgeted field into scored units."""
+    units = []
+    layout = []
+    for person_index, person in enumerate(people):
+        if not isinstance(person, dict):
+            continue
+        for field in ("experience", "education"):
+            text = str(person.get(field) or "").strip()
+            if not text:
+                continue
+            sections = _split_sections(text, field)
+            layout.append((person_index, field, sections))
+            for section_index, (key, _header, lines) in enumerate(sections):
+                weight = SECTION_PRIORITY.get(key, DEFAULT_SECTION_PRIORITY)
+                offset = 0
+                for line_index, line in enumerate(lines):
+                    if not line.strip():
+                        continue
+                    for piece_index, (piece, tokens) in enumerate(_split_long_line(line, provider)):
+                        units.append(
+                            {
+                                "id": (person_index, field, section_index, line_index, piece_index),
+                                "score": weight / (1 + offset / RECENCY_HALF_TOKENS),
+                                # +1 for the newline joining it to the next line.
+                                "tokens": tokens + 1,
+                                "text": piece,
+                            }
+                        )
+                        offset += tokens
+    return units, layout
+
+
+def _rebuild_field(sections, kept, person_index, field):
+    chunks = []
+    for section_index, (_key, header, lines) in enumerate(sections):
+        out = []
+        dropped = 0
+        for line_index, line in enumerate(lines):
+            if not line.strip():
+                if out and out[-1]:
+                    out.append("")
+                continue
+            pieces = []
+            piece_index = 0
+            while (person_index, field, section_index, line_index, piece_index) in kept:
+                pieces.append(kept[(person_index, field, section_index, line_index, piece_index)])
+                piece_index += 1
+            if not pieces:
+                dropped += 1
+                continue
+            text = " ".join(pieces)
+            if len(text) < len(line.strip()):
+                text = f"{text} …"
+            out.append(text)
+        while out and not out[-1]:
+            out.pop()
+        if dropped:
+            out.append(_TRIM_NOTE.format(count=dropped))
+        if out:
+            chunks.append(header + "\n".join(out))
+    return "\n\n".join(chunks)
+
+
+def _people_tokens(people, provider):
+    return sum(
+        estimate_tokens(str(person.get(field) or ""), provider)
+        for person in people
+        if isinstance(person, dict)
+        for field in ("experience", "education")
+    )
+
+
+def budget_predict_people(interviewee, interviewer, *, provider="", budget=None):
+    """
+    Fit both profiles' `experience` and `education` text into one shared
+    input-token budget. Returns `(interviewee, interviewer, report)`; the
+    report carries the estimated tokens before and after and the tokens saved.
+    """
+    if budget is None:
+        budget = int(getattr(settings, "AI_PROFILE_TOKEN_BUDGET", DEFAULT_PROFILE_TOKEN_BUDGET))
+    people = [interviewee, interviewer]
+    total = _people_tokens(people, provider)
+    report = {
+        "provider": provider or "",
+        "budget": budget,
+        "input_tokens": total,
+        "output_tokens": total,
+        "tokens_saved": 0,
+    }
+    if budget <= 0 or total <= budget:
+        return interviewee, interviewer, report
+
+    units, layout = _collect_units(people, provider)
+    section_count = sum(len(sections) for _person, _field, sections in layout)
+    overhead = max(0, total - sum(unit["tokens"] for unit in units))
+    remaining = budget - overhead - section_count * _NOTE_RESERVE_TOKENS
+
+    kept = {}
+    for unit in sorted(units, key=lambda item: (-item["score"], item["id"])):
+        if unit["tokens"] <= remaining:
+            kept[unit["id"]] = unit["text"]
+            remaining -= unit["tokens"]
+
+    trimmed = [dict(person) if isinstance(person, dict) else person for person in people]
+    for person_index, field, sections in layout:
+        trimmed[person_index][field] = _rebuild_field(sections, kept, person_index, field)
+
+    report["output_tokens"] = _people_tokens(trimmed, provider)
+    report["tokens_saved"] = max(0, total - report["output_tokens"])
+    return trimmed[0], trimmed[1], report
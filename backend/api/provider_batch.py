@@ -0,0 +1,208 @@
+"""
+Provider batch APIs for bulk, non-interactive generation.
+
+Anthropic Message Batches and the OpenAI Batch API take many requests in one
+submission, finish within 24 hours and bill at a discount, without using the
+interactive rate limits. Each batch request carries the same body as an
+interactive call (see `REQUEST_BUILDERS`), and each result comes back in the
+interactive response format so `_read_provider_response` and
+`_finish_generation` apply unchanged.
+"""
+
+import json
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+
+from .ai_client import (
+    PROVIDER_DISPLAY_NAMES,
+    PROVIDER_REQUEST_TIMEOUT,
+    AIClientError,
+    AIClientTimeoutError,
+    _raise_http_error,
+)
+from .provider_transport import provider_get, provider_post
+
+BATCH_PENDING = "PENDING"
+BATCH_ENDED = "ENDED"
+BATCH_FAILED = "FAILED"
+
+OPENAI_BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    custom_id: str
+    # Response body in the interactive format, or None when the request failed.
+    data: dict = None
+    error: str = ""
+
+
+def _base_url(provider):
+    if provider == "anthropic":
+        base = getattr(settings, "AI_BATCH_ANTHROPIC_BASE_URL", "") or "https://api.anthropic.com"
+    else:
+        base = getattr(settings, "AI_BATCH_OPENAI_BASE_URL", "") or "https://api.openai.com"
+    return base.rstrip("/")
+
+
+def _send(provider, method, url, **kwargs):
+    provider_name = PROVIDER_DISPLAY_NAMES[provider]
+    send = provider_post if method == "POST" else provider_get
+    try:
+        response = send(provider, url, timeout=PROVIDER_REQUEST_TIMEOUT, **kwargs)
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as exc:
+        _raise_http_error(provider, response, exc)
+    except requests.exceptions.Timeout as exc:
+        raise AIClientTimeoutError(f"{provider_name} batch request timed out") from exc
+    except requests.exceptions.RequestException as exc:
+        raise AIClientError(f"{provider_name} network error: {exc}") from exc
+    return response
+
+
+def _iter_jsonl(text):
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(item, dict):
+            yield item
+
+
+class _AnthropicBatchAPI:
+    """Anthropic Message Batches: one JSON submission, results as JSONL."""
+
+    provider = "anthropic"
+
+    def __init__(self, config):
+        self.config = config
+        self.url = f"{_base_url(self.provider)}/v1/messages/batches"
+
+    def _headers(self):
+        return {
+            "x-api-key": self.config.api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        }
+
+    def submit(self, batch_requests):
+        """Submit `(custom_id, body)` pairs and return the provider's batch id."""
+        body = {
+            "requests": [
+                {"custom_id": custom_id, "params": params} for custom_id, params in batch_requests
+            ]
+        }
+        response = _send(self.provider, "POST", self.url, headers=self._headers(), json=body)
+        return response.json()["id"]
+
+    def poll(self, batch_id):
+        """Return `(state, info)`; `info` is what `results` needs once ended."""
+        response = _send(self.provider, "GET", f"{self.url}/{batch_id}", headers=self._headers())
+        data = response.json()
+        if data.get("processing_status") == "ended":
+            return BATCH_ENDED, data
+        return BATCH_PENDING, data
+
+    def results(self, batch_id, info):
+        results_url = info.get("results_url") or f"{self.url}/{batch_id}/results"
+        response = _send(self.provider, "GET", results_url, headers=self._headers())
+        for item in _iter_jsonl(response.text):
+            result = item.get("result") or {}
+            if result.get("type") == "succeeded":
+                yield BatchResult(item.get("custom_id", ""), data=result.get("message") or {})
+                continue
+            error = (result.get("error") or {}).get("error") or {}
+            message = error.get("message") or f"request {result.get('type') or 'failed'}"
+            yield BatchResult(item.get("custom_id", ""), error=f"Anthropic batch error: {message}")
+
+
+class _OpenAIBatchAPI:
+    """OpenAI Batch API: requests uploaded as a JSONL file, results as output/error files."""
+
+    provider = "openai"
+
+    # Expired and cancelled batches still publish whatever finished.
+    ENDED_STATUSES = {"completed", "expired", "cancelled"}
+    FAILED_STATUSES = {"failed"}
+
+    def __init__(self, config):
+        self.config = config
+        self.base_url = f"{_base_url(self.provider)}/v1"
+
+    def _headers(self):
+        return {"Authorization": f"Bearer {self.config.api_key}"}
+
+    def submit(self, batch_requests):
+        lines = "\n".join(
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": OPENAI_BATCH_ENDPOINT, "body": body})
+            for custom_id, body in batch_requests
+        )
+        upload = _send(
+            self.provider,
+            "POST",
+            f"{self.base_url}/files",
+            headers=self._headers(),
+            files={"file": ("predictions.jsonl", lines.encode("utf-8"), "application/jsonl")},
+            data={"purpose": "batch"},
+        )
+        response = _send(
+            self.provider,
+            "POST",
+            f"{self.base_url}/batches",
+            headers=self._headers(),
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": OPENAI_BATCH_ENDPOINT,
+                "completion_window": "24h",
+            },
+        )
+        return response.json()["id"]
+
+    def poll(self, batch_id):
+        response = _send(self.provider, "GET", f"{self.base_url}/batches/{batch_id}", headers=self._headers())
+        data = response.json()
+        status = data.get("status")
+        if status in self.ENDED_STATUSES:
+            return BATCH_ENDED, data
+        if status in self.FAILED_STATUSES:
+            return BATCH_FAILED, data
+        return BATCH_PENDING, data
+
+    def results(self, batch_id, info):
+        for file_id in (info.get("output_file_id"), info.get("error_file_id")):
+            if not file_id:
+                continue
+            response = _send(
+                self.provider,
+                "GET",
+                f"{self.base_url}/files/{file_id}/content",
+                headers=self._headers(),
+            )
+            for item in _iter_jsonl(response.text):
+                custom_id = item.get("custom_id", "")
+                reply = item.get("response") or {}
+                body = reply.get("body") or {}
+                if reply.get("status_code") == 200:
+                    yield BatchResult(custom_id, data=body)
+                    continue
+                error = item.get("error") or body.get("error") or {}
+                message = error.get("message") or f"HTTP {reply.get('status_code')}"
+                yield BatchResult(custom_id, error=f"OpenAI batch error: {message}")
+
+
+BATCH_APIS = {
+    "openai": _OpenAIBatchAPI,
+    "anthropic": _AnthropicBatchAPI,
+}
+
+
+def get_batch_api(config):
+    if config.provider not in BATCH_APIS:
+        raise AIClientError(f"Provider '{config.provider}' has no batch API")
+    return BATCH_APIS[config.provider](config)
@@ -0,0 +1,150 @@
+"""
+Rolling per-provider health for the `adaptive` selection strategy.
+
+Every provider call records its outcome (success, failure or truncated) in
+hourly cache slots next to the latency histogram from `provider_latency`,
+so all workers share one view. A consecutive-failure circuit breaker ejects
+a provider for AI_BREAKER_COOLDOWN seconds; after the cooldown a single
+further failure ejects it again, while a success closes the breaker.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .provider_latency import (
+    LATENCY_BUCKETS,
+    _window_hours,
+    latency_percentile,
+    provider_latency_histogram,
+    record_provider_latency,
+)
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+OUTCOME_TRUNCATED = "truncated"
+OUTCOMES = (OUTCOME_SUCCESS, OUTCOME_FAILURE, OUTCOME_TRUNCATED)
+
+# Floor for the success rate so a struggling provider's expected time stays finite.
+MIN_SUCCESS_RATE = 0.05
+
+# Per-process memo so the several provider resolutions made for one job agree
+# and do not each re-read every histogram slot.
+_snapshots = {}
+
+
+def _build_outcome_key(provider, slot, outcome):
+    return f"predict:health:{provider}:{slot}:{outcome}"
+
+
+def _build_breaker_failures_key(provider):
+    return f"predict:breaker:{provider}:failures"
+
+
+def _build_breaker_open_key(provider):
+    return f"predict:breaker:{provider}:open"
+
+
+def _breaker_settings():
+    return (
+        max(int(getattr(settings, "AI_BREAKER_THRESHOLD", 5)), 1),
+        max(int(getattr(settings, "AI_BREAKER_COOLDOWN", 60)), 1),
+    )
+
+
+def _record_breaker(provider, outcome):
+    failures_key = _build_breaker_failures_key(provider)
+    if outcome == OUTCOME_SUCCESS:
+        cache.delete_many([failures_key, _build_breaker_open_key(provider)])
+        return
+    if outcome != OUTCOME_FAILURE:
+        return
+    threshold, cooldown = _breaker_settings()
+    cache.add(failures_key, 0, timeout=cooldown * 10)
+    if cache.incr(failures_key) >= threshold:
+        cache.set(_build_breaker_open_key(provider), 1, timeout=cooldown)
+        # Half-open after the cooldown: the next failure trips it again.
+        cache.set(failures_key, threshold - 1, timeout=cooldown * 10)
+        _snapshots.pop(provider, None)
+
+
+def record_provider_outcome(provider, outcome, seconds=None, *, now=None):
+    """
+    Count one call's outcome; `seconds` also feeds the latency histogram.
+    Best-effort: a cache outage must never fail the provider call.
+    """
+    now = time.time() if now is None else now
+    if seconds is not None:
+        record_provider_latency(provider, seconds, now=now)
+    key = _build_outcome_key(provider, int(now // 3600), outcome)
+    try:
+        cache.add(key, 0, timeout=(_window_hours() + 1) * 3600)
+        cache.incr(key)
+        _record_breaker(provider, outcome)
+    except Exception:
+        pass
+
+
+def provider_circuit_open(provider):
+    try:
+        return bool(cache.get(_build_breaker_open_key(provider)))
+    except Exception:
+        return False
+
+
+def provider_health(provider, *, now=None):
+    """Rolling success/truncation rates, latency percentiles and breaker state."""
+    now = time.time() if now is None else now
+    current_slot = int(now // 3600)
+    keys = {
+        _build_outcome_key(provider, slot, outcome): outcome
+        for slot in range(current_slot - _window_hours() + 1, current_slot + 1)
+        for outcome in OUTCOMES
+    }
+    try:
+        stored = cache.get_many(list(keys))
+    except Exception:
+        stored = {}
+    counts = dict.fromkeys(OUTCOMES, 0)
+    for key, count in stored.items():
+        counts[keys[key]] += int(count or 0)
+
+    samples = sum(counts.values())
+    histogram = provider_latency_histogram(provider, now=now)
+    return {
+        "samples": samples,
+        "success_rate": counts[OUTCOME_SUCCESS] / samples if samples else None,
+        "truncation_rate": counts[OUTCOME_TRUNCATED] / samples if samples else None,
+        "p50": latency_percentile(histogram, 50),
+        "p95": latency_percentile(histogram, 95),
+        "circuit_open": provider_circuit_open(provider),
+    }
+
+
+def provider_health_snapshot(provider):
+    """`provider_health`, memoised per process for AI_ADAPTIVE_REFRESH_SECONDS."""
+    now = time.monotonic()
+    cached = _snapshots.get(provider)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    health = provider_health(provider)
+    refresh = float(getattr(settings, "AI_ADAPTIVE_REFRESH_SECONDS", 5))
+    _snapshots[provider] = (now + refresh, health)
+    return health
+
+
+def reset_provider_health_snapshots():
+    _snapshots.clear()
+
+
+def expected_completion_seconds(health):
+    """
+    Expected seconds until a job on this provider yields a usable result:
+    the median latency divided by the chance that a call succeeds. Returns
+    None below AI_ADAPTIVE_MIN_SAMPLES so unproven providers get tried.
+    """
+    if health["samples"] < int(getattr(settings, "AI_ADAPTIVE_MIN_SAMPLES", 20)):
+        return None
+    median = health["p50"] if health["p50"] is not None else LATENCY_BUCKETS[-1]
+    return median / max(health["success_rate"] or 0.0, MIN_SUCCESS_RATE)
@@ -0,0 +1,85 @@
+"""
+Per-provider latency histograms shared by every worker through the cache.
+
+Each completed provider call increments one bucket counter in an hourly
+slot; reads sum the slots inside AI_LATENCY_WINDOW_HOURS. Hedged requests
+use the resulting percentile as the deadline after which the secondary
+provider is tried.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Upper bounds in seconds; the last one matches PROVIDER_REQUEST_TIMEOUT.
+LATENCY_BUCKETS = (1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90, 120, 200)
+
+
+def _window_hours():
+    return max(int(getattr(settings, "AI_LATENCY_WINDOW_HOURS", 24)), 1)
+
+
+def _bucket_for(seconds):
+    for bound in LATENCY_BUCKETS:
+        if seconds <= bound:
+            return bound
+    return LATENCY_BUCKETS[-1]
+
+
+def _build_latency_key(provider, slot, bound):
+    return f"predict:latency:{provider}:{slot}:{bound}"
+
+
+def record_provider_latency(provider, seconds, *, now=None):
+    """Best-effort: a cache outage must never fail the provider call."""
+    now = time.time() if now is None else now
+    key = _build_latency_key(provider, int(now // 3600), _bucket_for(seconds))
+    try:
+        cache.add(key, 0, timeout=(_window_hours() + 1) * 3600)
+        cache.incr(key)
+    except Exception:
+        pass
+
+
+def provider_latency_histogram(provider, *, now=None):
+    """Return {bucket_upper_bound: count} over the configured window."""
+    now = time.time() if now is None else now
+    current_slot = int(now // 3600)
+    keys = {
+        _build_latency_key(provider, slot, bound): bound
+        for slot in range(current_slot - _window_hours() + 1, current_slot + 1)
+        for bound in LATENCY_BUCKETS
+    }
+    try:
+        counts = cache.get_many(list(keys))
+    except Exception:
+        counts = {}
+    histogram = dict.fromkeys(LATENCY_BUCKETS, 0)
+    for key, count in counts.items():
+        histogram[keys[key]] += int(count or 0)
+    return histogram
+
+
+def latency_percentile(histogram, percentile):
+    """Upper bound of the bucket holding `percentile`, or None with no samples."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    threshold = total * percentile / 100.0
+    seen = 0
+    for bound in LATENCY_BUCKETS:
+        seen += histogram.get(bound, 0)
+        if seen >= threshold:
+            return bound
+    return LATENCY_BUCKETS[-1]
+
+
+def hedge_deadline(provider, *, now=None):
+    """Seconds to wait on `provider` before hedging to the secondary provider."""
+    default = float(getattr(settings, "AI_HEDGE_DEFAULT_DEADLINE", 60))
+    histogram = provider_latency_histogram(provider, now=now)
+    if sum(histogram.values()) < int(getattr(settings, "AI_HEDGE_MIN_SAMPLES", 20)):
+        return default
+    deadline = latency_percentile(histogram, float(getattr(settings, "AI_HEDGE_PERCENTILE", 95)))
+    return float(deadline) if deadline is not None else default
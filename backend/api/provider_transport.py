@@ -0,0 +1,156 @@
+"""
+Process-wide pooled HTTP transport for AI provider calls.
+
+Each provider gets one keep-alive `requests.Session` per process so that
+back-to-back prediction jobs in the same worker reuse the TCP+TLS connection
+instead of paying a fresh handshake on every call. The async execution path
+gets the equivalent: one `httpx.AsyncClient` per provider per event loop.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is in requirements.txt
+    httpx = None
+
+_lock = threading.Lock()
+_sessions = {}
+_owner_pid = None
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _pool_settings():
+    return (
+        max(int(getattr(settings, "AI_HTTP_POOL_CONNECTIONS", 2)), 1),
+        max(int(getattr(settings, "AI_HTTP_POOL_MAXSIZE", 10)), 1),
+    )
+
+
+def _build_session():
+    pool_connections, pool_maxsize = _pool_settings()
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_provider_session(provider):
+    """
+    Return the pooled session for `provider`, creating it on first use.
+
+    Sessions are owned by the process that created them. After a fork
+    (Celery prefork, gunicorn workers) the child drops the inherited sessions
+    without closing them — closing would tear down sockets still used by the
+    parent — and lazily builds its own.
+    """
+    global _owner_pid
+    pid = os.getpid()
+    with _lock:
+        if _owner_pid != pid:
+            _sessions.clear()
+            _owner_pid = pid
+        session = _sessions.get(provider)
+        if session is None:
+            session = _build_session()
+            _sessions[provider] = session
+        return session
+
+
+def provider_post(provider, url, **kwargs):
+    return get_provider_session(provider).post(url, **kwargs)
+
+
+def provider_get(provider, url, **kwargs):
+    return get_provider_session(provider).get(url, **kwargs)
+
+
+def reset_provider_sessions():
+    """Close and forget every pooled session owned by this process."""
+    global _owner_pid
+    with _lock:
+        if _owner_pid == os.getpid():
+            for session in _sessions.values():
+                session.close()
+        _sessions.clear()
+        _owner_pid = None
+
+
+def transport_stats():
+    """
+    Per-provider connection counters for this process.
+
+    `reused_connections` is the number of requests served over an already
+    open keep-alive connection.
+    """
+    with _lock:
+        if _owner_pid != os.getpid():
+            return {}
+        sessions = dict(_sessions)
+
+    stats = {}
+    for provider, session in sessions.items():
+        total_requests = 0
+        new_connections = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+        stats[provider] = {
+            "requests": total_requests,
+            "new_connections": new_connections,
+            "reused_connections": max(total_requests - new_connections, 0),
+        }
+    return stats
+
+
+def get_async_provider_client(provider):
+    """
+    Return the pooled `httpx.AsyncClient` for `provider` on the running loop.
+
+    Async clients are bound to the loop that created them, so they are cached
+    per loop rather than per process.
+    """
+    if httpx is None:
+        raise RuntimeError("httpx is required for the async provider client")
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(provider)
+        if client is None:
+            _, pool_maxsize = _pool_settings()
+            max_connections = max(int(getattr(settings, "AI_ASYNC_MAX_CONNECTIONS", 100)), 1)
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=pool_maxsize,
+                ),
+            )
+            clients[provider] = client
+        return client
+
+
+async def aclose_async_provider_clients():
+    """Close every async client bound to the running loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.pop(loop, {})
+    for client in clients.values():
+        await client.aclose()
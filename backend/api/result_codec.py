@@ -0,0 +1,37 @@
+"""
+Cache encoding for prediction results.
+
+Results are cached as zlib-compressed compact JSON behind a one-byte format
+version, so the encoding can change later without new code misreading
+entries written by old code (unknown versions are treated as misses).
+Plain JSON strings written before this format existed are still accepted
+until they expire.
+"""
+
+import json
+import zlib
+
+RESULT_FORMAT_VERSION = 1
+RESULT_COMPRESSION_LEVEL = 6
+
+
+def encode_result(result):
+    """Return the cache value for a result dict."""
+    raw = json.dumps(result, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return bytes([RESULT_FORMAT_VERSION]) + zlib.compress(raw, RESULT_COMPRESSION_LEVEL)
+
+
+def decode_result(value):
+    """Return the result dict stored in a cache value, or None when it is unreadable."""
+    try:
+        if isinstance(value, (bytes, bytearray)):
+            if not value or value[0] != RESULT_FORMAT_VERSION:
+                return None
+            result = json.loads(zlib.decompress(value[1:]))
+        elif isinstance(value, str):
+            result = json.loads(value)
+        else:
+            return None
+    except (ValueError, zlib.error):
+        return None
+    return result if isinstance(result, dict) else None
@@ -1,5 +1,37 @@
+import base64
+import json
+from datetime import datetime
+
 from rest_framework import serializers
 
+PREP_SESSION_ROW_FIELDS = (
+    "prep_id",
+    "title",
+    "company_name",
+    "created_at",
+    "pipeline_status",
+    "interviewee_source",
+    "has_interviewee_profile",
+    "has_interviewer_profile",
+    "is_latest",
+    "prediction_status",
+    "row_status",
+)
+
+
+def encode_prep_session_cursor(prep_session):
+    raw = json.dumps([prep_session.created_at.isoformat(), prep_session.id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_prep_session_cursor(cursor):
+    """Return (created_at, id) or raise ValueError for a malformed cursor."""
+    try:
+        created_at_raw, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at_raw), int(row_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor.") from exc
+
 
 class PersonProfileSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=200)
@@ -37,6 +69,46 @@ class PrepSessionUpdateSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=STATUS_CHOICES, required=False)
 
 
+class PrepSessionListQuerySerializer(serializers.Serializer):
+    """
+    Query params for GET /prep-sessions/:
+      - limit: page size (keyset pagination, newest first)
+      - cursor: opaque `next_cursor` from the previous page
+      - status: comma-separated ACTIVE / CLOSED filter
+      - fields: comma-separated row fields; prediction state is only resolved
+        when prediction_status or row_status is requested
+    """
+    STATUS_CHOICES = ("ACTIVE", "CLOSED")
+    MAX_LIMIT = 200
+
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_LIMIT, required=False)
+    cursor = serializers.CharField(required=False, allow_blank=True)
+    status = serializers.CharField(required=False, allow_blank=True)
+    fields = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_cursor(self, value):
+        if not value:
+            return None
+        try:
+            return decode_prep_session_cursor(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate_status(self, value):
+        statuses = [item.strip().upper() for item in value.split(",") if item.strip()]
+        for item in statuses:
+            if item not in self.STATUS_CHOICES:
+                raise serializers.ValidationError(f"Unsupported status '{item}'.")
+        return statuses
+
+    def validate_fields(self, value):
+        fields = [item.strip() for item in value.split(",") if item.strip()]
+        for item in fields:
+            if item not in PREP_SESSION_ROW_FIELDS:
+                raise serializers.ValidationError(f"Unsupported field '{item}'.")
+        return set(fields) or None
+
+
 class PrepProfileSubmissionSerializer(serializers.Serializer):
     ROLE_CHOICES = ("INTERVIEWEE", "INTERVIEWER")
 
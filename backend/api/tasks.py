@@ -1,7 +1,21 @@
 from celery import shared_task
+from celery.signals import worker_shutting_down
+from django.conf import settings
 
-from .models import PrepSession, User
-from .prediction_service import execute_prediction_job
+from .async_executor import (
+    async_execution_enabled,
+    drain_prediction_jobs,
+    submit_prediction_job,
+)
+from .models import PredictionBatch, PrepSession, User
+from .prediction_batch import (
+    batch_expired,
+    expire_prediction_batch,
+    poll_prediction_batch,
+    submit_prediction_batch,
+)
+from .prediction_service import aexecute_prediction_job, execute_prediction_job
+from .provider_batch import BATCH_FAILED, BATCH_PENDING
 
 
 @shared_task
@@ -20,17 +34,69 @@ def run_prediction_task(
     prep_session = None
     if prep_session_id is not None:
         prep_session = PrepSession.objects.filter(prep_id=prep_session_id).first()
-    payload, response_status = execute_prediction_job(
-        user_identifier=user_identifier,
-        db_user=db_user,
-        interviewee=interviewee,
-        interviewer=interviewer,
-        prompt_version=prompt_version,
-        regenerate_nonce=regenerate_nonce,
-        prep_session=prep_session,
-        interview_context=interview_context,
-    )
+    job = {
+        "user_identifier": user_identifier,
+        "db_user": db_user,
+        "interviewee": interviewee,
+        "interviewer": interviewer,
+        "prompt_version": prompt_version,
+        "regenerate_nonce": regenerate_nonce,
+        "prep_session": prep_session,
+        "interview_context": interview_context,
+    }
+    if async_execution_enabled():
+        # The job finishes on the worker's event loop; progress is reported
+        # through the prediction row, cache and events as usual.
+        submit_prediction_job(lambda: aexecute_prediction_job(**job))
+        return {
+            "response_status": 202,
+            "payload": {"status": "RUNNING"},
+        }
+    payload, response_status = execute_prediction_job(**job)
     return {
         "response_status": response_status,
         "payload": payload,
     }
+
+
+def _batch_poll_interval():
+    return max(int(getattr(settings, "AI_BATCH_POLL_INTERVAL", 60)), 1)
+
+
+@shared_task
+def submit_prediction_batch_task(*, jobs):
+    """Submit reserved prediction jobs as one provider batch, then start polling it."""
+    batch = submit_prediction_batch(jobs)
+    if batch is None:
+        return {"status": "EMPTY"}
+    poll_prediction_batch_task.apply_async(kwargs={"batch_pk": batch.pk}, countdown=_batch_poll_interval())
+    return {"status": batch.status, "batch_id": batch.batch_id, "request_count": batch.request_count}
+
+
+@shared_task
+def poll_prediction_batch_task(*, batch_pk):
+    """
+    Check a provider batch; re-schedules itself until the batch has ended or
+    is older than AI_BATCH_MAX_AGE, at which point its remaining rows fail.
+    """
+    batch = PredictionBatch.objects.filter(pk=batch_pk, status=PredictionBatch.STATUS_SUBMITTED).first()
+    if batch is None:
+        return {"status": "GONE"}
+    try:
+        state = poll_prediction_batch(batch)
+    except Exception:
+        # Provider hiccup while polling (or a batch the provider no longer
+        # knows); treated as pending until AI_BATCH_MAX_AGE gives up on it.
+        state = BATCH_PENDING
+    if state == BATCH_PENDING and batch_expired(batch):
+        expire_prediction_batch(batch)
+        state = BATCH_FAILED
+    if state == BATCH_PENDING:
+        poll_prediction_batch_task.apply_async(kwargs={"batch_pk": batch_pk}, countdown=_batch_poll_interval())
+    return {"status": batch.status, "batch_id": batch.batch_id}
+
+
+@worker_shutting_down.connect
+def drain_async_prediction_jobs(**kwargs):
+    """Let jobs already on the event loop finish before a warm shutdown."""
+    drain_prediction_jobs(timeout=getattr(settings, "AI_ASYNC_DRAIN_TIMEOUT", 60))
@@ -0,0 +1,292 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import async_executor
+from api.ai_client import AIClientError, ProviderConfig
+from api.async_ai_client import agenerate_questions
+from api.models import InterviewPrediction, PredictionBatch, PredictionTopic, User
+from api.prediction_service import (
+    INTERRUPTED_ERROR,
+    aexecute_prediction_job,
+    get_prediction_state_by_fingerprint,
+)
+from api.prediction_state_cache import local_results
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _client_for(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class AsyncProviderClientTests(TestCase):
+    def _generate(self, provider, handler, **kwargs):
+        config = ProviderConfig(provider=provider, api_key="k", model="test-model")
+        with mock.patch("api.ai_client._resolve_provider_config", return_value=config):
+            with mock.patch(
+                "api.async_ai_client.get_async_provider_client",
+                return_value=_client_for(handler),
+            ):
+                return async_to_sync(agenerate_questions)({"name": "A"}, {"name": "B"}, **kwargs)
+
+    def test_anthropic_payload_matches_sync_validation(self):
+        seen_requests = []
+
+        def handler(request):
+            seen_requests.append(json.loads(request.content))
+            return httpx.Response(
+                200,
+                json={
+                    "stop_reason": "end_turn",
+                    "content": [{"type": "text", "text": json.dumps(mock_prediction_result())}],
+                    "usage": {"input_tokens": 10, "output_tokens": 20, "cache_read_input_tokens": 5},
+                },
+            )
+
+        usage = []
+        result = self._generate("anthropic", handler, on_usage=usage.append)
+
+        self.assertEqual(len(result["topics"]), 4)
+        self.assertEqual(seen_requests[0]["system"][0]["cache_control"], {"type": "ephemeral"})
+        self.assertEqual(usage[0]["cached_input_tokens"], 5)
+
+    @override_settings(AI_STREAM_RESPONSES=True)
+    def test_openai_stream_awaits_async_topic_callback(self):
+        raw = json.dumps(mock_prediction_result())
+        events = [
+            {"choices": [{"delta": {"content": raw[i : i + 9]}, "finish_reason": None}]}
+            for i in range(0, len(raw), 9)
+        ]
+        events.append({"choices": [{"delta": {}, "finish_reason": "stop"}]})
+        body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+
+        def handler(request):
+            return httpx.Response(200, content=body.encode("utf-8"))
+
+        seen = []
+
+        async def on_topic(topic):
+            seen.append(topic["title"])
+
+        result = self._generate("openai", handler, on_topic=on_topic)
+
+        self.assertEqual(seen, ["Topic A", "Topic B", "Topic C", "Topic D"])
+        self.assertEqual(result["markdown"], "# Prep summary")
+
+    @override_settings(AI_RETRY_ATTEMPTS=0)
+    def test_http_errors_map_to_ai_client_error(self):
+        def handler(request):
+            return httpx.Response(429, json={"error": {"message": "rate limited"}})
+
+        with self.assertRaisesMessage(AIClientError, "Anthropic HTTPError: rate limited"):
+            self._generate("anthropic", handler)
+
+
+@override_settings(CACHES=TEST_CACHE)
+class AsyncPredictionJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(auth0_sub="test|async", email="async@example.com")
+
+    def test_async_job_persists_result_and_topics(self):
+        async def fake_generate(*args, **kwargs):
+            return mock_prediction_result()
+
+        with mock.patch("api.prediction_service.agenerate_questions", side_effect=fake_generate):
+            with mock.patch("api.prediction_service.compute_fingerprint", return_value="async-fp"):
+                result, status_code = async_to_sync(aexecute_prediction_job)(
+                    user_identifier="test|async",
+                    db_user=self.user,
+                    interviewee={"name": "A"},
+                    interviewer={"name": "B"},
+                )
+
+        self.assertEqual(status_code, 200)
+        prediction = InterviewPrediction.objects.get(fingerprint="async-fp")
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_COMPLETED)
+        self.assertEqual(PredictionTopic.objects.filter(prediction=prediction).count(), 4)
+        self.assertEqual(result["topics"][0]["title"], "Topic A")
+
+    def test_digest_runs_off_the_shared_db_thread(self):
+        threads = {}
+
+        def fake_digest(interviewer):
+            threads["digest"] = threading.current_thread()
+            return None
+
+        async def fake_generate(*args, **kwargs):
+            return mock_prediction_result()
+
+        with mock.patch("api.prediction_service._resolve_interviewer_digest", side_effect=fake_digest):
+            with mock.patch("api.prediction_service.agenerate_questions", side_effect=fake_generate):
+                async_to_sync(aexecute_prediction_job)(
+                    user_identifier="test|async",
+                    db_user=self.user,
+                    interviewee={"name": "A"},
+                    interviewer={"name": "B"},
+                )
+
+        self.assertIsNot(threads["digest"], threading.main_thread())
+
+    def test_async_job_records_provider_failure(self):
+        async def failing_generate(*args, **kwargs):
+            raise AIClientError("upstream down")
+
+        with mock.patch("api.prediction_service.agenerate_questions", side_effect=failing_generate):
+            with mock.patch("api.prediction_service.compute_fingerprint", return_value="async-fail"):
+                payload, status_code = async_to_sync(aexecute_prediction_job)(
+                    user_identifier="test|async",
+                    db_user=self.user,
+                    interviewee={"name": "A"},
+                    interviewer={"name": "B"},
+                )
+
+        self.assertEqual(status_code, 502)
+        self.assertEqual(payload["error"], "upstream down")
+        prediction = InterviewPrediction.objects.get(fingerprint="async-fail")
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_FAILED)
+
+
+@override_settings(CACHES=TEST_CACHE, PREDICTION_RUNNING_TIMEOUT=600)
+class InterruptedJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+        self.user = User.objects.create(auth0_sub="test|interrupted", email="interrupted@example.com")
+
+    def _running(self, age, **fields):
+        prediction = InterviewPrediction.objects.create(
+            fingerprint="interrupted-fp",
+            user=self.user,
+            status=InterviewPrediction.STATUS_RUNNING,
+            **fields,
+        )
+        InterviewPrediction.objects.filter(pk=prediction.pk).update(
+            updated_at=timezone.now() - timedelta(seconds=age)
+        )
+        return prediction
+
+    def test_stale_running_row_is_failed_on_poll(self):
+        prediction = self._running(age=601)
+        payload, status_code = get_prediction_state_by_fingerprint(self.user, "interrupted-fp")
+
+        self.assertEqual(status_code, 502)
+        self.assertEqual(payload["error"], INTERRUPTED_ERROR)
+        prediction.refresh_from_db()
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_FAILED)
+
+    def test_recent_running_row_is_left_alone(self):
+        self._running(age=60)
+        payload, status_code = get_prediction_state_by_fingerprint(self.user, "interrupted-fp")
+        self.assertEqual((payload["status"], status_code), (InterviewPrediction.STATUS_RUNNING, 202))
+
+    def test_stale_draft_row_is_settled_with_its_draft(self):
+        draft = mock_prediction_result(marker="draft")
+        prediction = self._running(age=601)
+        InterviewPrediction.objects.filter(pk=prediction.pk).update(
+            status=InterviewPrediction.STATUS_DRAFT,
+            result_json=draft,
+            updated_at=timezone.now() - timedelta(seconds=601),
+        )
+
+        payload, status_code = get_prediction_state_by_fingerprint(self.user, "interrupted-fp")
+
+        self.assertEqual((payload["markdown"], status_code), (draft["markdown"], 200))
+        prediction.refresh_from_db()
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_COMPLETED)
+        self.assertEqual(prediction.usage["refine_error"], INTERRUPTED_ERROR)
+
+    def test_recent_draft_row_is_left_alone(self):
+        prediction = self._running(age=60)
+        InterviewPrediction.objects.filter(pk=prediction.pk).update(
+            status=InterviewPrediction.STATUS_DRAFT, result_json=mock_prediction_result()
+        )
+        payload, status_code = get_prediction_state_by_fingerprint(self.user, "interrupted-fp")
+        self.assertEqual((payload["status"], status_code), (InterviewPrediction.STATUS_DRAFT, 202))
+
+    def test_batch_rows_are_left_to_their_poll_task(self):
+        batch = PredictionBatch.objects.create(provider="anthropic", model="m", batch_id="b-1", request_count=1)
+        self._running(age=6000, batch=batch)
+        _payload, status_code = get_prediction_state_by_fingerprint(self.user, "interrupted-fp")
+        self.assertEqual(status_code, 202)
+
+
+class DbPhaseTests(TestCase):
+    def test_connections_are_checked_around_each_phase(self):
+        calls = []
+        with mock.patch.object(async_executor, "close_old_connections", side_effect=lambda: calls.append("close")):
+            result = async_to_sync(async_executor.db_phase(lambda value: calls.append("work") or value))(7)
+
+        self.assertEqual(result, 7)
+        self.assertEqual(calls, ["close", "work", "close"])
+
+    def test_open_transactions_are_never_closed(self):
+        connection = mock.Mock(in_atomic_block=True)
+        with mock.patch.object(async_executor.connections, "all", return_value=[connection]):
+            async_executor.close_old_connections()
+        connection.close_if_unusable_or_obsolete.assert_not_called()
+
+
+class AsyncExecutorTests(TestCase):
+    def setUp(self):
+        async_executor.reset_async_executor()
+
+    def tearDown(self):
+        async_executor.reset_async_executor()
+
+    @override_settings(AI_ASYNC_CONCURRENCY=20)
+    def test_jobs_overlap_on_one_event_loop(self):
+        async def slow_job():
+            await asyncio.sleep(0.2)
+            return threading.current_thread().name
+
+        started = time.monotonic()
+        futures = [async_executor.submit_prediction_job(slow_job) for _ in range(20)]
+        names = {future.result(timeout=5) for future in futures}
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(names, {"prediction-event-loop"})
+        self.assertEqual(async_executor.inflight_prediction_jobs(), 0)
+
+    @override_settings(AI_ASYNC_CONCURRENCY=2)
+    def test_concurrency_is_bounded(self):
+        running = {"now": 0, "peak": 0}
+
+        async def job():
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.05)
+            running["now"] -= 1
+
+        futures = [async_executor.submit_prediction_job(job) for _ in range(6)]
+        async_executor.drain_prediction_jobs(timeout=5)
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(running["peak"], 2)
+
+    @override_settings(PREDICTION_EXECUTION_MODE="asyncio")
+    def test_task_hands_job_to_event_loop(self):
+        from api.tasks import run_prediction_task
+
+        user = User.objects.create(auth0_sub="test|async-task", email="task@example.com")
+        with mock.patch("api.tasks.submit_prediction_job") as mock_submit:
+            result = run_prediction_task.run(
+                user_identifier="test|async-task",
+                db_user_id=user.id,
+                interviewee={"name": "A"},
+                interviewer={"name": "B"},
+            )
+
+        self.assertEqual(result["response_status"], 202)
+        self.assertEqual(mock_submit.call_count, 1)
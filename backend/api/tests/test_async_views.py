@@ -0,0 +1,148 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from api.auth import Auth0User
+from api.models import InterviewPrediction, PrepProfileSubmission, PrepSession, User
+from api.prediction_state_cache import cache_completed_result
+from api.tests.helpers import mock_prediction_result
+from api.topic_service import replace_prediction_topics
+from api.views import astream_prediction_events, compute_prep_session_fingerprint
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+SUB = "test|async-views"
+
+
+class _FakePubSub:
+    def __init__(self, messages):
+        self._messages = list(messages)
+        self.closed = False
+
+    def get_message(self, timeout=None):
+        if not self._messages:
+            return None
+        return {"type": "message", "data": json.dumps(self._messages.pop(0))}
+
+    def close(self):
+        self.closed = True
+
+
+def _submission(prep_session, role, name):
+    return PrepProfileSubmission.objects.create(
+        prep_session=prep_session,
+        user=prep_session.user,
+        role=role,
+        extracted_sections={"experience": [f"{name} experience"]},
+        metadata={"profile_name": name},
+    )
+
+
+@override_settings(CACHES=TEST_CACHE)
+class AsgiReadEndpointTests(TestCase):
+    """Drive the read endpoints through the ASGI handler, as uvicorn would."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(auth0_sub=SUB, email="async@example.com")
+        self.prep_session = PrepSession.objects.create(user=self.user, title="Backend")
+        _submission(self.prep_session, PrepProfileSubmission.ROLE_INTERVIEWEE, "Alex")
+        _submission(self.prep_session, PrepProfileSubmission.ROLE_INTERVIEWER, "Dana")
+        self.fingerprint = compute_prep_session_fingerprint(self.prep_session, self.user)
+        self.prediction = InterviewPrediction.objects.create(
+            fingerprint=self.fingerprint,
+            user=self.user,
+            prep_session=self.prep_session,
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json={"markdown": "# Prep summary"},
+        )
+        replace_prediction_topics(self.prediction, mock_prediction_result()["topics"])
+
+        auth_user = Auth0User({"sub": SUB, "email": self.user.email})
+        patcher = mock.patch(
+            "api.auth.Auth0JWTAuthentication.authenticate",
+            return_value=(auth_user, None),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = AsyncClient()
+
+    async def test_prep_prediction_repairs_pointer_and_attaches_topics(self):
+        url = reverse("get_prep_prediction", kwargs={"prep_id": self.prep_session.prep_id})
+
+        response = await self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        prediction = response.json()["prediction"]
+        self.assertEqual(prediction["status"], "COMPLETED")
+        self.assertEqual(
+            [topic["title"] for topic in prediction["result"]["topics"]],
+            ["Topic A", "Topic B", "Topic C", "Topic D"],
+        )
+        refreshed = await PrepSession.objects.aget(pk=self.prep_session.pk)
+        self.assertEqual(refreshed.current_prediction_id, self.prediction.id)
+
+    async def test_detail_and_list_share_prediction_status(self):
+        detail = await self.client.get(
+            reverse("prep_session_detail", kwargs={"prep_id": self.prep_session.prep_id})
+        )
+        listing = await self.client.get(reverse("prep_sessions"))
+
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.json()["prediction"]["status"], "COMPLETED")
+        self.assertEqual(
+            [sub["role"] for sub in detail.json()["profile_submissions"]],
+            [PrepProfileSubmission.ROLE_INTERVIEWEE, PrepProfileSubmission.ROLE_INTERVIEWER],
+        )
+        self.assertEqual(listing.json()["results"][0]["prediction_status"], "COMPLETED")
+
+    async def test_unknown_prep_session_returns_404(self):
+        url = reverse(
+            "get_prep_prediction",
+            kwargs={"prep_id": "00000000-0000-0000-0000-000000000000"},
+        )
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES=TEST_CACHE)
+class AsyncPredictionEventStreamTests(TestCase):
+    def test_relays_events_until_terminal_status(self):
+        user = User.objects.create(auth0_sub=SUB, email="async@example.com")
+        prediction = InterviewPrediction.objects.create(
+            fingerprint="async-run-fp",
+            user=user,
+            status=InterviewPrediction.STATUS_RUNNING,
+        )
+        pubsub = _FakePubSub(
+            [
+                {"event": "topic", "data": {"title": "Topic A"}},
+                {"event": "status", "data": {"status": "COMPLETED", "fingerprint": "async-run-fp"}},
+            ]
+        )
+
+        async def collect():
+            chunks = []
+            async for chunk in astream_prediction_events(user, "async-run-fp"):
+                chunks.append(chunk)
+                if len(chunks) == 1:
+                    result = mock_prediction_result()
+                    await InterviewPrediction.objects.filter(pk=prediction.pk).aupdate(
+                        status=InterviewPrediction.STATUS_COMPLETED,
+                        result_json=result,
+                    )
+                    await sync_to_async(cache_completed_result)("async-run-fp", result)
+            return chunks
+
+        with mock.patch("api.views.subscribe_prediction_events", return_value=pubsub):
+            chunks = async_to_sync(collect)()
+
+        self.assertEqual(len(chunks), 3)
+        self.assertIn('"status": "RUNNING"', chunks[0])
+        self.assertTrue(chunks[1].startswith("event: topic"))
+        self.assertIn('"status": "COMPLETED"', chunks[2])
+        self.assertTrue(pubsub.closed)
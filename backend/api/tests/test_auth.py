@@ -0,0 +1,161 @@
+import threading
+import time
+from unittest import mock
+
+import requests
+import rsa
+from django.test import SimpleTestCase, override_settings
+from jose import jwk, jwt
+from rest_framework import exceptions
+from rest_framework.test import APIRequestFactory
+
+from api.auth import Auth0JWTAuthentication, jwks_cache, verified_tokens
+
+DOMAIN = "tenant.example.com"
+AUDIENCE = "https://api.example.com"
+
+AUTH_SETTINGS = {
+    "AUTH0_DOMAIN": DOMAIN,
+    "AUTH0_API_AUDIENCE": AUDIENCE,
+    "AUTH0_ISSUER": "",
+    "AUTH0_JWKS_TTL": 3600,
+    "AUTH0_JWKS_MIN_REFRESH": 30,
+    "AUTH0_TOKEN_CACHE_SIZE": 1024,
+}
+
+
+def _signing_key(kid):
+    public, private = rsa.newkeys(1024)
+    public_jwk = jwk.construct(public.save_pkcs1().decode(), "RS256").to_dict()
+    return {**public_jwk, "kid": kid, "use": "sig"}, private.save_pkcs1().decode()
+
+
+KEY_1, PRIVATE_1 = _signing_key("key-1")
+KEY_2, PRIVATE_2 = _signing_key("key-2")
+
+
+def _token(private_key=PRIVATE_1, kid="key-1", sub="auth0|user", exp_in=600):
+    claims = {
+        "sub": sub,
+        "aud": AUDIENCE,
+        "iss": f"https://{DOMAIN}/",
+        "exp": int(time.time()) + exp_in,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def _jwks_response(*keys):
+    response = mock.Mock()
+    response.json.return_value = {"keys": list(keys)}
+    return response
+
+
+@override_settings(**AUTH_SETTINGS)
+class Auth0JWTAuthenticationTests(SimpleTestCase):
+    def setUp(self):
+        jwks_cache.clear()
+        verified_tokens.clear()
+        self.addCleanup(jwks_cache.clear)
+        self.addCleanup(verified_tokens.clear)
+        self.factory = APIRequestFactory()
+
+    def _authenticate(self, token):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return Auth0JWTAuthentication().authenticate(request)
+
+    def test_keys_are_fetched_once_across_instances(self):
+        with mock.patch("api.auth.requests.get", return_value=_jwks_response(KEY_1)) as mock_get:
+            user, _ = self._authenticate(_token(sub="auth0|a"))
+            self._authenticate(_token(sub="auth0|b"))
+
+        self.assertEqual(user.pk, "auth0|a")
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_unknown_kid_refreshes_the_key_set(self):
+        responses = [_jwks_response(KEY_1), _jwks_response(KEY_1, KEY_2)]
+        with mock.patch("api.auth.requests.get", side_effect=responses) as mock_get:
+            self._authenticate(_token())
+            with mock.patch("api.auth.time.monotonic", return_value=time.monotonic() + 60):
+                user, _ = self._authenticate(_token(PRIVATE_2, kid="key-2", sub="auth0|rotated"))
+
+        self.assertEqual(user.pk, "auth0|rotated")
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_unknown_kid_refresh_is_rate_limited(self):
+        with mock.patch("api.auth.requests.get", return_value=_jwks_response(KEY_1)) as mock_get:
+            self._authenticate(_token())
+            with mock.patch("api.auth.time.monotonic", return_value=time.monotonic() + 60):
+                for sub in ("auth0|a", "auth0|b"):
+                    with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Appropriate key not found"):
+                        self._authenticate(_token(PRIVATE_2, kid="key-2", sub=sub))
+
+        # One refresh for the unknown kid, not one per request.
+        self.assertEqual(mock_get.call_count, 2)
+
+    @override_settings(AUTH0_JWKS_TTL=0)
+    def test_failed_refresh_keeps_serving_previous_keys(self):
+        responses = [_jwks_response(KEY_1), requests.exceptions.ConnectionError("down")]
+        with mock.patch("api.auth.requests.get", side_effect=responses):
+            self._authenticate(_token(sub="auth0|a"))
+            user, _ = self._authenticate(_token(sub="auth0|b"))
+
+        self.assertEqual(user.pk, "auth0|b")
+
+    def test_concurrent_kid_misses_fetch_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return _jwks_response(KEY_1)
+
+        results = []
+        with mock.patch("api.auth.requests.get", side_effect=slow_get) as mock_get:
+            threads = [
+                threading.Thread(target=lambda: results.append(jwks_cache.get_key(DOMAIN, "key-1")))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            started.wait(5)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(key is not None for key in results))
+
+    def test_verified_token_skips_signature_check(self):
+        token = _token()
+        with mock.patch("api.auth.requests.get", return_value=_jwks_response(KEY_1)):
+            self._authenticate(token)
+            with mock.patch("api.auth.jwt.decode") as mock_decode:
+                user, payload = self._authenticate(token)
+
+        mock_decode.assert_not_called()
+        self.assertEqual(payload["sub"], "auth0|user")
+
+    def test_expired_cache_entry_is_reverified(self):
+        token = _token(exp_in=600)
+        with mock.patch("api.auth.requests.get", return_value=_jwks_response(KEY_1)):
+            self._authenticate(token)
+            with mock.patch("api.auth.time.time", return_value=time.time() + 3600):
+                with mock.patch("api.auth.jwt.decode", side_effect=Exception("expired")) as mock_decode:
+                    with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Token validation failed"):
+                        self._authenticate(token)
+
+        mock_decode.assert_called_once()
+
+    @override_settings(AUTH0_TOKEN_CACHE_SIZE=1)
+    def test_cache_is_bounded(self):
+        with mock.patch("api.auth.requests.get", return_value=_jwks_response(KEY_1)):
+            first = _token(sub="auth0|a")
+            self._authenticate(first)
+            self._authenticate(_token(sub="auth0|b"))
+            with mock.patch("api.auth.jwt.decode", side_effect=Exception("verify")) as mock_decode:
+                with self.assertRaises(exceptions.AuthenticationFailed):
+                    self._authenticate(first)
+
+        mock_decode.assert_called_once()
@@ -140,7 +140,7 @@ class PredictEndpointTests(APITestCase):
         db_obj = InterviewPrediction.objects.get(fingerprint="task-fingerprint", user=user)
         self.assertEqual(task_result["response_status"], 200)
         self.assertEqual(db_obj.status, InterviewPrediction.STATUS_COMPLETED)
-        self.assertEqual(json.loads(db_obj.result_json), mock_resp)
+        self.assertEqual(db_obj.result_json, mock_resp)
 
     def test_endpoint_returns_running_when_prediction_already_in_progress(self):
         user = User.objects.create(auth0_sub="test|predict-endpoint", email="a@x.com")
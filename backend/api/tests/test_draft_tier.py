@@ -0,0 +1,206 @@
+import asyncio
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import AIClientError, generate_questions
+from api.async_ai_client import agenerate_questions
+from api.models import InterviewPrediction, User
+from api.prediction_service import (
+    aexecute_prediction_job,
+    execute_prediction_job,
+    get_prediction_state_by_fingerprint,
+)
+from api.prediction_state_cache import local_results
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+DRAFT_SETTINGS = {
+    "CACHES": TEST_CACHE,
+    "ANTHROPIC_API_KEY": "anthropic-key",
+    "OPENAI_API_KEY": "",
+    "AI_API_KEY": "",
+    "AI_PROVIDER": "",
+    "AI_MODEL": "",
+    "ANTHROPIC_MODEL": "claude-sonnet-test",
+    "AI_DEFAULT_PROVIDER": "anthropic",
+    "AI_HEDGING": False,
+    "AI_DRAFT_TIER": True,
+    "AI_DRAFT_MODEL_ANTHROPIC": "claude-haiku-test",
+}
+
+
+def _draft_result():
+    return mock_prediction_result(markdown="# Draft", marker="draft")
+
+
+def _refined_result():
+    return mock_prediction_result(markdown="# Refined", marker="refined")
+
+
+@override_settings(**DRAFT_SETTINGS)
+class DraftTierGenerateQuestionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+
+    def test_draft_arrives_before_refined_result(self):
+        drafts, usage = [], {}
+        draft_seen = threading.Event()
+
+        def draft_call(provider, config, payload, **kwargs):
+            kwargs["on_usage"]({"provider": provider, "output_tokens": 40})
+            return _draft_result()
+
+        def refined_call(config, payload, **kwargs):
+            draft_seen.wait(5)
+            kwargs["on_usage"]({"provider": "anthropic", "output_tokens": 900})
+            return _refined_result()
+
+        def on_draft(result):
+            drafts.append(result)
+            draft_seen.set()
+
+        with mock.patch("api.ai_client._request_generation", side_effect=draft_call) as draft_mock:
+            with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", {"anthropic": refined_call}):
+                result = generate_questions(
+                    {"name": "A"}, {"name": "B"}, on_usage=usage.update, on_draft=on_draft
+                )
+
+        self.assertEqual(draft_mock.call_args.args[1].model, "claude-haiku-test")
+        self.assertEqual([draft["markdown"] for draft in drafts], ["# Draft"])
+        self.assertEqual(result["markdown"], "# Refined")
+        self.assertEqual(usage["output_tokens"], 900)
+        self.assertEqual(usage["draft"]["output_tokens"], 40)
+
+    def test_late_draft_is_dropped(self):
+        release = threading.Event()
+        drafts = []
+
+        def slow_draft(provider, config, payload, **kwargs):
+            release.wait(5)
+            return _draft_result()
+
+        with mock.patch("api.ai_client._request_generation", side_effect=slow_draft):
+            with mock.patch.dict(
+                "api.ai_client.PROVIDER_HANDLERS",
+                {"anthropic": mock.Mock(return_value=_refined_result())},
+            ):
+                result = generate_questions({"name": "A"}, {"name": "B"}, on_draft=drafts.append)
+        release.set()
+
+        self.assertEqual(result["markdown"], "# Refined")
+        self.assertEqual(drafts, [])
+
+    def test_no_draft_when_models_match(self):
+        with override_settings(AI_DRAFT_MODEL_ANTHROPIC="claude-sonnet-test"):
+            with mock.patch("api.ai_client._generate_with_draft") as tiered:
+                with mock.patch.dict(
+                    "api.ai_client.PROVIDER_HANDLERS",
+                    {"anthropic": mock.Mock(return_value=_refined_result())},
+                ):
+                    generate_questions({"name": "A"}, {"name": "B"}, on_draft=mock.Mock())
+        tiered.assert_not_called()
+
+    def test_async_draft_is_delivered_and_awaited(self):
+        drafts = []
+
+        async def draft_call(provider, config, payload, **kwargs):
+            return _draft_result()
+
+        async def refined_call(provider, config, payload, **kwargs):
+            while not drafts:
+                await asyncio.sleep(0.01)
+            return _refined_result()
+
+        async def on_draft(result):
+            drafts.append(result)
+
+        with mock.patch("api.async_ai_client._arequest_generation", side_effect=draft_call):
+            with mock.patch("api.async_ai_client.agenerate_with_provider", side_effect=refined_call):
+                result = async_to_sync(agenerate_questions)(
+                    {"name": "A"}, {"name": "B"}, on_draft=on_draft
+                )
+
+        self.assertEqual(result["markdown"], "# Refined")
+        self.assertEqual(drafts[0]["markdown"], "# Draft")
+
+
+@override_settings(**DRAFT_SETTINGS)
+class DraftTierPredictionJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+        self.user = User.objects.create(auth0_sub="test|draft", email="draft@example.com")
+        self.job = {
+            "user_identifier": "test|draft",
+            "db_user": self.user,
+            "interviewee": {"name": "A", "experience": "Python"},
+            "interviewer": {"name": "B", "experience": "Go"},
+        }
+
+    def test_draft_is_served_until_refined_result_replaces_it(self):
+        seen = {}
+
+        def fake_generate(*args, on_draft=None, **kwargs):
+            on_draft(_draft_result())
+            prediction = InterviewPrediction.objects.get(user=self.user)
+            seen["row"] = (prediction.status, list(prediction.topics.values_list("topic_key", flat=True)))
+            seen["state"] = get_prediction_state_by_fingerprint(self.user, prediction.fingerprint)
+            return _refined_result()
+
+        with mock.patch("api.prediction_service.generate_questions", side_effect=fake_generate):
+            payload, response_status = execute_prediction_job(**self.job)
+
+        self.assertEqual(seen["row"][0], InterviewPrediction.STATUS_DRAFT)
+        self.assertEqual(seen["row"][1][0], "topic-a-draft")
+        draft_payload, draft_status = seen["state"]
+        self.assertEqual((draft_payload["status"], draft_status), ("DRAFT", 202))
+        self.assertEqual(draft_payload["result"]["markdown"], "# Draft")
+
+        self.assertEqual((payload["markdown"], response_status), ("# Refined", 200))
+        prediction = InterviewPrediction.objects.get(user=self.user)
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_COMPLETED)
+        self.assertEqual(prediction.topics.first().topic_key, "topic-a-refined")
+
+    def test_failed_refinement_keeps_the_draft(self):
+        def fake_generate(*args, on_draft=None, **kwargs):
+            on_draft(_draft_result())
+            raise AIClientError("Anthropic request timed out")
+
+        with mock.patch("api.prediction_service.generate_questions", side_effect=fake_generate):
+            payload, response_status = execute_prediction_job(**self.job)
+
+        self.assertEqual((payload["markdown"], response_status), ("# Draft", 200))
+        prediction = InterviewPrediction.objects.get(user=self.user)
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_COMPLETED)
+        self.assertEqual(prediction.usage["refine_error"], "Anthropic request timed out")
+        self.assertEqual(prediction.result_json["markdown"], "# Draft")
+
+    def test_failure_without_draft_still_fails(self):
+        with mock.patch(
+            "api.prediction_service.generate_questions",
+            side_effect=AIClientError("Anthropic request timed out"),
+        ):
+            payload, response_status = execute_prediction_job(**self.job)
+
+        self.assertEqual((payload["status"], response_status), ("FAILED", 502))
+
+    def test_async_job_stores_draft(self):
+        statuses = []
+
+        async def fake_agenerate(*args, on_draft=None, **kwargs):
+            await on_draft(_draft_result())
+            prediction = await InterviewPrediction.objects.aget(user=self.user)
+            statuses.append(prediction.status)
+            return _refined_result()
+
+        with mock.patch("api.prediction_service.agenerate_questions", side_effect=fake_agenerate):
+            payload, response_status = async_to_sync(aexecute_prediction_job)(**self.job)
+
+        self.assertEqual(statuses, [InterviewPrediction.STATUS_DRAFT])
+        self.assertEqual((payload["markdown"], response_status), ("# Refined", 200))
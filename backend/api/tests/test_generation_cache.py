@@ -0,0 +1,202 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import AIClientError
+from api.generation_cache import (
+    build_shared_generation_key,
+    generate_single_flight,
+    shared_generation_input,
+)
+from api.models import InterviewPrediction, User
+from api.prediction_service import execute_prediction_job
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+INTERVIEWER = {"name": "B", "education": "MS", "experience": "EXPERIENCE:\nStaff Engineer"}
+
+
+def _interviewee(email):
+    return {"name": "A", "email": email, "education": "BS", "experience": "EXPERIENCE:\nPython"}
+
+
+@override_settings(CACHES=TEST_CACHE, ANTHROPIC_API_KEY="test-key", AI_PROVIDER="", AI_MODEL="")
+class SharedGenerationKeyTests(TestCase):
+    def _key(self, interviewee, **overrides):
+        kwargs = {"prompt_version": "5", **overrides}
+        return build_shared_generation_key(
+            shared_generation_input(interviewee), INTERVIEWER, None, **kwargs
+        )
+
+    def test_key_ignores_user_email_and_whitespace(self):
+        other = {**_interviewee("b@example.com"), "experience": "EXPERIENCE:\n  Python "}
+        self.assertEqual(self._key(_interviewee("a@example.com")), self._key(other))
+
+    def test_key_changes_with_prompt_version_and_model(self):
+        base = self._key(_interviewee("a@example.com"))
+        self.assertNotEqual(base, self._key(_interviewee("a@example.com"), prompt_version="6"))
+        with self.settings(AI_MODEL="claude-other"):
+            self.assertNotEqual(base, self._key(_interviewee("a@example.com")))
+
+
+@override_settings(CACHES=TEST_CACHE)
+class GenerateSingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_second_call_is_served_from_cache(self):
+        generate = mock.Mock(return_value=mock_prediction_result())
+        first, first_cached = generate_single_flight("k1", generate)
+        second, second_cached = generate_single_flight("k1", generate)
+        self.assertEqual(first, second)
+        self.assertEqual((first_cached, second_cached), (False, True))
+        self.assertEqual(generate.call_count, 1)
+
+    def test_concurrent_identical_calls_coalesce(self):
+        calls = []
+
+        def slow_generate():
+            calls.append(1)
+            time.sleep(0.2)
+            return mock_prediction_result(marker="coalesced")
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    generate_single_flight("k2", slow_generate, poll_interval=0.02)
+                )
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(sorted(cached for _, cached in results), [False, True, True])
+
+    def test_waiter_takes_over_when_leader_fails(self):
+        leader_started = threading.Event()
+
+        def failing_generate():
+            leader_started.set()
+            time.sleep(0.1)
+            raise AIClientError("upstream down")
+
+        errors = []
+
+        def leader():
+            try:
+                generate_single_flight("k3", failing_generate, poll_interval=0.02)
+            except AIClientError as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        leader_started.wait(1)
+        result, from_cache = generate_single_flight(
+            "k3", lambda: mock_prediction_result(marker="retry"), poll_interval=0.02
+        )
+        thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertFalse(from_cache)
+        self.assertEqual(result["topics"][0]["topic_key"], "topic-a-retry")
+
+    def test_expired_leader_does_not_release_a_later_leaders_lock(self):
+        lock_key = "predict:gen:lock:k5"
+
+        def outlived_generate():
+            # The lock TTL ran out mid-call and another caller took over.
+            cache.delete(lock_key)
+            cache.add(lock_key, "later-leader", timeout=300)
+            return mock_prediction_result(marker="slow")
+
+        generate_single_flight("k5", outlived_generate)
+
+        self.assertEqual(cache.get(lock_key), "later-leader")
+
+    def test_leader_releases_its_own_lock(self):
+        generate_single_flight("k6", lambda: mock_prediction_result())
+        self.assertIsNone(cache.get("predict:gen:lock:k6"))
+
+    def test_redis_lock_is_set_nx_and_released_by_token(self):
+        connection = mock.Mock()
+        connection.set.return_value = True
+        with mock.patch("api.generation_cache._redis_connection", return_value=connection):
+            with mock.patch("api.generation_cache._release_script", None):
+                generate_single_flight("k7", lambda: mock_prediction_result())
+
+        lock_key = cache.make_key("predict:gen:lock:k7")
+        (set_key, token), set_kwargs = connection.set.call_args
+        self.assertEqual((set_key, set_kwargs["nx"]), (lock_key, True))
+        release = connection.register_script.return_value
+        release.assert_called_once_with(keys=[lock_key], args=[token], client=connection)
+
+    @override_settings(AI_SHARED_GENERATION_WAIT=0.1)
+    def test_waiter_generates_on_its_own_after_bounded_wait(self):
+        cache.add("predict:gen:lock:k4", "1", timeout=300)
+        generate = mock.Mock(return_value=mock_prediction_result(marker="own"))
+
+        started = time.monotonic()
+        result, from_cache = generate_single_flight("k4", generate, poll_interval=0.02)
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(from_cache)
+        self.assertEqual(generate.call_count, 1)
+
+
+@override_settings(
+    CACHES=TEST_CACHE,
+    AI_SHARED_GENERATION_CACHE=True,
+    ANTHROPIC_API_KEY="test-key",
+    AI_PROVIDER="",
+    AI_MODEL="",
+)
+class SharedGenerationPipelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create(auth0_sub=f"test|shared-{index}", email=f"u{index}@example.com")
+            for index in range(2)
+        ]
+
+    def _run(self, user, **kwargs):
+        return execute_prediction_job(
+            user_identifier=user.auth0_sub,
+            db_user=user,
+            interviewee=_interviewee(user.email),
+            interviewer=INTERVIEWER,
+            **kwargs,
+        )
+
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_identical_jobs_from_two_users_share_one_provider_call(self, mock_generate):
+        mock_generate.return_value = mock_prediction_result(marker="shared")
+
+        for user in self.users:
+            payload, status_code = self._run(user)
+            self.assertEqual(status_code, 200)
+
+        self.assertEqual(mock_generate.call_count, 1)
+        self.assertNotIn("email", mock_generate.call_args.args[0])
+        self.assertEqual(
+            InterviewPrediction.objects.filter(status=InterviewPrediction.STATUS_COMPLETED).count(),
+            2,
+        )
+
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_regenerate_nonce_bypasses_shared_cache(self, mock_generate):
+        mock_generate.return_value = mock_prediction_result(marker="fresh")
+
+        self._run(self.users[0])
+        self._run(self.users[1], regenerate_nonce="again")
+
+        self.assertEqual(mock_generate.call_count, 2)
@@ -0,0 +1,170 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.ai_client import (
+    PROMPT_DIGEST_ADDENDUM,
+    AIClientError,
+    ProviderConfig,
+    generate_questions,
+)
+from api.interviewer_digest import (
+    build_interviewer_profile_hash,
+    evict_interviewer_digests,
+    get_or_create_interviewer_digest,
+)
+from api.models import InterviewerDigest, User
+from api.prediction_service import execute_prediction_job
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+INTERVIEWER = {
+    "name": "Dana Interviewer",
+    "education": "MIT",
+    "experience": "Staff engineer at Acme, distributed systems, Kafka, Go.",
+}
+
+DIGEST = {
+    "expertise": ["distributed systems", "streaming"],
+    "seniority": "Staff engineer",
+    "domains": ["fintech"],
+    "tools": ["Kafka", "Go"],
+    "focus_summary": "Will probe system design trade-offs.",
+}
+
+
+class InterviewerDigestStoreTests(TestCase):
+    @mock.patch("api.interviewer_digest.generate_interviewer_digest", return_value=DIGEST)
+    def test_digest_is_generated_once_per_profile(self, mock_digest):
+        first = get_or_create_interviewer_digest(INTERVIEWER)
+        second = get_or_create_interviewer_digest(dict(INTERVIEWER))
+
+        self.assertEqual(first, DIGEST)
+        self.assertEqual(second, DIGEST)
+        self.assertEqual(mock_digest.call_count, 1)
+        self.assertEqual(InterviewerDigest.objects.get().hit_count, 1)
+
+    @mock.patch("api.interviewer_digest.generate_interviewer_digest", return_value=DIGEST)
+    def test_expired_digest_is_regenerated(self, mock_digest):
+        get_or_create_interviewer_digest(INTERVIEWER)
+        InterviewerDigest.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        get_or_create_interviewer_digest(INTERVIEWER)
+
+        self.assertEqual(mock_digest.call_count, 2)
+        self.assertEqual(InterviewerDigest.objects.count(), 1)
+
+    def test_profile_hash_ignores_whitespace_differences(self):
+        spaced = {**INTERVIEWER, "experience": "  Staff engineer at Acme,\n distributed systems, Kafka, Go. "}
+        self.assertEqual(build_interviewer_profile_hash(INTERVIEWER), build_interviewer_profile_hash(spaced))
+
+    def test_profile_hash_ignores_generation_target(self):
+        with mock.patch(
+            "api.interviewer_digest.resolve_generation_target", side_effect=["anthropic:a", "openai:b"]
+        ):
+            first = build_interviewer_profile_hash(INTERVIEWER)
+            second = build_interviewer_profile_hash(INTERVIEWER)
+        self.assertEqual(first, second)
+
+    @mock.patch("api.interviewer_digest.generate_interviewer_digest", return_value=DIGEST)
+    def test_eviction_runs_on_sampled_misses_only(self, _mock_digest):
+        with mock.patch("api.interviewer_digest.evict_interviewer_digests") as evict:
+            with override_settings(INTERVIEWER_DIGEST_EVICT_RATE=0):
+                get_or_create_interviewer_digest(INTERVIEWER)
+            evict.assert_not_called()
+            with override_settings(INTERVIEWER_DIGEST_EVICT_RATE=1):
+                get_or_create_interviewer_digest({**INTERVIEWER, "name": "Sam"})
+            evict.assert_called_once()
+
+    @override_settings(INTERVIEWER_DIGEST_MAX_ROWS=2)
+    def test_eviction_trims_least_recently_used_rows(self):
+        now = timezone.now()
+        for index in range(3):
+            InterviewerDigest.objects.create(
+                profile_hash=f"hash-{index}",
+                digest=DIGEST,
+                last_used_at=now - timedelta(minutes=10 - index),
+                expires_at=now + timedelta(days=1),
+            )
+
+        evict_interviewer_digests(now)
+
+        self.assertEqual(
+            sorted(InterviewerDigest.objects.values_list("profile_hash", flat=True)),
+            ["hash-1", "hash-2"],
+        )
+
+
+class TwoStageGenerateQuestionsTests(TestCase):
+    def test_digest_replaces_interviewer_profile_in_payload(self):
+        config = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+        handler = mock.Mock(return_value=mock_prediction_result())
+        with mock.patch("api.ai_client._resolve_provider_config", return_value=config):
+            with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", {"anthropic": handler}):
+                generate_questions({"name": "A"}, INTERVIEWER, interviewer_digest=DIGEST)
+
+        call = handler.call_args
+        payload = call.args[1]
+        self.assertEqual(payload["interviewer"], {"name": "Dana Interviewer", "digest": DIGEST})
+        self.assertTrue(call.kwargs["system_prompt"].endswith(PROMPT_DIGEST_ADDENDUM))
+
+
+@override_settings(CACHES=TEST_CACHE, AI_INTERVIEWER_DIGEST=True)
+class TwoStagePredictionJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(auth0_sub="test|digest", email="digest@example.com")
+
+    def _run(self, fingerprint):
+        with mock.patch("api.prediction_service.compute_fingerprint", return_value=fingerprint):
+            return execute_prediction_job(
+                user_identifier="test|digest",
+                db_user=self.user,
+                interviewee={"name": "A"},
+                interviewer=INTERVIEWER,
+            )
+
+    @mock.patch("api.interviewer_digest.generate_interviewer_digest", return_value=DIGEST)
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_digest_is_reused_across_candidates(self, mock_generate, mock_digest):
+        mock_generate.return_value = mock_prediction_result()
+
+        self._run("digest-fp-1")
+        _, status_code = self._run("digest-fp-2")
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(mock_digest.call_count, 1)
+        self.assertEqual(mock_generate.call_args.kwargs["interviewer_digest"], DIGEST)
+
+    @mock.patch(
+        "api.interviewer_digest.generate_interviewer_digest",
+        side_effect=AIClientError("digest failed"),
+    )
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_digest_failure_falls_back_to_single_stage(self, mock_generate, _mock_digest):
+        mock_generate.return_value = mock_prediction_result()
+
+        result, status_code = self._run("digest-fp-3")
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(json.dumps(result), json.dumps(mock_prediction_result()))
+        self.assertNotIn("interviewer_digest", mock_generate.call_args.kwargs)
+
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_malformed_digest_response_falls_back_to_single_stage(self, mock_generate):
+        mock_generate.return_value = mock_prediction_result()
+        config = ProviderConfig(provider="openai", api_key="k", model="test-model")
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"choices": []}
+
+        with mock.patch("api.ai_client._resolve_provider_config", return_value=config):
+            with mock.patch("api.ai_client._post_with_retry", return_value=response):
+                _, status_code = self._run("digest-fp-4")
+
+        self.assertEqual(status_code, 200)
+        self.assertNotIn("interviewer_digest", mock_generate.call_args.kwargs)
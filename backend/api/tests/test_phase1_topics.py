@@ -2,7 +2,9 @@ import json
 from unittest import mock
 
 from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
@@ -15,7 +17,13 @@ from api.ai_client import (
 from api.auth import Auth0User
 from api.models import InterviewPrediction, PredictionTopic, PrepSession, User
 from api.prediction_service import compute_fingerprint, execute_prediction_job
-from api.profile_trim import trim_predict_person, trim_profile_field
+from api.profile_trim import (
+    budget_predict_people,
+    estimate_tokens,
+    trim_predict_person,
+    trim_profile_field,
+)
+from api.tests.helpers import mock_prediction_result
 from api.topic_service import replace_prediction_topics
 
 # In-process cache — CI has no Redis (see deploy.yml test job).
@@ -90,16 +98,94 @@ class ParsePredictionPayloadTests(TestCase):
 
 
 class ProfileTrimTests(TestCase):
-    def test_trims_long_experience(self):
-        long_text = "x" * 20_000
+    def test_trims_runaway_experience(self):
+        long_text = "x" * 200_000
         trimmed = trim_profile_field(long_text, "experience")
-        self.assertLess(len(trimmed), 20_000)
+        self.assertLess(len(trimmed), 200_000)
         self.assertIn("[Profile trimmed for length]", trimmed)
 
     def test_trim_predict_person(self):
-        person = {"name": "A", "experience": "y" * 20_000, "education": "BS"}
+        person = {"name": "A", "experience": "y" * 200_000, "education": "BS"}
         out = trim_predict_person(person)
-        self.assertLess(len(out["experience"]), 20_000)
+        self.assertLess(len(out["experience"]), 200_000)
+
+    def test_long_profile_within_budget_is_not_char_cut(self):
+        person = {"name": "A", "experience": "y" * 20_000, "education": "BS"}
+        self.assertEqual(trim_predict_person(person)["experience"], "y" * 20_000)
+
+
+class ProfileTokenBudgetTests(TestCase):
+    def _profile(self, roles):
+        lines = "\n".join(f"Role {i}: engineer at Company {i} shipping Python services" for i in range(roles))
+        return {
+            "name": "A",
+            "experience": f"EXPERIENCE:\n{lines}\n\nSKILLS:\nPython\nKafka",
+            "education": "BS Computer Science",
+        }
+
+    def test_profiles_under_budget_are_untouched(self):
+        interviewee = self._profile(5)
+        interviewer = self._profile(3)
+        out_a, out_b, report = budget_predict_people(interviewee, interviewer, budget=6000)
+        self.assertIs(out_a, interviewee)
+        self.assertIs(out_b, interviewer)
+        self.assertEqual(report["tokens_saved"], 0)
+
+    def test_over_budget_keeps_recent_roles_and_skills(self):
+        interviewee = self._profile(300)
+        interviewer = {"name": "B", "experience": "word " * 5000, "education": "MS"}
+
+        out_a, out_b, report = budget_predict_people(
+            interviewee, interviewer, provider="anthropic", budget=1500
+        )
+
+        self.assertLessEqual(report["output_tokens"], 1500)
+        self.assertGreater(report["tokens_saved"], 0)
+        self.assertIn("Role 0:", out_a["experience"])
+        self.assertNotIn("Role 299:", out_a["experience"])
+        self.assertIn("SKILLS:\nPython\nKafka", out_a["experience"])
+        self.assertIn("lower-priority lines trimmed", out_a["experience"])
+        # Neither profile is starved by the other.
+        self.assertGreater(estimate_tokens(out_b["experience"], "anthropic"), 400)
+        self.assertGreater(estimate_tokens(out_a["experience"], "anthropic"), 400)
+
+    @override_settings(
+        CACHES=TEST_CACHE,
+        ANTHROPIC_API_KEY="test-key",
+        AI_PROVIDER="",
+        AI_MODEL="",
+        AI_STRUCTURED_OUTPUT=False,
+        AI_STREAM_RESPONSES=False,
+        AI_PROFILE_TOKEN_BUDGET=6000,
+    )
+    def test_long_interviewee_with_short_interviewer_reaches_provider_untrimmed(self):
+        cache.clear()
+        user = User.objects.create(auth0_sub="test|budget", email="budget@example.com")
+        interviewee = self._profile(250)
+        self.assertGreater(len(interviewee["experience"]), 10_000)
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {
+            "stop_reason": "end_turn",
+            "content": [{"type": "text", "text": json.dumps(mock_prediction_result())}],
+            "usage": {},
+        }
+
+        with mock.patch("api.ai_client.provider_post", return_value=response) as mock_post:
+            execute_prediction_job(
+                user_identifier=user.auth0_sub,
+                db_user=user,
+                interviewee=interviewee,
+                interviewer={"name": "B", "experience": "Staff Engineer", "education": "MS"},
+            )
+
+        content = mock_post.call_args.kwargs["json"]["messages"][0]["content"]
+        if isinstance(content, list):
+            content = "".join(block["text"] for block in content)
+        self.assertEqual(json.loads(content)["interviewee"]["experience"], interviewee["experience"])
+
+    def test_estimate_is_provider_aware(self):
+        text = "Senior engineer at Acme 2019-2024, led payments platform."
+        self.assertGreater(estimate_tokens(text, "anthropic"), estimate_tokens(text, "openai"))
 
 
 class FingerprintOutputModeTests(TestCase):
@@ -143,6 +229,28 @@ class TopicPersistenceTests(TestCase):
         )
         self.assertEqual(rows[0]["topic_key"], "system-design")
 
+    def test_replace_uses_constant_queries_and_dedupes_keys_in_memory(self):
+        user = User.objects.create(auth0_sub="test|bulk", email="bulk@example.com")
+        prediction = InterviewPrediction.objects.create(
+            fingerprint="fp-topics-bulk",
+            user=user,
+            status=InterviewPrediction.STATUS_COMPLETED,
+        )
+        replace_prediction_topics(prediction, SAMPLE_TOPICS)
+        topics = [{"title": "Caching", "likelihood": "HIGH"} for _ in range(10)]
+        topics += [{"topic_key": "dup", "title": "Dup A"}, {"topic_key": "dup", "title": "Dup B"}]
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = replace_prediction_topics(prediction, topics)
+
+        # SAVEPOINT/RELEASE + DELETE + one INSERT, independent of topic count.
+        self.assertLessEqual(len(queries), 4)
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[0]["topic_key"], "caching")
+        self.assertEqual(rows[1]["topic_key"], "caching-2")
+        self.assertEqual([row["topic_key"] for row in rows[-2:]], ["dup", "dup-2"])
+        self.assertTrue(all(row["id"] for row in rows))
+
 
 @override_settings(CACHES=TEST_CACHE)
 class ExecutePredictionJobIntegrationTests(TestCase):
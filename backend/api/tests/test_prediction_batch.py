@@ -0,0 +1,414 @@
+import json
+import re
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.ai_client import AIClientError
+from api.models import (
+    InterviewPrediction,
+    PredictionBatch,
+    PrepProfileSubmission,
+    PrepSession,
+    User,
+)
+from api.prediction_batch import poll_prediction_batch, submit_prediction_batch
+from api.prediction_service import get_prediction_state_by_fingerprint
+from api.prediction_state_cache import local_results
+from api.provider_batch import BATCH_ENDED, BATCH_PENDING
+from api.tasks import poll_prediction_batch_task
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+COMMAND = "api.management.commands.batch_regenerate_predictions.submit_prediction_batch_task"
+
+
+class FakeBatchServer:
+    """
+    In-process stand-in for the Anthropic and OpenAI batch endpoints. Batches
+    end after `polls_until_ended` status checks; custom ids in `failing` get
+    an errored result.
+    """
+
+    def __init__(self):
+        self.polls_until_ended = 1
+        self.failing = set()
+        self.submitted = {}
+        self.polls = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload, content_type="application/json"):
+                body = payload if isinstance(payload, str) else json.dumps(payload)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body.encode("utf-8"))))
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+
+            def _body(self):
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+
+            def do_POST(self):
+                if self.path == "/v1/messages/batches":
+                    requests = json.loads(self._body())["requests"]
+                    server.submitted["anthropic"] = requests
+                    return self._reply({"id": "msgbatch_1", "processing_status": "in_progress"})
+                if self.path == "/v1/files":
+                    lines = re.findall(r'^\{"custom_id".*$', self._body(), re.MULTILINE)
+                    server.submitted["openai"] = [json.loads(line) for line in lines]
+                    return self._reply({"id": "file-in"})
+                if self.path == "/v1/batches":
+                    return self._reply({"id": "batch_1", "status": "validating"})
+                self.send_error(404)
+
+            def do_GET(self):
+                if self.path.startswith("/v1/messages/batches/msgbatch_1/results"):
+                    return self._reply(server.anthropic_results(), "application/x-jsonl")
+                if self.path == "/v1/messages/batches/msgbatch_1":
+                    server.polls += 1
+                    if server.polls < server.polls_until_ended:
+                        return self._reply({"id": "msgbatch_1", "processing_status": "in_progress"})
+                    return self._reply(
+                        {
+                            "id": "msgbatch_1",
+                            "processing_status": "ended",
+                            "results_url": f"{server.url}/v1/messages/batches/msgbatch_1/results",
+                        }
+                    )
+                if self.path == "/v1/batches/batch_1":
+                    return self._reply(
+                        {"id": "batch_1", "status": "completed", "output_file_id": "file-out", "error_file_id": "file-err"}
+                    )
+                if self.path == "/v1/files/file-out/content":
+                    return self._reply(server.openai_results(ok=True))
+                if self.path == "/v1/files/file-err/content":
+                    return self._reply(server.openai_results(ok=False))
+                self.send_error(404)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def anthropic_results(self):
+        lines = []
+        for request in self.submitted.get("anthropic", []):
+            if request["custom_id"] in self.failing:
+                result = {"type": "errored", "error": {"type": "error", "error": {"message": "overloaded"}}}
+            else:
+                result = {
+                    "type": "succeeded",
+                    "message": {
+                        "content": [{"type": "text", "text": json.dumps(mock_prediction_result())}],
+                        "stop_reason": "end_turn",
+                        "usage": {"input_tokens": 900, "output_tokens": 300},
+                    },
+                }
+            lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}))
+        return "\n".join(lines)
+
+    def openai_results(self, ok):
+        lines = []
+        for request in self.submitted.get("openai", []):
+            if (request["custom_id"] in self.failing) == ok:
+                continue
+            if ok:
+                body = {
+                    "choices": [
+                        {"finish_reason": "stop", "message": {"content": json.dumps(mock_prediction_result())}}
+                    ],
+                    "usage": {"prompt_tokens": 900, "completion_tokens": 300},
+                }
+                reply = {"status_code": 200, "body": body}
+            else:
+                reply = {"status_code": 400, "body": {"error": {"message": "bad request"}}}
+            lines.append(json.dumps({"custom_id": request["custom_id"], "response": reply}))
+        return "\n".join(lines)
+
+
+def _submission(prep_session, role, name):
+    return PrepProfileSubmission.objects.create(
+        prep_session=prep_session,
+        user=prep_session.user,
+        role=role,
+        extracted_sections={"experience": [f"{name} experience"]},
+        metadata={"profile_name": name},
+    )
+
+
+class PredictionBatchTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeBatchServer()
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.submitted.clear()
+        self.server.failing.clear()
+        self.server.polls = 0
+        self.server.polls_until_ended = 1
+        overrides = override_settings(
+            CACHES=TEST_CACHE,
+            ANTHROPIC_API_KEY="anthropic-key",
+            OPENAI_API_KEY="openai-key",
+            AI_API_KEY="",
+            AI_PROVIDER="",
+            AI_MODEL="",
+            AI_SELECTION_STRATEGY="auto",
+            AI_DEFAULT_PROVIDER="anthropic",
+            AI_BATCH_PROVIDER="",
+            AI_BATCH_ANTHROPIC_BASE_URL=self.server.url,
+            AI_BATCH_OPENAI_BASE_URL=self.server.url,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        cache.clear()
+        local_results.clear()
+
+    def _generated_session(self, index):
+        """An active session whose only prediction predates the current inputs."""
+        user = User.objects.create(auth0_sub=f"test|batch-{index}", email=f"batch{index}@example.com")
+        prep_session = PrepSession.objects.create(user=user, title="Backend", company_name="Acme")
+        _submission(prep_session, PrepProfileSubmission.ROLE_INTERVIEWEE, f"Alex {index}")
+        _submission(prep_session, PrepProfileSubmission.ROLE_INTERVIEWER, f"Dana {index}")
+        InterviewPrediction.objects.create(
+            fingerprint=f"old-{index}",
+            user=user,
+            prep_session=prep_session,
+            prompt_version="0",
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json=mock_prediction_result(),
+        )
+        return prep_session
+
+    def _queue_jobs(self):
+        with mock.patch(COMMAND) as task:
+            call_command("batch_regenerate_predictions", stdout=mock.Mock())
+        return [job for call in task.delay.call_args_list for job in call.kwargs["jobs"]]
+
+
+class BatchRegenerateCommandTests(PredictionBatchTestCase):
+    def test_reserves_previously_generated_sessions_only(self):
+        generated = self._generated_session(1)
+        never_generated = PrepSession.objects.create(user=generated.user, title="Frontend")
+        _submission(never_generated, PrepProfileSubmission.ROLE_INTERVIEWEE, "Alex")
+        _submission(never_generated, PrepProfileSubmission.ROLE_INTERVIEWER, "Sam")
+
+        jobs = self._queue_jobs()
+
+        self.assertEqual(len(jobs), 1)
+        prediction = InterviewPrediction.objects.get(pk=jobs[0]["prediction_id"])
+        self.assertEqual(prediction.status, InterviewPrediction.STATUS_RUNNING)
+        generated.refresh_from_db()
+        self.assertEqual(generated.current_prediction_id, prediction.pk)
+        self.assertEqual(jobs[0]["interview_context"], {"target_role": "Backend", "target_company": "Acme"})
+
+    def test_running_again_does_not_duplicate_jobs(self):
+        self._generated_session(1)
+        self.assertEqual(len(self._queue_jobs()), 1)
+        self.assertEqual(self._queue_jobs(), [])
+
+    def test_dry_run_creates_nothing(self):
+        self._generated_session(1)
+        with mock.patch(COMMAND) as task:
+            call_command("batch_regenerate_predictions", "--dry-run", stdout=mock.Mock())
+        task.delay.assert_not_called()
+        self.assertEqual(InterviewPrediction.objects.count(), 1)
+
+    def test_jobs_are_split_by_max_batch_size(self):
+        for index in range(3):
+            self._generated_session(index)
+        with override_settings(AI_BATCH_MAX_REQUESTS=2):
+            with mock.patch(COMMAND) as task:
+                call_command("batch_regenerate_predictions", stdout=mock.Mock())
+        self.assertEqual([len(call.kwargs["jobs"]) for call in task.delay.call_args_list], [2, 1])
+
+
+class StaleBatchTests(PredictionBatchTestCase):
+    def _age(self, jobs, seconds):
+        InterviewPrediction.objects.filter(pk__in=[job["prediction_id"] for job in jobs]).update(
+            updated_at=timezone.now() - timedelta(seconds=seconds)
+        )
+        # The cached RUNNING state would long have expired by then.
+        cache.clear()
+
+    def _state(self, job):
+        prediction = InterviewPrediction.objects.select_related("user").get(pk=job["prediction_id"])
+        payload, _ = get_prediction_state_by_fingerprint(prediction.user, prediction.fingerprint)
+        return payload["status"]
+
+    @override_settings(PREDICTION_RUNNING_TIMEOUT=60)
+    def test_queued_rows_outlive_the_running_timeout(self):
+        self._generated_session(1)
+        jobs = self._queue_jobs()
+        self._age(jobs, 120)
+
+        self.assertEqual(self._state(jobs[0]), InterviewPrediction.STATUS_RUNNING)
+        batch = submit_prediction_batch(jobs)
+        self.assertEqual(PredictionBatch.objects.get().pk, batch.pk)
+        self.assertEqual((batch.status, batch.request_count), (PredictionBatch.STATUS_SUBMITTED, 1))
+
+    @override_settings(AI_BATCH_MAX_AGE=600)
+    def test_batch_rows_past_max_age_read_as_interrupted(self):
+        self._generated_session(1)
+        jobs = self._queue_jobs()
+        submit_prediction_batch(jobs)
+        self._age(jobs, 601)
+
+        self.assertEqual(self._state(jobs[0]), InterviewPrediction.STATUS_FAILED)
+
+    @override_settings(AI_BATCH_MAX_AGE=600)
+    def test_expire_stale_closes_batches_whose_tasks_died(self):
+        self._generated_session(1)
+        jobs = self._queue_jobs()
+        queued = PredictionBatch.objects.get()
+        fresh = PredictionBatch.objects.create(provider="anthropic", model="m", batch_id="msgbatch_fresh")
+        PredictionBatch.objects.filter(pk=queued.pk).update(created_at=timezone.now() - timedelta(seconds=601))
+
+        call_command("batch_regenerate_predictions", "--expire-stale", stdout=mock.Mock())
+
+        queued.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((queued.status, fresh.status), (PredictionBatch.STATUS_FAILED, PredictionBatch.STATUS_SUBMITTED))
+        self.assertEqual(
+            InterviewPrediction.objects.get(pk=jobs[0]["prediction_id"]).status, InterviewPrediction.STATUS_FAILED
+        )
+
+
+class AnthropicBatchTests(PredictionBatchTestCase):
+    def test_results_fan_back_into_predictions(self):
+        self._generated_session(1)
+        self._generated_session(2)
+        jobs = self._queue_jobs()
+        failing_id = jobs[1]["prediction_id"]
+        self.server.failing.add(f"prediction-{failing_id}")
+        self.server.polls_until_ended = 2
+
+        batch = submit_prediction_batch(jobs)
+
+        self.assertEqual((batch.provider, batch.batch_id, batch.request_count), ("anthropic", "msgbatch_1", 2))
+        params = self.server.submitted["anthropic"][0]["params"]
+        self.assertNotIn("stream", params)
+        self.assertEqual(params["messages"][0]["role"], "user")
+
+        self.assertEqual(poll_prediction_batch(batch), BATCH_PENDING)
+        self.assertEqual(poll_prediction_batch(batch), BATCH_ENDED)
+
+        completed = InterviewPrediction.objects.get(pk=jobs[0]["prediction_id"])
+        self.assertEqual(completed.status, InterviewPrediction.STATUS_COMPLETED)
+        self.assertEqual(
+            list(completed.topics.values_list("title", flat=True)),
+            ["Topic A", "Topic B", "Topic C", "Topic D"],
+        )
+        self.assertTrue(completed.usage["batch"])
+        self.assertEqual(completed.usage["output_tokens"], 300)
+
+        failed = InterviewPrediction.objects.get(pk=failing_id)
+        self.assertEqual(failed.status, InterviewPrediction.STATUS_FAILED)
+        self.assertIn("overloaded", failed.error_text)
+        batch.refresh_from_db()
+        self.assertEqual(batch.status, PredictionBatch.STATUS_COMPLETED)
+
+    def test_rows_finished_elsewhere_are_left_alone(self):
+        self._generated_session(1)
+        jobs = self._queue_jobs()
+        batch = submit_prediction_batch(jobs)
+        InterviewPrediction.objects.filter(pk=jobs[0]["prediction_id"]).update(
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json=mock_prediction_result(markdown="# Interactive"),
+        )
+
+        poll_prediction_batch(batch)
+
+        prediction = InterviewPrediction.objects.get(pk=jobs[0]["prediction_id"])
+        self.assertEqual(prediction.result_json["markdown"], "# Interactive")
+
+    def test_poll_task_reschedules_until_ended(self):
+        self._generated_session(1)
+        batch = submit_prediction_batch(self._queue_jobs())
+        self.server.polls_until_ended = 2
+
+        with mock.patch.object(poll_prediction_batch_task, "apply_async") as reschedule:
+            poll_prediction_batch_task(batch_pk=batch.pk)
+            reschedule.assert_called_once()
+            reschedule.reset_mock()
+            poll_prediction_batch_task(batch_pk=batch.pk)
+            reschedule.assert_not_called()
+
+    def test_poll_task_survives_unexpected_errors(self):
+        self._generated_session(1)
+        batch = submit_prediction_batch(self._queue_jobs())
+
+        with mock.patch("api.tasks.poll_prediction_batch", side_effect=ValueError("bad body")):
+            with mock.patch.object(poll_prediction_batch_task, "apply_async") as reschedule:
+                poll_prediction_batch_task(batch_pk=batch.pk)
+        reschedule.assert_called_once()
+
+    def test_poll_task_gives_up_on_expired_batches(self):
+        self._generated_session(1)
+        batch = submit_prediction_batch(self._queue_jobs())
+        PredictionBatch.objects.filter(pk=batch.pk).update(created_at=timezone.now() - timedelta(seconds=601))
+
+        with override_settings(AI_BATCH_MAX_AGE=600):
+            with mock.patch("api.tasks.poll_prediction_batch", side_effect=AIClientError("404 Not Found")):
+                with mock.patch.object(poll_prediction_batch_task, "apply_async") as reschedule:
+                    result = poll_prediction_batch_task(batch_pk=batch.pk)
+
+        reschedule.assert_not_called()
+        self.assertEqual(result["status"], PredictionBatch.STATUS_FAILED)
+        self.assertEqual(
+            set(batch.predictions.values_list("status", flat=True)),
+            {InterviewPrediction.STATUS_FAILED},
+        )
+
+
+class OpenAIBatchTests(PredictionBatchTestCase):
+    def test_output_and_error_files_are_applied(self):
+        self._generated_session(1)
+        self._generated_session(2)
+        jobs = self._queue_jobs()
+        self.server.failing.add(f"prediction-{jobs[1]['prediction_id']}")
+
+        with override_settings(AI_BATCH_PROVIDER="openai"):
+            batch = submit_prediction_batch(jobs)
+            self.assertEqual(poll_prediction_batch(batch), BATCH_ENDED)
+
+        submitted = self.server.submitted["openai"][0]
+        self.assertEqual((submitted["method"], submitted["url"]), ("POST", "/v1/chat/completions"))
+        statuses = dict(
+            InterviewPrediction.objects.filter(batch=batch).values_list("pk", "status")
+        )
+        self.assertEqual(
+            statuses,
+            {
+                jobs[0]["prediction_id"]: InterviewPrediction.STATUS_COMPLETED,
+                jobs[1]["prediction_id"]: InterviewPrediction.STATUS_FAILED,
+            },
+        )
+        self.assertIn(
+            "bad request",
+            InterviewPrediction.objects.get(pk=jobs[1]["prediction_id"]).error_text,
+        )
@@ -0,0 +1,193 @@
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.auth import Auth0User
+from api.models import InterviewPrediction, User
+from api.prediction_events import iter_prediction_events, publish_prediction_status
+from api.prediction_state_cache import cache_completed_result
+from api.tests.helpers import mock_prediction_result
+from api.views import astream_prediction_events
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+SUB = "test|events"
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.decode("utf-8").split("\n\n"):
+        lines = [line for line in block.splitlines() if line and not line.startswith(":")]
+        if not lines:
+            continue
+        fields = dict(line.split(": ", 1) for line in lines)
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class _FakePubSub:
+    def __init__(self, messages):
+        self._messages = list(messages)
+        self.closed = False
+
+    def get_message(self, timeout=None):
+        if not self._messages:
+            return None
+        return {"type": "message", "data": json.dumps(self._messages.pop(0))}
+
+    def close(self):
+        self.closed = True
+
+
+class _IdlePubSub:
+    """A subscription that never delivers; each poll blocks briefly like Redis does."""
+
+    def __init__(self):
+        self.polled = threading.Event()
+        self.closed = threading.Event()
+
+    def get_message(self, timeout=None):
+        self.polled.set()
+        time.sleep(0.05)
+        return None
+
+    def close(self):
+        self.closed.set()
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PredictionEventsEndpointTests(TestCase):
+    """Driven through the ASGI handler; the endpoint refuses WSGI requests."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(auth0_sub=SUB, email="events@example.com")
+        patcher = mock.patch(
+            "api.auth.Auth0JWTAuthentication.authenticate",
+            return_value=(Auth0User({"sub": SUB, "email": "events@example.com"}), None),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = AsyncClient()
+
+    def _url(self, fingerprint):
+        return reverse("prediction_events", kwargs={"fingerprint": fingerprint})
+
+    async def _body(self, response):
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    def test_wsgi_requests_are_refused(self):
+        InterviewPrediction.objects.create(fingerprint="done-fp", user=self.user)
+        response = APIClient().get(self._url("done-fp"))
+        self.assertEqual(response.status_code, 501)
+
+    async def test_unknown_fingerprint_returns_404(self):
+        response = await self.client.get(self._url("missing"))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_completed_prediction_streams_single_snapshot(self):
+        await InterviewPrediction.objects.acreate(
+            fingerprint="done-fp",
+            user=self.user,
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json=mock_prediction_result(),
+        )
+
+        response = await self.client.get(self._url("done-fp"), HTTP_ACCEPT="text/event-stream")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = _parse_sse(await self._body(response))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][0], "status")
+        self.assertEqual(events[0][1]["status"], "COMPLETED")
+        self.assertEqual(events[0][1]["fingerprint"], "done-fp")
+
+    async def test_running_prediction_relays_topics_until_completed(self):
+        prediction = await InterviewPrediction.objects.acreate(
+            fingerprint="run-fp",
+            user=self.user,
+            status=InterviewPrediction.STATUS_RUNNING,
+        )
+        pubsub = _FakePubSub(
+            [
+                {"event": "topic", "data": {"title": "Topic A"}},
+                {"event": "status", "data": {"status": "COMPLETED", "fingerprint": "run-fp"}},
+            ]
+        )
+
+        with mock.patch("api.views.subscribe_prediction_events", return_value=pubsub):
+            response = await self.client.get(self._url("run-fp"))
+            chunks = aiter(response.streaming_content)
+            first = await anext(chunks)
+            prediction.status = InterviewPrediction.STATUS_COMPLETED
+            prediction.result_json = mock_prediction_result()
+            await prediction.asave()
+            await sync_to_async(cache_completed_result)("run-fp", prediction.result_json)
+            events = _parse_sse(first + b"".join([chunk async for chunk in chunks]))
+
+        self.assertEqual(
+            [(name, data.get("status") or data.get("title")) for name, data in events],
+            [("status", "RUNNING"), ("topic", "Topic A"), ("status", "COMPLETED")],
+        )
+        self.assertIn("result", events[-1][1])
+        self.assertTrue(pubsub.closed)
+
+    async def test_disconnect_mid_read_closes_subscription_from_worker(self):
+        await InterviewPrediction.objects.acreate(
+            fingerprint="idle-fp", user=self.user, status=InterviewPrediction.STATUS_RUNNING
+        )
+        pubsub = _IdlePubSub()
+
+        with mock.patch("api.views.subscribe_prediction_events", return_value=pubsub):
+            stream = astream_prediction_events(self.user, "idle-fp")
+            await anext(stream)
+            reading = asyncio.ensure_future(anext(stream))
+            await sync_to_async(pubsub.polled.wait, thread_sensitive=False)(5)
+            reading.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reading
+            await stream.aclose()
+
+        closed = await sync_to_async(pubsub.closed.wait, thread_sensitive=False)(5)
+        self.assertTrue(closed)
+
+
+class IterPredictionEventsTests(TestCase):
+    def test_stops_and_closes_once_signalled(self):
+        pubsub = _FakePubSub([{"event": "topic", "data": {"title": "Topic A"}}])
+        stop = threading.Event()
+        stop.set()
+
+        self.assertEqual(list(iter_prediction_events(pubsub, stop=stop)), [])
+        self.assertTrue(pubsub.closed)
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PublishPredictionEventTests(TestCase):
+    def test_publishes_json_on_fingerprint_channel(self):
+        connection = mock.Mock()
+        with mock.patch("api.prediction_events.get_redis_connection", return_value=connection):
+            publish_prediction_status("fp-1", "COMPLETED")
+
+        channel, message = connection.publish.call_args.args
+        self.assertEqual(channel, "predict:events:fp-1")
+        self.assertEqual(
+            json.loads(message),
+            {"event": "status", "data": {"status": "COMPLETED", "fingerprint": "fp-1"}},
+        )
+
+    def test_publish_never_raises_on_redis_error(self):
+        connection = mock.Mock()
+        connection.publish.side_effect = ConnectionError("redis down")
+        with mock.patch("api.prediction_events.get_redis_connection", return_value=connection):
+            publish_prediction_status("fp-1", "FAILED")
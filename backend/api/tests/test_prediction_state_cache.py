@@ -0,0 +1,223 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.ai_client import AIClientError
+from api.auth import Auth0User
+from api.models import InterviewPrediction, PrepSession, User
+from api.prediction_service import (
+    _build_failed_payload,
+    _complete_prediction_job,
+    _fail_prediction_job,
+    _streamed_topic_writer,
+    get_last_good_reference,
+    get_prediction_state_by_fingerprint,
+    get_prediction_state_for_session,
+    reserve_prediction_job,
+)
+from api.prediction_state_cache import cache_status_state, local_results, remember_state
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+PERSON = {"name": "A", "experience": "Python"}
+
+
+@override_settings(CACHES=TEST_CACHE, PREDICTION_STATE_CACHE_ENABLED=True, AI_STREAM_RESPONSES=False)
+class PredictionStateTierTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+        self.addCleanup(local_results.clear)
+        self.user = User.objects.create(auth0_sub="test|state", email="state@example.com")
+
+    def _prediction(self, **fields):
+        fields.setdefault("status", InterviewPrediction.STATUS_RUNNING)
+        return InterviewPrediction.objects.create(fingerprint="state-fp", user=self.user, **fields)
+
+    def _poll(self):
+        return get_prediction_state_by_fingerprint(self.user, "state-fp")
+
+    def test_completed_poll_is_served_from_local_tier(self):
+        self._prediction(status=InterviewPrediction.STATUS_COMPLETED, result_json=mock_prediction_result())
+        self.assertEqual(self._poll()[1], 200)
+        cache.clear()
+        with self.assertNumQueries(0):
+            payload, response_status = self._poll()
+        self.assertEqual((payload["markdown"], response_status), (mock_prediction_result()["markdown"], 200))
+
+    def test_completed_poll_is_served_from_redis_tier(self):
+        self._prediction(status=InterviewPrediction.STATUS_COMPLETED, result_json=mock_prediction_result())
+        self._poll()
+        local_results.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._poll()[1], 200)
+
+    def test_running_poll_is_cached_until_the_job_completes(self):
+        prediction = self._prediction()
+        self.assertEqual(self._poll()[0]["status"], InterviewPrediction.STATUS_RUNNING)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._poll()[0]["status"], InterviewPrediction.STATUS_RUNNING)
+
+        _complete_prediction_job(prediction, mock_prediction_result(marker="done"), {})
+        local_results.clear()
+        with self.assertNumQueries(0):
+            payload, response_status = self._poll()
+        self.assertEqual((payload["markdown"], response_status), (mock_prediction_result(marker="done")["markdown"], 200))
+
+    def test_failure_is_written_through(self):
+        prediction = self._prediction()
+        self._poll()
+        _fail_prediction_job(prediction, self.user, AIClientError("Upstream timeout"))
+        with self.assertNumQueries(0):
+            payload, response_status = self._poll()
+        self.assertEqual((payload["error"], response_status), ("Upstream timeout", 502))
+
+    def test_reserved_job_is_cached_as_running(self):
+        _payload, _status, fingerprint, should_enqueue = reserve_prediction_job(
+            user_identifier="test|state", db_user=self.user, interviewee=PERSON, interviewer=PERSON
+        )
+        self.assertTrue(should_enqueue)
+        with self.assertNumQueries(0):
+            payload, response_status = get_prediction_state_by_fingerprint(self.user, fingerprint)
+        self.assertEqual((payload["status"], response_status), (InterviewPrediction.STATUS_RUNNING, 202))
+
+    def test_read_through_does_not_overwrite_a_newer_transition(self):
+        cache_status_state("state-fp", {"status": InterviewPrediction.STATUS_FAILED, "error": "x"}, 502)
+        remember_state("state-fp", {"status": InterviewPrediction.STATUS_RUNNING}, 202)
+        self.assertEqual(self._poll()[1], 502)
+
+    @override_settings(AI_STREAM_RESPONSES=True)
+    def test_streamed_topic_drops_cached_running_state(self):
+        prediction = self._prediction()
+        self._poll()
+        _streamed_topic_writer(prediction)({"title": "Topic A", "likelihood": "high"})
+        payload, _status = self._poll()
+        self.assertEqual([topic["title"] for topic in payload["topics"]], ["Topic A"])
+
+    @override_settings(AI_STREAM_RESPONSES=True)
+    def test_failed_streamed_topic_write_is_logged(self):
+        prediction = self._prediction()
+        with mock.patch("api.prediction_service.append_prediction_topic", side_effect=RuntimeError("db down")):
+            with self.assertLogs("api.prediction_service", "WARNING") as logs:
+                _streamed_topic_writer(prediction)({"title": "Topic A", "likelihood": "high"})
+        self.assertIn("state-fp", logs.output[0])
+
+    def test_session_poll_serves_in_flight_state_from_cache(self):
+        prep_session = PrepSession.objects.create(user=self.user, title="Backend")
+        self._prediction(prep_session=prep_session)
+        get_prediction_state_for_session(self.user, PrepSession.objects.get(pk=prep_session.pk), "state-fp")
+
+        prep_session = PrepSession.objects.get(pk=prep_session.pk)
+        with self.assertNumQueries(0):
+            payload, response_status, row = get_prediction_state_for_session(self.user, prep_session, "state-fp")
+        self.assertEqual((payload["status"], response_status, row), (InterviewPrediction.STATUS_RUNNING, 202, None))
+
+    @override_settings(PREDICTION_STATE_CACHE_ENABLED=False)
+    def test_disabled_tier_reads_the_row_first(self):
+        prediction = self._prediction()
+        self._poll()
+        InterviewPrediction.objects.filter(pk=prediction.pk).update(status=InterviewPrediction.STATUS_FAILED)
+        self.assertEqual(self._poll()[1], 502)
+
+
+@override_settings(CACHES=TEST_CACHE)
+class LastGoodFallbackTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+        self.addCleanup(local_results.clear)
+        self.user = User.objects.create(auth0_sub="test|last-good", email="last-good@example.com")
+
+    def _completed(self, fingerprint, **fields):
+        return InterviewPrediction.objects.create(
+            fingerprint=fingerprint,
+            user=self.user,
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json=mock_prediction_result(marker=fingerprint),
+            last_success_at=timezone.now(),
+            **fields,
+        )
+
+    def test_failure_references_newest_completed_prediction(self):
+        self._completed("older")
+        newest = self._completed("newer")
+        payload = _build_failed_payload("Upstream timeout", self.user)
+        self.assertEqual(payload["last_good_fallback"], {"id": newest.pk, "fingerprint": "newer"})
+
+    def test_pointer_is_cached_including_no_fallback(self):
+        self.assertIsNone(get_last_good_reference(self.user))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_last_good_reference(self.user))
+
+    def test_completion_moves_the_pointer(self):
+        self.assertIsNone(get_last_good_reference(self.user))
+        prediction = InterviewPrediction.objects.create(fingerprint="fresh", user=self.user)
+        _complete_prediction_job(prediction, mock_prediction_result(), {})
+        with self.assertNumQueries(0):
+            reference = get_last_good_reference(self.user)
+        self.assertEqual(reference, {"id": prediction.pk, "fingerprint": "fresh"})
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PredictionDetailEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+        self.addCleanup(local_results.clear)
+        self.user = User.objects.create(auth0_sub="test|detail", email="detail@example.com")
+        self.client.force_authenticate(user=Auth0User({"sub": "test|detail", "email": "detail@example.com"}))
+
+    def _url(self, fingerprint):
+        return reverse("prediction_detail", kwargs={"fingerprint": fingerprint})
+
+    def test_fallback_reference_loads_full_result(self):
+        InterviewPrediction.objects.create(
+            fingerprint="good-fp",
+            user=self.user,
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json=mock_prediction_result(marker="good"),
+            last_success_at=timezone.now(),
+        )
+        InterviewPrediction.objects.create(
+            fingerprint="bad-fp",
+            user=self.user,
+            status=InterviewPrediction.STATUS_FAILED,
+            error_text="Upstream timeout",
+        )
+
+        failed = self.client.get(self._url("bad-fp"))
+        self.assertEqual(failed.status_code, 502)
+        reference = failed.json()["last_good_fallback"]
+        self.assertEqual(reference["fingerprint"], "good-fp")
+
+        loaded = self.client.get(self._url(reference["fingerprint"]))
+        self.assertEqual(loaded.status_code, 200)
+        body = loaded.json()
+        self.assertEqual(body["status"], "COMPLETED")
+        self.assertEqual(body["result"]["markdown"], mock_prediction_result(marker="good")["markdown"])
+
+    def test_hot_poll_is_served_without_queries(self):
+        InterviewPrediction.objects.create(
+            fingerprint="hot-fp", user=self.user, status=InterviewPrediction.STATUS_RUNNING
+        )
+        # The first poll fills the user and state caches.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.get(self._url("hot-fp")).status_code, 202)
+        with self.assertNumQueries(0):
+            response = self.client.get(self._url("hot-fp"))
+        self.assertEqual(response.json()["status"], "RUNNING")
+
+    def test_other_users_prediction_returns_404(self):
+        other = User.objects.create(auth0_sub="test|other", email="other@example.com")
+        InterviewPrediction.objects.create(
+            fingerprint="other-fp",
+            user=other,
+            status=InterviewPrediction.STATUS_COMPLETED,
+            result_json=mock_prediction_result(),
+        )
+        self.assertEqual(self.client.get(self._url("other-fp")).status_code, 404)
@@ -2,7 +2,9 @@ import json
 from unittest import mock
 
 from django.core.cache import cache
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
@@ -14,7 +16,8 @@ from api.models import (
     PrepSession,
     User,
 )
-from api.prediction_service import compute_fingerprint
+from api.prediction_service import _complete_prediction_job, compute_fingerprint
+from api.prediction_state_cache import local_results
 from api.tasks import run_prediction_task
 from api.tests.helpers import mock_prediction_result
 from api.views import (
@@ -878,6 +881,10 @@ class PrepSessionEndpointTests(APITestCase):
             response.json()["pipeline_status"], "READY_FOR_TOPIC_GENERATION"
         )
         self.assertEqual(response.json()["prediction"]["status"], "COMPLETED")
+        self.assertEqual(
+            response.json()["fingerprint"],
+            InterviewPrediction.objects.get(user=db_user).fingerprint,
+        )
         result = response.json()["prediction"]["result"]
         self.assertEqual(result["markdown"], "# Async prep")
         self.assertEqual(len(result["topics"]), 4)
@@ -973,6 +980,33 @@ class PrepSessionEndpointTests(APITestCase):
         self.assertEqual(row["prediction_status"], "RUNNING")
         self.assertEqual(row["row_status"], "generating")
 
+    def test_list_row_status_generating_while_draft_is_refined(self):
+        auth_sub = "test|row-draft"
+        db_user, prep_session = self._create_ready_session(
+            auth_sub=auth_sub,
+            email="draft@example.com",
+        )
+        fingerprint = self._prediction_fingerprint(prep_session, db_user, auth_sub)
+        InterviewPrediction.objects.create(
+            fingerprint=fingerprint,
+            user=db_user,
+            prep_session=prep_session,
+            status=InterviewPrediction.STATUS_DRAFT,
+            result_json=mock_prediction_result(marker="draft-row"),
+        )
+        self.client.force_authenticate(
+            user=Auth0User({"sub": auth_sub, "email": db_user.email})
+        )
+
+        response = self.client.get(reverse("prep_sessions"))
+        row = next(
+            r
+            for r in response.json()["results"]
+            if r["prep_id"] == str(prep_session.prep_id)
+        )
+        self.assertEqual(row["prediction_status"], "DRAFT")
+        self.assertEqual(row["row_status"], "generating")
+
     def test_list_row_status_ready_when_completed(self):
         auth_sub = "test|row-ready"
         db_user, prep_session = self._create_ready_session(
@@ -985,7 +1019,7 @@ class PrepSessionEndpointTests(APITestCase):
             user=db_user,
             prep_session=prep_session,
             status=InterviewPrediction.STATUS_COMPLETED,
-            result_json=json.dumps(mock_prediction_result(marker="ready-row")),
+            result_json=mock_prediction_result(marker="ready-row"),
         )
         self.client.force_authenticate(
             user=Auth0User({"sub": auth_sub, "email": db_user.email})
@@ -1042,3 +1076,273 @@ class PrepSessionEndpointTests(APITestCase):
         self.client.get(status_url)
 
         mock_delay.assert_not_called()
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PrepSessionListQueryCountTests(APITestCase):
+    AUTH_SUB = "test|list-queries"
+
+    def setUp(self):
+        cache.clear()
+        self.db_user = User.objects.create(
+            auth0_sub=self.AUTH_SUB, email="list-queries@example.com"
+        )
+        IntervieweeBaselineProfile.objects.create(
+            user=self.db_user,
+            extracted_sections={"experience": ["Baseline experience"]},
+        )
+        self.client.force_authenticate(
+            user=Auth0User({"sub": self.AUTH_SUB, "email": self.db_user.email})
+        )
+
+    def _add_sessions(self, count, offset=0):
+        statuses = [
+            InterviewPrediction.STATUS_COMPLETED,
+            InterviewPrediction.STATUS_RUNNING,
+            InterviewPrediction.STATUS_FAILED,
+            None,
+        ]
+        for index in range(offset, offset + count):
+            prep_session = PrepSession.objects.create(
+                user=self.db_user, title=f"Session {index}"
+            )
+            for role in (
+                PrepProfileSubmission.ROLE_INTERVIEWEE,
+                PrepProfileSubmission.ROLE_INTERVIEWER,
+            ):
+                PrepProfileSubmission.objects.create(
+                    prep_session=prep_session,
+                    user=self.db_user,
+                    role=role,
+                    extracted_sections={"experience": [f"{role} {index}"]},
+                )
+            prediction_status = statuses[index % len(statuses)]
+            if prediction_status is None:
+                continue
+            profile_state = resolve_session_profile_state(prep_session, self.db_user)
+            interviewee, interviewer, interview_context = (
+                build_predict_payload_from_profile_state(
+                    profile_state,
+                    user_email=self.db_user.email,
+                    prep_session=prep_session,
+                )
+            )
+            InterviewPrediction.objects.create(
+                fingerprint=compute_fingerprint(
+                    self.AUTH_SUB,
+                    interviewee,
+                    interviewer,
+                    interview_context=interview_context,
+                ),
+                user=self.db_user,
+                prep_session=prep_session,
+                status=prediction_status,
+                result_json=mock_prediction_result(),
+            )
+        # One session still waiting on the interviewer profile.
+        PrepSession.objects.create(user=self.db_user, title="Waiting")
+
+    def _count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("prep_sessions"))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()["results"]
+
+    def test_query_count_is_constant_in_session_count(self):
+        self._add_sessions(2)
+        small_count, small_rows = self._count_list_queries()
+        self.assertEqual(len(small_rows), 3)
+
+        self._add_sessions(6, offset=2)
+        large_count, large_rows = self._count_list_queries()
+        self.assertEqual(len(large_rows), 10)
+
+        self.assertEqual(small_count, large_count)
+        self.assertLessEqual(large_count, 6)
+        self.assertEqual(
+            sorted(row.get("prediction_status", "") for row in large_rows),
+            sorted(
+                ["COMPLETED"] * 2
+                + ["RUNNING"] * 2
+                + ["FAILED"] * 2
+                + ["NOT_STARTED"] * 2
+                + [""] * 2
+            ),
+        )
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PrepSessionListPaginationTests(APITestCase):
+    AUTH_SUB = "test|list-pages"
+
+    def setUp(self):
+        cache.clear()
+        self.db_user = User.objects.create(
+            auth0_sub=self.AUTH_SUB, email="list-pages@example.com"
+        )
+        self.client.force_authenticate(
+            user=Auth0User({"sub": self.AUTH_SUB, "email": self.db_user.email})
+        )
+        self.sessions = [
+            PrepSession.objects.create(user=self.db_user, title=f"Session {index}")
+            for index in range(5)
+        ]
+
+    def test_cursor_pages_cover_all_sessions_newest_first(self):
+        url = reverse("prep_sessions")
+        titles = []
+        latest_flags = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            body = self.client.get(url, params).json()
+            pages += 1
+            titles.extend(row["title"] for row in body["results"])
+            latest_flags.extend(row["is_latest"] for row in body["results"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(titles, [f"Session {index}" for index in reversed(range(5))])
+        self.assertEqual(latest_flags, [True, False, False, False, False])
+
+    def test_status_filter_excludes_closed_sessions(self):
+        closed = self.sessions[4]
+        closed.status = PrepSession.STATUS_CLOSED
+        closed.save(update_fields=["status"])
+
+        body = self.client.get(reverse("prep_sessions"), {"status": "ACTIVE"}).json()
+
+        self.assertEqual(len(body["results"]), 4)
+        self.assertNotIn(str(closed.prep_id), [row["prep_id"] for row in body["results"]])
+        # The closed session is still the newest one overall.
+        self.assertFalse(any(row["is_latest"] for row in body["results"]))
+
+    def test_fields_projection_skips_profile_and_prediction_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("prep_sessions"), {"fields": "title"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.json()["results"][0]), {"prep_id", "title"}
+        )
+        tables = " ".join(query["sql"] for query in ctx.captured_queries)
+        self.assertNotIn("api_prepprofilesubmission", tables)
+        self.assertNotIn("api_interviewprediction", tables)
+        self.assertNotIn("api_intervieweebaselineprofile", tables)
+
+    def test_invalid_query_params_return_400(self):
+        url = reverse("prep_sessions")
+        for params in ({"cursor": "not-a-cursor"}, {"status": "DELETED"}, {"fields": "secret"}, {"limit": 0}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400, msg=str(params))
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PrepSessionStoredFingerprintTests(APITestCase):
+    AUTH_SUB = "test|stored-fp"
+
+    def setUp(self):
+        cache.clear()
+        local_results.clear()
+        self.addCleanup(local_results.clear)
+        self.client.force_authenticate(
+            user=Auth0User({"sub": self.AUTH_SUB, "email": "stored-fp@example.com"})
+        )
+        response = self.client.post(
+            reverse("prep_sessions"),
+            data=json.dumps({"title": "Stored fingerprint"}),
+            content_type="application/json",
+        )
+        self.prep_id = response.json()["prep_id"]
+        for role, section in (("INTERVIEWEE", "Python"), ("INTERVIEWER", "Staff Engineer")):
+            self.client.post(
+                reverse("submit_prep_profile", kwargs={"prep_id": self.prep_id}),
+                data=json.dumps(
+                    {"role": role, "extracted_sections": {"experience": [section]}}
+                ),
+                content_type="application/json",
+            )
+
+    def _session(self):
+        return PrepSession.objects.get(prep_id=self.prep_id)
+
+    def _expected_fingerprint(self, prep_session):
+        db_user = prep_session.user
+        profile_state = resolve_session_profile_state(prep_session, db_user)
+        interviewee, interviewer, interview_context = (
+            build_predict_payload_from_profile_state(
+                profile_state,
+                user_email=db_user.email,
+                prep_session=prep_session,
+            )
+        )
+        return compute_fingerprint(
+            self.AUTH_SUB, interviewee, interviewer, interview_context=interview_context
+        )
+
+    def test_profile_submit_materialises_fingerprint(self):
+        prep_session = self._session()
+        self.assertEqual(
+            prep_session.input_fingerprint, self._expected_fingerprint(prep_session)
+        )
+        self.assertIsNone(prep_session.current_prediction)
+
+    def test_patch_title_refreshes_fingerprint(self):
+        before = self._session().input_fingerprint
+        self.client.patch(
+            reverse("prep_session_detail", kwargs={"prep_id": self.prep_id}),
+            data=json.dumps({"title": "Renamed role"}),
+            content_type="application/json",
+        )
+        prep_session = self._session()
+        self.assertNotEqual(prep_session.input_fingerprint, before)
+        self.assertEqual(
+            prep_session.input_fingerprint, self._expected_fingerprint(prep_session)
+        )
+
+    @mock.patch("api.views.run_prediction_task.delay")
+    def test_reads_use_stored_fingerprint_and_prediction_pointer(self, mock_delay):
+        self.client.post(
+            reverse("generate_prep_session_prediction", kwargs={"prep_id": self.prep_id})
+        )
+        prep_session = self._session()
+        self.assertIsNotNone(prep_session.current_prediction)
+        # Complete through the job's write path, which replaces the cached
+        # RUNNING state that reads are served from.
+        _complete_prediction_job(
+            prep_session.current_prediction, mock_prediction_result(marker="stored"), {}
+        )
+
+        with mock.patch(
+            "api.views.build_predict_payload_from_profile_state",
+            side_effect=AssertionError("reads must not rebuild the payload"),
+        ):
+            response = self.client.get(
+                reverse("get_prep_prediction", kwargs={"prep_id": self.prep_id})
+            )
+            detail = self.client.get(
+                reverse("prep_session_detail", kwargs={"prep_id": self.prep_id})
+            )
+            listing = self.client.get(reverse("prep_sessions"))
+
+        self.assertEqual(response.json()["prediction"]["status"], "COMPLETED")
+        self.assertEqual(detail.json()["prediction"]["status"], "COMPLETED")
+        self.assertEqual(listing.json()["results"][0]["row_status"], "ready")
+
+    def test_stale_prompt_version_is_recomputed_on_read(self):
+        PrepSession.objects.filter(prep_id=self.prep_id).update(
+            input_fingerprint="stale", input_fingerprint_version="0"
+        )
+        response = self.client.get(
+            reverse("get_prep_prediction", kwargs={"prep_id": self.prep_id})
+        )
+        prep_session = self._session()
+        self.assertEqual(response.json()["prediction"]["status"], "NOT_STARTED")
+        self.assertEqual(
+            prep_session.input_fingerprint, self._expected_fingerprint(prep_session)
+        )
@@ -0,0 +1,147 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import (
+    PROMPT_DIGEST_ADDENDUM,
+    PROMPT_SYSTEM,
+    ProviderConfig,
+    _generate_with_anthropic,
+    _generate_with_openai,
+)
+from api.models import InterviewPrediction, User
+from api.prediction_service import execute_prediction_job
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+USER_PAYLOAD = {
+    "interviewee": {"name": "A"},
+    "interviewer": {"name": "B"},
+    "interview_context": {"company_name": "Acme"},
+}
+
+
+def _anthropic_response(usage):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {
+        "stop_reason": "end_turn",
+        "content": [{"type": "text", "text": json.dumps(mock_prediction_result())}],
+        "usage": usage,
+    }
+    return response
+
+
+def _openai_response(usage):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {
+        "choices": [
+            {"finish_reason": "stop", "message": {"content": json.dumps(mock_prediction_result())}}
+        ],
+        "usage": usage,
+    }
+    return response
+
+
+class AnthropicPromptCachingTests(TestCase):
+    def setUp(self):
+        self.config = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+
+    def test_system_prompt_is_marked_as_cacheable_prefix(self):
+        usage = {"input_tokens": 120, "output_tokens": 900, "cache_read_input_tokens": 2400}
+        seen = []
+        with mock.patch("api.ai_client.provider_post", return_value=_anthropic_response(usage)) as mock_post:
+            _generate_with_anthropic(
+                self.config,
+                USER_PAYLOAD,
+                system_prompt=PROMPT_SYSTEM + PROMPT_DIGEST_ADDENDUM,
+                on_usage=seen.append,
+            )
+
+        system = mock_post.call_args.kwargs["json"]["system"]
+        self.assertEqual(system[0]["text"], PROMPT_SYSTEM)
+        self.assertEqual(system[0]["cache_control"], {"type": "ephemeral"})
+        self.assertEqual(system[1], {"type": "text", "text": PROMPT_DIGEST_ADDENDUM})
+        self.assertEqual(
+            seen,
+            [
+                {
+                    "provider": "anthropic",
+                    "input_tokens": 2520,
+                    "output_tokens": 900,
+                    "cached_input_tokens": 2400,
+                    "cache_write_tokens": 0,
+                }
+            ],
+        )
+
+    def test_interviewer_prefix_gets_its_own_breakpoint(self):
+        with mock.patch("api.ai_client.provider_post", return_value=_anthropic_response({})) as mock_post:
+            _generate_with_anthropic(self.config, USER_PAYLOAD)
+
+        head, tail = mock_post.call_args.kwargs["json"]["messages"][0]["content"]
+        self.assertEqual(head["cache_control"], {"type": "ephemeral"})
+        self.assertNotIn("cache_control", tail)
+        self.assertNotIn("interviewee", head["text"])
+        self.assertEqual(
+            list(json.loads(head["text"] + tail["text"])),
+            ["interviewer", "interview_context", "interviewee"],
+        )
+
+    @override_settings(AI_PROMPT_CACHING=False)
+    def test_caching_can_be_disabled(self):
+        with mock.patch("api.ai_client.provider_post", return_value=_anthropic_response({})) as mock_post:
+            _generate_with_anthropic(self.config, USER_PAYLOAD)
+
+        body = mock_post.call_args.kwargs["json"]
+        self.assertEqual(body["system"], PROMPT_SYSTEM)
+        self.assertIsInstance(body["messages"][0]["content"], str)
+
+
+class OpenAIPromptCachingTests(TestCase):
+    def test_static_prefix_first_and_cached_tokens_reported(self):
+        config = ProviderConfig(provider="openai", api_key="k", model="gpt-4o-mini")
+        usage = {
+            "prompt_tokens": 3000,
+            "completion_tokens": 800,
+            "prompt_tokens_details": {"cached_tokens": 2048},
+        }
+        seen = []
+        with mock.patch("api.ai_client.provider_post", return_value=_openai_response(usage)) as mock_post:
+            _generate_with_openai(config, USER_PAYLOAD, on_usage=seen.append)
+
+        messages = mock_post.call_args.kwargs["json"]["messages"]
+        self.assertEqual(messages[0], {"role": "system", "content": PROMPT_SYSTEM})
+        self.assertEqual(
+            list(json.loads(messages[1]["content"])),
+            ["interviewer", "interview_context", "interviewee"],
+        )
+        self.assertEqual(seen[0]["cached_input_tokens"], 2048)
+        self.assertEqual(seen[0]["input_tokens"], 3000)
+
+
+@override_settings(CACHES=TEST_CACHE)
+class PredictionUsageRecordingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(auth0_sub="test|usage", email="usage@example.com")
+
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_usage_is_stored_on_prediction(self, mock_generate):
+        def fake_generate(*args, on_usage=None, **kwargs):
+            on_usage({"provider": "anthropic", "input_tokens": 10, "cached_input_tokens": 8})
+            return mock_prediction_result()
+
+        mock_generate.side_effect = fake_generate
+        with mock.patch("api.prediction_service.compute_fingerprint", return_value="usage-fp"):
+            execute_prediction_job(
+                user_identifier="test|usage",
+                db_user=self.user,
+                interviewee={"name": "A"},
+                interviewer={"name": "B"},
+            )
+
+        prediction = InterviewPrediction.objects.get(fingerprint="usage-fp")
+        self.assertEqual(prediction.usage["cached_input_tokens"], 8)
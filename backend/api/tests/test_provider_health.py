@@ -0,0 +1,127 @@
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import (
+    AIClientTimeoutError,
+    ProviderConfig,
+    _generate_with_anthropic,
+    _resolve_provider_config,
+)
+from api.provider_health import (
+    OUTCOME_FAILURE,
+    OUTCOME_SUCCESS,
+    OUTCOME_TRUNCATED,
+    provider_circuit_open,
+    provider_health,
+    record_provider_outcome,
+    reset_provider_health_snapshots,
+)
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+ADAPTIVE_SETTINGS = {
+    "CACHES": TEST_CACHE,
+    "ANTHROPIC_API_KEY": "anthropic-key",
+    "OPENAI_API_KEY": "openai-key",
+    "AI_API_KEY": "",
+    "AI_PROVIDER": "",
+    "AI_MODEL": "",
+    "AI_SELECTION_STRATEGY": "adaptive",
+    "AI_PROVIDER_PRIORITY": "anthropic,openai",
+    "AI_ADAPTIVE_MIN_SAMPLES": 10,
+    "AI_BREAKER_THRESHOLD": 3,
+}
+
+
+def _record(provider, outcome, seconds, count):
+    for _ in range(count):
+        record_provider_outcome(provider, outcome, seconds)
+
+
+@override_settings(CACHES=TEST_CACHE, AI_BREAKER_THRESHOLD=3)
+class ProviderHealthTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_rates_and_latency_percentiles(self):
+        _record("anthropic", OUTCOME_SUCCESS, 4.0, 16)
+        _record("anthropic", OUTCOME_TRUNCATED, 40.0, 2)
+        _record("anthropic", OUTCOME_FAILURE, None, 2)
+
+        health = provider_health("anthropic")
+
+        self.assertEqual(health["samples"], 20)
+        self.assertEqual(health["success_rate"], 0.8)
+        self.assertEqual(health["truncation_rate"], 0.1)
+        self.assertEqual((health["p50"], health["p95"]), (5, 45))
+        self.assertFalse(health["circuit_open"])
+
+    def test_breaker_opens_after_consecutive_failures(self):
+        _record("openai", OUTCOME_FAILURE, None, 2)
+        self.assertFalse(provider_circuit_open("openai"))
+        record_provider_outcome("openai", OUTCOME_FAILURE)
+        self.assertTrue(provider_circuit_open("openai"))
+
+    def test_success_closes_breaker_and_resets_count(self):
+        _record("openai", OUTCOME_FAILURE, None, 3)
+        record_provider_outcome("openai", OUTCOME_SUCCESS, 2.0)
+        self.assertFalse(provider_circuit_open("openai"))
+        _record("openai", OUTCOME_FAILURE, None, 2)
+        self.assertFalse(provider_circuit_open("openai"))
+
+    def test_one_failure_after_cooldown_reopens(self):
+        _record("openai", OUTCOME_FAILURE, None, 3)
+        cache.delete("predict:breaker:openai:open")  # cooldown elapsed
+
+        record_provider_outcome("openai", OUTCOME_FAILURE)
+
+        self.assertTrue(provider_circuit_open("openai"))
+
+    def test_truncation_does_not_count_towards_breaker(self):
+        _record("openai", OUTCOME_TRUNCATED, 10.0, 5)
+        self.assertFalse(provider_circuit_open("openai"))
+
+    def test_provider_calls_record_their_outcome(self):
+        config = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+        with mock.patch("api.ai_client.provider_post", side_effect=requests.exceptions.Timeout()):
+            with self.assertRaises(AIClientTimeoutError):
+                _generate_with_anthropic(config, {"interviewee": {}, "interviewer": {}})
+
+        health = provider_health("anthropic")
+        self.assertEqual(health["samples"], 1)
+        self.assertEqual(health["success_rate"], 0.0)
+        self.assertIsNotNone(health["p50"])
+
+
+@override_settings(**ADAPTIVE_SETTINGS)
+class AdaptiveSelectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_provider_health_snapshots()
+
+    def test_unproven_provider_is_tried_first(self):
+        _record("anthropic", OUTCOME_SUCCESS, 2.0, 20)
+        self.assertEqual(_resolve_provider_config().provider, "openai")
+
+    def test_routes_to_best_expected_completion_time(self):
+        _record("anthropic", OUTCOME_SUCCESS, 30.0, 12)
+        _record("anthropic", OUTCOME_TRUNCATED, 30.0, 8)
+        _record("openai", OUTCOME_SUCCESS, 12.0, 20)
+        self.assertEqual(_resolve_provider_config().provider, "openai")
+
+    def test_ejected_provider_is_skipped(self):
+        _record("anthropic", OUTCOME_SUCCESS, 2.0, 20)
+        _record("openai", OUTCOME_SUCCESS, 2.0, 20)
+        self.assertEqual(_resolve_provider_config().provider, "anthropic")
+
+        _record("anthropic", OUTCOME_FAILURE, None, 3)
+
+        self.assertEqual(_resolve_provider_config().provider, "openai")
+
+    def test_all_ejected_still_selects_a_provider(self):
+        _record("anthropic", OUTCOME_FAILURE, None, 3)
+        _record("openai", OUTCOME_FAILURE, None, 3)
+        self.assertEqual(_resolve_provider_config().provider, "anthropic")
@@ -0,0 +1,329 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+import requests
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import (
+    AIClientCancelledError,
+    AIClientError,
+    _generate_with_anthropic,
+    _HedgeRace,
+    _resolve_hedge_config,
+    _resolve_provider_config,
+    generate_questions,
+)
+from api.async_ai_client import agenerate_questions
+from api.models import InterviewPrediction, User
+from api.prediction_service import execute_prediction_job
+from api.provider_latency import (
+    hedge_deadline,
+    latency_percentile,
+    provider_latency_histogram,
+    record_provider_latency,
+)
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+HEDGE_SETTINGS = {
+    "CACHES": TEST_CACHE,
+    "ANTHROPIC_API_KEY": "anthropic-key",
+    "OPENAI_API_KEY": "openai-key",
+    "AI_API_KEY": "",
+    "AI_PROVIDER": "",
+    "AI_MODEL": "",
+    "AI_DEFAULT_PROVIDER": "anthropic",
+    "AI_SELECTION_STRATEGY": "auto",
+    "AI_PROVIDER_PRIORITY": "anthropic,openai",
+    "AI_HEDGING": True,
+    "AI_HEDGE_DEFAULT_DEADLINE": 0.05,
+}
+
+
+def _secondary_result():
+    result = mock_prediction_result()
+    result["markdown"] = "# From secondary"
+    return result
+
+
+class _HeldStream:
+    """A streamed provider response that stalls until it is closed."""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def raise_for_status(self):
+        return None
+
+    def iter_lines(self, decode_unicode=False):
+        yield 'data: {"type": "message_start", "message": {}}'
+        self.closed.wait(5)
+        raise requests.exceptions.ConnectionError("connection closed")
+
+    def close(self):
+        self.closed.set()
+
+
+def _openai_stream(result):
+    response = mock.Mock(status_code=200)
+    event = {"choices": [{"delta": {"content": json.dumps(result)}, "finish_reason": "stop"}]}
+    response.iter_lines.return_value = iter([f"data: {json.dumps(event)}", "data: [DONE]"])
+    return response
+
+
+@override_settings(CACHES=TEST_CACHE, AI_HEDGE_MIN_SAMPLES=10, AI_HEDGE_DEFAULT_DEADLINE=60)
+class ProviderLatencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_deadline_uses_default_until_enough_samples(self):
+        for _ in range(5):
+            record_provider_latency("anthropic", 4.0)
+        self.assertEqual(hedge_deadline("anthropic"), 60.0)
+
+    def test_deadline_tracks_p95_bucket(self):
+        for _ in range(19):
+            record_provider_latency("anthropic", 4.0)
+        record_provider_latency("anthropic", 100.0)
+
+        self.assertEqual(provider_latency_histogram("anthropic")[5], 19)
+        self.assertEqual(hedge_deadline("anthropic"), 5.0)
+        self.assertEqual(hedge_deadline("openai"), 60.0)
+
+    def test_samples_outside_window_are_ignored(self):
+        hour = 3600
+        for _ in range(20):
+            record_provider_latency("openai", 2.0, now=10 * hour)
+        self.assertEqual(sum(provider_latency_histogram("openai", now=10 * hour).values()), 20)
+        with override_settings(AI_LATENCY_WINDOW_HOURS=2):
+            self.assertEqual(sum(provider_latency_histogram("openai", now=13 * hour).values()), 0)
+
+    def test_percentile_of_empty_histogram_is_none(self):
+        self.assertIsNone(latency_percentile({}, 95))
+
+
+@override_settings(**HEDGE_SETTINGS)
+class HedgedGenerateQuestionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_secondary_uses_its_own_model(self):
+        with override_settings(AI_MODEL="claude-custom", OPENAI_MODEL="gpt-test"):
+            hedge = _resolve_hedge_config(_resolve_provider_config())
+        self.assertEqual((hedge.provider, hedge.model), ("openai", "gpt-test"))
+
+    def test_slow_primary_is_hedged_and_loser_is_muted(self):
+        release = threading.Event()
+        topics, usage = [], {}
+
+        def slow_anthropic(config, payload, **kwargs):
+            release.wait(5)
+            kwargs["on_topic"]({"title": "late"})
+            kwargs["on_usage"]({"provider": "anthropic", "input_tokens": 9})
+            return mock_prediction_result()
+
+        def fast_openai(config, payload, **kwargs):
+            kwargs["on_topic"]({"title": "Topic A"})
+            kwargs["on_usage"]({"provider": "openai", "input_tokens": 5})
+            return _secondary_result()
+
+        handlers = {"anthropic": slow_anthropic, "openai": fast_openai}
+        with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", handlers):
+            result = generate_questions(
+                {"name": "A"}, {"name": "B"}, on_topic=topics.append, on_usage=usage.update
+            )
+        release.set()
+
+        self.assertEqual(result["markdown"], "# From secondary")
+        self.assertEqual(topics, [{"title": "Topic A"}])
+        self.assertEqual(usage["provider"], "openai")
+        self.assertTrue(usage["hedged"])
+
+    def test_primary_topic_owner_is_muted_after_losing(self):
+        streamed = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        topics, usage = [], {}
+
+        def streaming_anthropic(config, payload, **kwargs):
+            kwargs["on_topic"]({"title": "Primary 1"})
+            streamed.set()
+            release.wait(5)
+            kwargs["on_topic"]({"title": "Primary 2"})
+            kwargs["on_usage"]({"provider": "anthropic", "input_tokens": 9})
+            finished.set()
+            return mock_prediction_result()
+
+        def openai_after_primary_streams(config, payload, **kwargs):
+            streamed.wait(5)
+            kwargs["on_topic"]({"title": "Secondary"})
+            kwargs["on_usage"]({"provider": "openai", "input_tokens": 5})
+            return _secondary_result()
+
+        handlers = {"anthropic": streaming_anthropic, "openai": openai_after_primary_streams}
+        with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", handlers):
+            result = generate_questions(
+                {"name": "A"}, {"name": "B"}, on_topic=topics.append, on_usage=usage.update
+            )
+        release.set()
+        self.assertTrue(finished.wait(5))
+
+        self.assertEqual(result["markdown"], "# From secondary")
+        self.assertEqual(topics, [{"title": "Primary 1"}])
+        self.assertEqual(usage["provider"], "openai")
+
+    @override_settings(AI_STREAM_RESPONSES=True)
+    def test_job_replaces_losers_streamed_topics_with_winners(self):
+        user = User.objects.create(auth0_sub="test|hedge-job", email="hedge-job@example.com")
+        streamed = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+
+        def streaming_anthropic(config, payload, **kwargs):
+            kwargs["on_topic"]({"title": "Primary 1"})
+            streamed.set()
+            release.wait(5)
+            kwargs["on_topic"]({"title": "Primary 2"})
+            finished.set()
+            return mock_prediction_result()
+
+        def openai_after_primary_streams(config, payload, **kwargs):
+            streamed.wait(5)
+            return _secondary_result()
+
+        handlers = {"anthropic": streaming_anthropic, "openai": openai_after_primary_streams}
+        with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", handlers):
+            payload, status_code = execute_prediction_job(
+                user_identifier="test|hedge-job",
+                db_user=user,
+                interviewee={"name": "A"},
+                interviewer={"name": "B"},
+            )
+        release.set()
+        self.assertTrue(finished.wait(5))
+
+        self.assertEqual((payload["markdown"], status_code), ("# From secondary", 200))
+        prediction = InterviewPrediction.objects.get(user=user)
+        self.assertEqual(
+            list(prediction.topics.values_list("title", flat=True)),
+            [topic["title"] for topic in _secondary_result()["topics"]],
+        )
+
+    def test_losing_stream_is_closed_without_counting_against_it(self):
+        held = _HeldStream()
+        loser_error = []
+        loser_done = threading.Event()
+
+        def post(provider, url, **kwargs):
+            return held if provider == "anthropic" else _openai_stream(_secondary_result())
+
+        def anthropic(config, payload, **kwargs):
+            try:
+                return _generate_with_anthropic(config, payload, **kwargs)
+            except AIClientError as exc:
+                loser_error.append(exc)
+                raise
+            finally:
+                loser_done.set()
+
+        with (
+            mock.patch("api.ai_client.provider_post", side_effect=post),
+            mock.patch("api.ai_client.record_provider_outcome") as record,
+            mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", {"anthropic": anthropic}),
+        ):
+            result = generate_questions({"name": "A"}, {"name": "B"})
+            self.assertTrue(loser_done.wait(5))
+
+        self.assertEqual(result["markdown"], "# From secondary")
+        self.assertTrue(held.closed.is_set())
+        self.assertIsInstance(loser_error[0], AIClientCancelledError)
+        self.assertNotIn("anthropic", [call.args[0] for call in record.call_args_list])
+
+    def test_winner_is_claimed_once(self):
+        usage = {}
+        race = _HedgeRace(None, usage.update)
+        loser = race.cancellation("anthropic")
+        race.callbacks("openai")["on_usage"]({"provider": "openai"})
+
+        self.assertTrue(race.claim("openai"))
+        self.assertFalse(race.claim("anthropic"))
+        self.assertTrue(loser.cancelled)
+        self.assertEqual((race.winner, usage["provider"]), ("openai", "openai"))
+
+    def test_async_topic_write_is_dropped_once_the_race_is_claimed(self):
+        written = []
+
+        async def on_topic(topic):
+            written.append(topic)
+
+        race = _HedgeRace(on_topic, None)
+        pending = race.callbacks("anthropic")["on_topic"]({"title": "late"})
+        race.claim("openai")
+
+        async def deliver():
+            return await pending
+
+        async_to_sync(deliver)()
+        self.assertEqual(written, [])
+
+    def test_failing_primary_falls_back_before_deadline(self):
+        primary = mock.Mock(side_effect=AIClientError("Anthropic HTTPError: overloaded"))
+        secondary = mock.Mock(return_value=_secondary_result())
+        with override_settings(AI_HEDGE_DEFAULT_DEADLINE=30):
+            with mock.patch.dict(
+                "api.ai_client.PROVIDER_HANDLERS", {"anthropic": primary, "openai": secondary}
+            ):
+                result = generate_questions({"name": "A"}, {"name": "B"})
+
+        self.assertEqual(result["markdown"], "# From secondary")
+        self.assertEqual(secondary.call_args.args[0].provider, "openai")
+
+    def test_primary_error_is_raised_when_both_fail(self):
+        handlers = {
+            "anthropic": mock.Mock(side_effect=AIClientError("Anthropic request timed out")),
+            "openai": mock.Mock(side_effect=AIClientError("OpenAI request timed out")),
+        }
+        with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", handlers):
+            with self.assertRaisesMessage(AIClientError, "Anthropic request timed out"):
+                generate_questions({"name": "A"}, {"name": "B"})
+
+    def test_single_provider_is_not_hedged(self):
+        handler = mock.Mock(return_value=mock_prediction_result())
+        with override_settings(OPENAI_API_KEY=""):
+            with mock.patch.dict("api.ai_client.PROVIDER_HANDLERS", {"anthropic": handler}):
+                with mock.patch("api.ai_client._generate_hedged") as hedged:
+                    generate_questions({"name": "A"}, {"name": "B"})
+        hedged.assert_not_called()
+        handler.assert_called_once()
+
+
+@override_settings(**HEDGE_SETTINGS)
+class AsyncHedgedGenerateQuestionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_loser_is_cancelled(self):
+        cancelled = []
+
+        async def fake_provider(provider, config, payload, **kwargs):
+            if provider == "anthropic":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(provider)
+                    raise
+            return _secondary_result()
+
+        with mock.patch("api.async_ai_client.agenerate_with_provider", side_effect=fake_provider):
+            result = async_to_sync(agenerate_questions)({"name": "A"}, {"name": "B"})
+
+        self.assertEqual(result["markdown"], "# From secondary")
+        self.assertEqual(cancelled, ["anthropic"])
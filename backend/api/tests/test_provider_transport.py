@@ -0,0 +1,87 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import TestCase
+
+from api import provider_transport
+from api.ai_client import ProviderConfig, _generate_with_anthropic
+from api.tests.helpers import mock_prediction_result
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProviderTransportTests(TestCase):
+    def setUp(self):
+        provider_transport.reset_provider_sessions()
+
+    def tearDown(self):
+        provider_transport.reset_provider_sessions()
+
+    def test_session_is_shared_per_provider(self):
+        first = provider_transport.get_provider_session("anthropic")
+        second = provider_transport.get_provider_session("anthropic")
+        other = provider_transport.get_provider_session("openai")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_forked_process_builds_its_own_session(self):
+        parent_session = provider_transport.get_provider_session("anthropic")
+        with mock.patch("api.provider_transport.os.getpid", return_value=-1):
+            child_session = provider_transport.get_provider_session("anthropic")
+        self.assertIsNot(parent_session, child_session)
+
+    def test_pool_size_comes_from_settings(self):
+        with self.settings(AI_HTTP_POOL_CONNECTIONS=3, AI_HTTP_POOL_MAXSIZE=7):
+            session = provider_transport.get_provider_session("openai")
+        adapter = session.get_adapter("https://api.openai.com")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    def test_sequential_calls_reuse_keep_alive_connection(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/v1/messages"
+            for _ in range(3):
+                response = provider_transport.provider_post("anthropic", url, json={}, timeout=5)
+                self.assertEqual(response.json(), {"ok": True})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        stats = provider_transport.transport_stats()["anthropic"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["new_connections"], 1)
+        self.assertEqual(stats["reused_connections"], 2)
+
+    def test_anthropic_handler_posts_through_pooled_transport(self):
+        fake_response = mock.Mock(status_code=200)
+        fake_response.json.return_value = {
+            "stop_reason": "end_turn",
+            "content": [{"type": "text", "text": json.dumps(mock_prediction_result())}],
+        }
+        config = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+
+        with mock.patch("api.ai_client.provider_post", return_value=fake_response) as mock_post:
+            result = _generate_with_anthropic(config, {"interviewee": {}, "interviewer": {}})
+
+        self.assertEqual(mock_post.call_args.args[0], "anthropic")
+        self.assertEqual(len(result["topics"]), 4)
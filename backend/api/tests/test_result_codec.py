@@ -0,0 +1,33 @@
+import json
+import zlib
+
+from django.test import SimpleTestCase
+
+from api.result_codec import RESULT_FORMAT_VERSION, decode_result, encode_result
+from api.tests.helpers import mock_prediction_result
+
+
+class ResultCodecTests(SimpleTestCase):
+    def test_round_trip(self):
+        result = mock_prediction_result(markdown="# Topics\n\n- Caching ✓")
+        encoded = encode_result(result)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(encoded[0], RESULT_FORMAT_VERSION)
+        self.assertEqual(decode_result(encoded), result)
+
+    def test_encoded_value_is_smaller_than_json(self):
+        result = mock_prediction_result(markdown="## Section\n" * 200)
+        self.assertLess(len(encode_result(result)), len(json.dumps(result)))
+
+    def test_legacy_json_string_is_accepted(self):
+        result = mock_prediction_result()
+        self.assertEqual(decode_result(json.dumps(result)), result)
+
+    def test_unknown_version_is_a_miss(self):
+        payload = zlib.compress(json.dumps(mock_prediction_result()).encode("utf-8"))
+        self.assertIsNone(decode_result(bytes([RESULT_FORMAT_VERSION + 1]) + payload))
+
+    def test_unreadable_values_are_misses(self):
+        for value in (b"", bytes([RESULT_FORMAT_VERSION]) + b"garbage", "not json", "[1, 2]", 42):
+            with self.subTest(value=value):
+                self.assertIsNone(decode_result(value))
@@ -0,0 +1,161 @@
+import io
+import json
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import (
+    ProviderConfig,
+    _generate_with_anthropic,
+    _generate_with_openai,
+    _iter_sse_data,
+    _TopicStreamParser,
+)
+from api.models import InterviewPrediction, PredictionTopic, User
+from api.prediction_service import (
+    execute_prediction_job,
+    get_prediction_state_by_fingerprint,
+)
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _chunks(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _fake_stream_response(lines):
+    response = mock.Mock(status_code=200)
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+def _anthropic_sse_lines(text, stop_reason="end_turn"):
+    lines = ['data: {"type": "message_start", "message": {}}']
+    for chunk in _chunks(text):
+        event = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": chunk}}
+        lines.append(f"data: {json.dumps(event)}")
+    lines.append(f"data: {json.dumps({'type': 'message_delta', 'delta': {'stop_reason': stop_reason}})}")
+    lines.append('data: {"type": "message_stop"}')
+    return lines
+
+
+class TopicStreamParserTests(TestCase):
+    def test_emits_each_topic_as_soon_as_it_closes(self):
+        raw = json.dumps(mock_prediction_result(markdown='# Uses {braces} and "topics": [ in text'))
+        seen = []
+        parser = _TopicStreamParser(on_topic=seen.append)
+
+        emitted_after_chunk = []
+        for chunk in _chunks(raw, size=5):
+            parser.feed(chunk)
+            emitted_after_chunk.append(len(seen))
+
+        self.assertEqual([t["title"] for t in seen], ["Topic A", "Topic B", "Topic C", "Topic D"])
+        self.assertEqual([t["sort_order"] for t in seen], [0, 1, 2, 3])
+        # First topic is available well before the stream finishes.
+        self.assertLess(emitted_after_chunk.index(1), len(emitted_after_chunk) - 1)
+        self.assertEqual(parser.text, raw)
+
+    def test_sse_lines_decode_as_utf8_without_a_charset(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/event-stream"
+        response.raw = io.BytesIO('data: {"title": "Café — résumé"}\n\n'.encode("utf-8"))
+
+        self.assertEqual(list(_iter_sse_data(response)), ['{"title": "Café — résumé"}'])
+
+    def test_ignores_incomplete_trailing_topic(self):
+        raw = '{"topics": [{"title": "Done", "likelihood": "HIGH"}, {"title": "Half'
+        parser = _TopicStreamParser()
+        parser.feed(raw)
+        self.assertEqual([t["title"] for t in parser.topics], ["Done"])
+
+
+@override_settings(AI_STREAM_RESPONSES=True)
+class StreamingHandlerTests(TestCase):
+    def test_anthropic_stream_returns_validated_payload_and_reports_topics(self):
+        raw = json.dumps(mock_prediction_result())
+        config = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+        seen = []
+
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_fake_stream_response(_anthropic_sse_lines(raw)),
+        ) as mock_post:
+            result = _generate_with_anthropic(config, {}, on_topic=seen.append)
+
+        self.assertTrue(mock_post.call_args.kwargs["json"]["stream"])
+        self.assertTrue(mock_post.call_args.kwargs["stream"])
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(result["topics"]), 4)
+
+    @override_settings(AI_TRUNCATION_RECOVERY=False)
+    def test_anthropic_stream_truncation_fails_without_recovery(self):
+        raw = json.dumps(mock_prediction_result())
+        config = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_fake_stream_response(_anthropic_sse_lines(raw, stop_reason="max_tokens")),
+        ):
+            with self.assertRaisesMessage(Exception, "truncated"):
+                _generate_with_anthropic(config, {})
+
+    def test_openai_stream_collects_deltas(self):
+        raw = json.dumps(mock_prediction_result())
+        lines = [
+            f"data: {json.dumps({'choices': [{'delta': {'content': chunk}, 'finish_reason': None}]})}"
+            for chunk in _chunks(raw)
+        ]
+        lines.append(f"data: {json.dumps({'choices': [{'delta': {}, 'finish_reason': 'stop'}]})}")
+        lines.append("data: [DONE]")
+        config = ProviderConfig(provider="openai", api_key="k", model="gpt-4o-mini")
+        seen = []
+
+        with mock.patch("api.ai_client.provider_post", return_value=_fake_stream_response(lines)):
+            result = _generate_with_openai(config, {}, on_topic=seen.append)
+
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(result["markdown"], "# Prep summary")
+
+
+@override_settings(CACHES=TEST_CACHE, AI_STREAM_RESPONSES=True)
+class StreamingPersistenceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(auth0_sub="test|stream", email="stream@example.com")
+
+    @mock.patch("api.prediction_service.generate_questions")
+    def test_topics_are_visible_while_running(self, mock_generate):
+        final = mock_prediction_result(marker="stream")
+        observed = {}
+
+        def fake_generate(interviewee, interviewer, interview_context=None, on_topic=None, on_usage=None):
+            on_topic({**final["topics"][0], "sort_order": 0})
+            on_topic({**final["topics"][1], "sort_order": 1})
+            payload, status_code = get_prediction_state_by_fingerprint(self.user, "stream-fp")
+            observed["payload"] = payload
+            observed["status"] = status_code
+            return final
+
+        mock_generate.side_effect = fake_generate
+        with mock.patch("api.prediction_service.compute_fingerprint", return_value="stream-fp"):
+            _, status_code = execute_prediction_job(
+                user_identifier="test|stream",
+                db_user=self.user,
+                interviewee={"name": "A"},
+                interviewer={"name": "B"},
+            )
+
+        self.assertEqual(observed["status"], 202)
+        self.assertEqual(
+            [t["title"] for t in observed["payload"]["topics"]],
+            ["Topic A", "Topic B"],
+        )
+        self.assertEqual(status_code, 200)
+        prediction = InterviewPrediction.objects.get(fingerprint="stream-fp")
+        self.assertEqual(PredictionTopic.objects.filter(prediction=prediction).count(), 4)
@@ -0,0 +1,129 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import (
+    TOPIC_MAP_SCHEMA,
+    TOPIC_MAP_TOOL_NAME,
+    AIClientError,
+    ProviderConfig,
+    _generate_with_anthropic,
+    _generate_with_openai,
+)
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+ANTHROPIC = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+OPENAI = ProviderConfig(provider="openai", api_key="k", model="gpt-4o-mini")
+
+
+def _tool_use_response(tool_input, stop_reason="tool_use"):
+    response = mock.Mock(status_code=200, headers={})
+    response.json.return_value = {
+        "stop_reason": stop_reason,
+        "content": [{"type": "tool_use", "id": "toolu_1", "name": TOPIC_MAP_TOOL_NAME, "input": tool_input}],
+        "usage": {"input_tokens": 100, "output_tokens": 50},
+    }
+    return response
+
+
+def _openai_response(message, finish_reason="stop"):
+    response = mock.Mock(status_code=200, headers={})
+    response.json.return_value = {
+        "choices": [{"finish_reason": finish_reason, "message": message}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50},
+    }
+    return response
+
+
+@override_settings(CACHES=TEST_CACHE, AI_STRUCTURED_OUTPUT=True)
+class StructuredOutputTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_anthropic_forces_the_topic_map_tool(self):
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_tool_use_response(mock_prediction_result()),
+        ) as mock_post:
+            result = _generate_with_anthropic(ANTHROPIC, {})
+
+        body = mock_post.call_args.kwargs["json"]
+        self.assertEqual(body["tools"][0]["input_schema"], TOPIC_MAP_SCHEMA)
+        self.assertEqual(body["tool_choice"], {"type": "tool", "name": TOPIC_MAP_TOOL_NAME})
+        self.assertEqual([topic["title"] for topic in result["topics"]], ["Topic A", "Topic B", "Topic C", "Topic D"])
+        self.assertEqual(result["markdown"], "# Prep summary")
+
+    def test_openai_requests_strict_json_schema(self):
+        content = json.dumps(mock_prediction_result())
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_openai_response({"content": content}),
+        ) as mock_post:
+            result = _generate_with_openai(OPENAI, {})
+
+        response_format = mock_post.call_args.kwargs["json"]["response_format"]
+        self.assertEqual(response_format["type"], "json_schema")
+        self.assertTrue(response_format["json_schema"]["strict"])
+        self.assertEqual(len(result["topics"]), 4)
+
+    def test_openai_refusal_is_a_client_error(self):
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_openai_response({"content": None, "refusal": "Not allowed."}),
+        ):
+            with self.assertRaisesMessage(AIClientError, "OpenAI refused the request: Not allowed."):
+                _generate_with_openai(OPENAI, {})
+
+    def test_free_text_recovery_is_not_applied(self):
+        fenced = "Here you go:\n```json\n" + json.dumps(mock_prediction_result()) + "\n```"
+        with mock.patch("api.ai_client.provider_post", return_value=_openai_response({"content": fenced})):
+            with self.assertRaisesMessage(AIClientError, "Model response was not valid JSON."):
+                _generate_with_openai(OPENAI, {})
+
+    def test_truncated_tool_call_is_salvaged_without_continuation(self):
+        tool_input = mock_prediction_result()
+        tool_input["topics"].append({"title": "Topic E"})
+        seen = []
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_tool_use_response(tool_input, stop_reason="max_tokens"),
+        ) as mock_post:
+            result = _generate_with_anthropic(ANTHROPIC, {}, on_usage=seen.append)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(len(result["topics"]), 5)
+        self.assertTrue(seen[0]["salvaged"])
+
+    @override_settings(AI_STREAM_RESPONSES=True)
+    def test_streamed_tool_input_reports_topics(self):
+        raw = json.dumps(mock_prediction_result())
+        lines = ['data: {"type": "message_start", "message": {}}']
+        for start in range(0, len(raw), 9):
+            delta = {"type": "input_json_delta", "partial_json": raw[start : start + 9]}
+            lines.append(f"data: {json.dumps({'type': 'content_block_delta', 'delta': delta})}")
+        lines.append(f"data: {json.dumps({'type': 'message_delta', 'delta': {'stop_reason': 'tool_use'}})}")
+        lines.append('data: {"type": "message_stop"}')
+        response = mock.Mock(status_code=200)
+        response.iter_lines.return_value = iter(lines)
+        seen = []
+
+        with mock.patch("api.ai_client.provider_post", return_value=response):
+            result = _generate_with_anthropic(ANTHROPIC, {}, on_topic=seen.append)
+
+        self.assertEqual([topic["title"] for topic in seen], ["Topic A", "Topic B", "Topic C", "Topic D"])
+        self.assertEqual(len(result["topics"]), 4)
+
+    @override_settings(AI_STRUCTURED_OUTPUT=False)
+    def test_disabled_keeps_json_object_mode(self):
+        content = json.dumps(mock_prediction_result())
+        with mock.patch(
+            "api.ai_client.provider_post",
+            return_value=_openai_response({"content": content}),
+        ) as mock_post:
+            _generate_with_openai(OPENAI, {})
+
+        self.assertEqual(mock_post.call_args.kwargs["json"]["response_format"], {"type": "json_object"})
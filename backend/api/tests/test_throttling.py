@@ -1,9 +1,13 @@
+from unittest import mock
+
 from django.core.cache import cache
-from django.test import override_settings
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
 from api.auth import Auth0User
+from api.models import User
+from api.throttling import consume_quota
 
 TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 
@@ -122,3 +126,79 @@ class DailyUserThrottleTests(APITestCase):
 
         response = self.client.get(self._url())
         self.assertEqual(response.status_code, 429)
+
+
+PLAN_REST_FRAMEWORK = {
+    **TEST_REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        "user": "3/day",
+        "user_premium": "6/day",
+        "generation": "2/day",
+        "generation_premium": "4/day",
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHE, THROTTLE_EXEMPT_SUBS=ADMIN_SUB, REST_FRAMEWORK=PLAN_REST_FRAMEWORK)
+class PlanQuotaTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _auth(self, sub, plan=User.PLAN_FREE):
+        User.objects.create(auth0_sub=sub, email=f"{sub}@test.com", plan=plan)
+        self.client.force_authenticate(user=Auth0User({"sub": sub, "email": f"{sub}@test.com"}))
+
+    def _statuses(self, count, method="get", url=None):
+        url = url or reverse("prep_sessions")
+        return [getattr(self.client, method)(url, {}, format="json").status_code for _ in range(count)]
+
+    def test_premium_plan_gets_its_own_rate(self):
+        self._auth(NORMAL_SUB, plan=User.PLAN_PREMIUM)
+        statuses = self._statuses(7)
+        self.assertNotIn(429, statuses[:6])
+        self.assertEqual(statuses[6], 429)
+
+    def test_generation_quota_is_separate_from_reads(self):
+        self._auth(NORMAL_SUB)
+        statuses = self._statuses(3, method="post", url=reverse("predict_questions"))
+        self.assertNotIn(429, statuses[:2])
+        self.assertEqual(statuses[2], 429)
+
+    @override_settings(THROTTLE_GENERATION_COST=2)
+    def test_generation_cost_weight(self):
+        self._auth(NORMAL_SUB, plan=User.PLAN_PREMIUM)
+        statuses = self._statuses(3, method="post", url=reverse("predict_questions"))
+        self.assertNotIn(429, statuses[:2])
+        self.assertEqual(statuses[2], 429)
+
+    def test_throttled_response_has_retry_after(self):
+        self._auth(NORMAL_SUB)
+        self._statuses(3)
+        response = self.client.get(reverse("prep_sessions"))
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+
+@override_settings(CACHES=TEST_CACHE)
+class ConsumeQuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch("api.throttling.time.time", return_value=1000.0):
+            self.assertEqual([consume_quota("k", 2, 60)[0] for _ in range(3)], [True, True, False])
+        with mock.patch("api.throttling.time.time", return_value=1030.0):
+            self.assertEqual([consume_quota("k", 2, 60)[0] for _ in range(2)], [True, False])
+
+    def test_wait_is_time_until_enough_tokens(self):
+        with mock.patch("api.throttling.time.time", return_value=1000.0):
+            consume_quota("k", 4, 60, cost=4)
+            allowed, wait = consume_quota("k", 4, 60, cost=2)
+        self.assertFalse(allowed)
+        self.assertEqual(wait, 30.0)
+
+    def test_redis_errors_fail_open(self):
+        connection = mock.Mock()
+        with mock.patch("api.throttling._redis_connection", return_value=connection):
+            with mock.patch("api.throttling._consume_redis", side_effect=ConnectionError("down")):
+                self.assertEqual(consume_quota("k", 1, 60), (True, 0.0))
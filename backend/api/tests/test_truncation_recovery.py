@@ -0,0 +1,142 @@
+import json
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.ai_client import (
+    AIClientError,
+    AIOutputTruncatedError,
+    ProviderConfig,
+    _generate_with_anthropic,
+    _generate_with_openai,
+    _retry_delay,
+    _salvage_truncated_payload,
+)
+from api.tests.helpers import mock_prediction_result
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+ANTHROPIC = ProviderConfig(provider="anthropic", api_key="k", model="claude-test")
+OPENAI = ProviderConfig(provider="openai", api_key="k", model="gpt-4o-mini")
+
+
+def _full_text():
+    return json.dumps(mock_prediction_result())
+
+
+def _cut_after_topic(text, count):
+    """Cut the JSON right after the `count`-th topic object closes, plus some of the next."""
+    index = text.index('"topics"')
+    for _ in range(count):
+        index = text.index("}", text.index("{", index)) + 1
+    return text[: index + 12]
+
+
+def _anthropic_response(text, stop_reason="end_turn", usage=None, status_code=200, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = {
+        "stop_reason": stop_reason,
+        "content": [{"type": "text", "text": text}],
+        "usage": usage or {"input_tokens": 100, "output_tokens": 50},
+    }
+    return response
+
+
+def _openai_response(text, finish_reason="stop"):
+    response = mock.Mock(status_code=200, headers={})
+    response.json.return_value = {
+        "choices": [{"finish_reason": finish_reason, "message": {"content": text}}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50},
+    }
+    return response
+
+
+class SalvageTests(TestCase):
+    def test_complete_topics_survive_a_cut_off(self):
+        payload = _salvage_truncated_payload(_cut_after_topic(_full_text(), 4))
+        self.assertEqual([topic["title"] for topic in payload["topics"]], ["Topic A", "Topic B", "Topic C", "Topic D"])
+        self.assertEqual(payload["markdown"], "# Prep summary")
+
+    def test_too_few_topics_cannot_be_salvaged(self):
+        self.assertIsNone(_salvage_truncated_payload(_cut_after_topic(_full_text(), 2)))
+
+
+@override_settings(CACHES=TEST_CACHE)
+class TruncationRecoveryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_anthropic_continues_from_partial_output(self):
+        # Runs on default settings: continuation is on in every default deployment.
+        text = _full_text()
+        partial, rest = text[:60] + "   ", text[60:]
+        responses = [
+            _anthropic_response(partial, stop_reason="max_tokens"),
+            _anthropic_response(rest, usage={"input_tokens": 120, "output_tokens": 30}),
+        ]
+        seen = []
+        with mock.patch("api.ai_client.provider_post", side_effect=responses) as mock_post:
+            result = _generate_with_anthropic(ANTHROPIC, {}, on_usage=seen.append)
+
+        continuation = mock_post.call_args_list[1].kwargs["json"]["messages"]
+        self.assertEqual(continuation[-1], {"role": "assistant", "content": text[:60]})
+        self.assertEqual(len(result["topics"]), 4)
+        self.assertEqual(seen[0]["output_tokens"], 80)
+        self.assertEqual(seen[0]["continuations"], 1)
+
+    def test_openai_salvages_complete_topics(self):
+        truncated = _cut_after_topic(_full_text(), 4)
+        seen = []
+        with mock.patch("api.ai_client.provider_post", return_value=_openai_response(truncated, "length")) as mock_post:
+            result = _generate_with_openai(OPENAI, {}, on_usage=seen.append)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(len(result["topics"]), 4)
+        self.assertTrue(seen[0]["salvaged"])
+
+    def test_unsalvageable_output_still_fails(self):
+        truncated = _cut_after_topic(_full_text(), 1)
+        with mock.patch("api.ai_client.provider_post", return_value=_openai_response(truncated, "length")):
+            with self.assertRaises(AIOutputTruncatedError):
+                _generate_with_openai(OPENAI, {})
+
+
+@override_settings(CACHES=TEST_CACHE, AI_RETRY_ATTEMPTS=2, AI_RETRY_MAX_DELAY=30)
+class ProviderRetryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_retries_overloaded_responses_honouring_retry_after(self):
+        responses = [
+            _anthropic_response("", status_code=529, headers={"retry-after": "3"}),
+            _anthropic_response(_full_text()),
+        ]
+        with mock.patch("api.ai_client.provider_post", side_effect=responses):
+            with mock.patch("api.ai_client.time.sleep") as mock_sleep:
+                result = _generate_with_anthropic(ANTHROPIC, {})
+
+        mock_sleep.assert_called_once_with(3.0)
+        self.assertEqual(len(result["topics"]), 4)
+
+    def test_gives_up_after_configured_attempts(self):
+        failing = _anthropic_response("", status_code=503)
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+        failing.json.return_value = {"error": {"message": "unavailable"}}
+        with mock.patch("api.ai_client.provider_post", return_value=failing) as mock_post:
+            with mock.patch("api.ai_client.time.sleep"):
+                with self.assertRaisesMessage(AIClientError, "unavailable"):
+                    _generate_with_anthropic(ANTHROPIC, {})
+
+        self.assertEqual(mock_post.call_count, 3)
+
+    def test_retry_after_beyond_max_delay_is_not_waited_for(self):
+        response = mock.Mock(headers={"retry-after": "120"})
+        self.assertIsNone(_retry_delay(response, 0))
+
+    def test_backoff_grows_without_retry_after(self):
+        response = mock.Mock(headers={})
+        with override_settings(AI_RETRY_BACKOFF=2.0):
+            self.assertLessEqual(_retry_delay(response, 0), 2.0)
+            self.assertGreaterEqual(_retry_delay(response, 2), 4.0)
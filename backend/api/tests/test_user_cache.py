@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.auth import Auth0User, aget_or_create_db_user, get_or_create_db_user
+from api.models import User
+from api.user_cache import local_users
+
+TEST_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+SUB = "test|cached-user"
+
+
+def _request(sub=SUB):
+    return SimpleNamespace(user=Auth0User({"sub": sub, "email": f"{sub}@example.com"}))
+
+
+@override_settings(CACHES=TEST_CACHE, USER_CACHE_ENABLED=True)
+class UserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.addCleanup(local_users.clear)
+
+    def _create_user(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return User.objects.create(auth0_sub=SUB, email="cached@example.com", **fields)
+
+    def test_cached_user_costs_no_queries(self):
+        user = self._create_user()
+        with self.assertNumQueries(0):
+            db_user = get_or_create_db_user(_request())
+        self.assertEqual((db_user.pk, db_user.email, db_user.plan), (user.pk, user.email, User.PLAN_FREE))
+
+    def test_shared_tier_serves_other_processes(self):
+        user = self._create_user()
+        local_users.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_or_create_db_user(_request()).pk, user.pk)
+
+    def test_lookup_populates_cache_after_commit(self):
+        User.objects.create(auth0_sub=SUB)
+        cache.clear()
+        local_users.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            get_or_create_db_user(_request())
+        with self.assertNumQueries(0):
+            get_or_create_db_user(_request())
+
+    def test_uncommitted_rows_are_not_cached(self):
+        User.objects.create(auth0_sub=SUB)
+        with self.assertNumQueries(1):
+            get_or_create_db_user(_request())
+
+    def test_plan_change_invalidates(self):
+        user = self._create_user()
+        user.plan = User.PLAN_PREMIUM
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertEqual(get_or_create_db_user(_request()).plan, User.PLAN_PREMIUM)
+
+    def test_delete_invalidates(self):
+        user = self._create_user()
+        user.delete()
+        db_user = get_or_create_db_user(_request())
+        self.assertNotEqual(db_user.pk, user.pk)
+
+    def test_async_lookup_uses_cache(self):
+        user = self._create_user()
+        local_users.clear()
+        db_user = async_to_sync(aget_or_create_db_user)(_request())
+        self.assertEqual(db_user.pk, user.pk)
+
+    @override_settings(USER_CACHE_ENABLED=False)
+    def test_disabled_cache_queries_every_time(self):
+        self._create_user()
+        with self.assertNumQueries(1):
+            get_or_create_db_user(_request())
@@ -1,36 +1,177 @@
+"""
+Per-user request quotas.
+
+Each throttle is a token bucket kept as one GCRA timestamp per user and scope
+(the "theoretical arrival time" of the next request), so memory is O(1) per
+user however high the rate. On Redis the check-and-update runs as a single
+Lua script; other cache backends (LocMemCache in tests) use the same
+arithmetic through the Django cache without the atomicity guarantee.
+
+Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]: `<scope>_<plan>`
+(e.g. `user_premium`) when the user's plan has its own entry, otherwise
+`<scope>`. A scope without a rate is not throttled.
+"""
+
+import time
+from functools import lru_cache
+
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework.settings import api_settings as drf_api_settings
-from rest_framework.throttling import UserRateThrottle
+from rest_framework.throttling import BaseThrottle
+
+from .auth import get_or_create_db_user
+from .models import User
+
+try:
+    from django_redis import get_redis_connection
+except ImportError:  # pragma: no cover - django-redis is in requirements.txt
+    get_redis_connection = None
+
+RATE_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS[1] = bucket key; ARGV = now, emission interval, burst window, cost.
+# Returns {allowed, seconds to wait} with the wait as a string because Redis
+# truncates Lua numbers to integers.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if tat == nil or tat < now then
+    tat = now
+end
+local new_tat = tat + cost * interval
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, tostring(allow_at - now)}
+end
+redis.call("SET", KEYS[1], tostring(new_tat), "PX", math.ceil((new_tat - now) * 1000))
+return {1, "0"}
+"""
+
+_gcra_script = None
+
+
+@lru_cache(maxsize=8)
+def parse_exempt_subs(raw):
+    return frozenset(sub.strip() for sub in (raw or "").split(",") if sub.strip())
+
 
+@lru_cache(maxsize=32)
+def parse_rate(rate):
+    """`"200/day"` -> `(200, 86400)`, or None for an empty rate."""
+    if not rate:
+        return None
+    num, period = rate.split("/")
+    return int(num), RATE_PERIODS[period.strip()[0]]
 
-class DailyUserThrottle(UserRateThrottle):
+
+def _redis_connection():
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _consume_redis(connection, key, now, interval, burst, cost):
+    global _gcra_script
+    if _gcra_script is None:
+        _gcra_script = connection.register_script(GCRA_SCRIPT)
+    allowed, wait = _gcra_script(keys=[key], args=[now, interval, burst, cost], client=connection)
+    return bool(int(allowed)), float(wait)
+
+
+def _consume_cache(key, now, interval, burst, cost):
+    tat = max(cache.get(key) or now, now)
+    new_tat = tat + cost * interval
+    allow_at = new_tat - burst
+    if allow_at > now:
+        return False, allow_at - now
+    cache.set(key, new_tat, timeout=int(new_tat - now) + 1)
+    return True, 0.0
+
+
+def consume_quota(key, limit, period, cost=1):
+    """
+    Spend `cost` units of a `limit`-per-`period` bucket. Returns
+    `(allowed, wait_seconds)`; a Redis outage lets the request through.
     """
-    Standard per-user daily rate limit with an admin bypass.
+    now = time.time()
+    interval = period / limit
+    try:
+        connection = _redis_connection()
+        if connection is not None:
+            return _consume_redis(connection, key, now, interval, period, cost)
+    except Exception:
+        return True, 0.0
+    return _consume_cache(key, now, interval, period, cost)
 
-    Any Auth0 subject (sub) listed in the THROTTLE_EXEMPT_SUBS environment
-    variable is granted unlimited requests. All other authenticated users are
-    subject to the DAILY_RATELIMIT quota.
 
-    Set on EC2:
-        THROTTLE_EXEMPT_SUBS=auth0|abc123,google-oauth2|xyz456
+class PlanRateThrottle(BaseThrottle):
     """
+    Token-bucket quota per Auth0 subject, sized by the user's plan.
 
-    def get_rate(self):
+    Any Auth0 subject (sub) listed in the THROTTLE_EXEMPT_SUBS environment
+    variable is granted unlimited requests.
+    """
+
+    scope = None
+    cost = 1
+
+    def get_rate(self, request):
         # Read lazily so @override_settings(REST_FRAMEWORK=...) works in tests.
-        # DRF normally sets THROTTLE_RATES at class-definition time, which
-        # makes the rate invisible to Django's test override mechanism.
-        try:
-            return drf_api_settings.DEFAULT_THROTTLE_RATES[self.scope]
-        except KeyError:
-            return super().get_rate()
+        rates = drf_api_settings.DEFAULT_THROTTLE_RATES
+        plan_scope = f"{self.scope}_{User.PLAN_PREMIUM.lower()}"
+        if plan_scope in rates and get_or_create_db_user(request).plan == User.PLAN_PREMIUM:
+            return rates[plan_scope]
+        return rates.get(self.scope)
+
+    def get_cost(self, request, view):
+        return self.cost
 
     def allow_request(self, request, view):
-        exempt_subs = {
-            s.strip()
-            for s in getattr(settings, "THROTTLE_EXEMPT_SUBS", "").split(",")
-            if s.strip()
-        }
-        user_sub = str(getattr(request.user, "pk", ""))
-        if user_sub and user_sub in exempt_subs:
+        self.wait_seconds = None
+        if not getattr(request.user, "is_authenticated", False):
+            return True
+        sub = str(getattr(request.user, "pk", ""))
+        if not sub or sub in parse_exempt_subs(getattr(settings, "THROTTLE_EXEMPT_SUBS", "")):
             return True
-        return super().allow_request(request, view)
+        parsed = parse_rate(self.get_rate(request))
+        if parsed is None:
+            return True
+        limit, period = parsed
+        allowed, wait = consume_quota(f"throttle:{self.scope}:{sub}", limit, period, self.get_cost(request, view))
+        if not allowed:
+            self.wait_seconds = wait
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class DailyUserThrottle(PlanRateThrottle):
+    """
+    Request quota applied to every endpoint (`user` / `user_premium` rates).
+
+    Set on EC2:
+        THROTTLE_EXEMPT_SUBS=auth0|abc123,google-oauth2|xyz456
+    """
+
+    scope = "user"
+
+
+class GenerationThrottle(PlanRateThrottle):
+    """
+    Separate quota for endpoints that may start a model call, on top of the
+    request quota. Its rates are in cost units and each call spends
+    THROTTLE_GENERATION_COST of them.
+    """
+
+    scope = "generation"
+
+    def get_cost(self, request, view):
+        return max(int(getattr(settings, "THROTTLE_GENERATION_COST", 1)), 1)
@@ -1,5 +1,6 @@
 import re
 
+from django.db import transaction
 from django.utils.text import slugify
 
 from .models import PredictionTopic
@@ -24,61 +25,93 @@ def _normalize_likelihood(raw: str) -> str:
     return PredictionTopic.LIKELIHOOD_LOWER
 
 
-def _unique_topic_key(prediction_id: int, title: str, index: int) -> str:
-    base = slugify(title) or f"topic-{index + 1}"
-    candidate = base[:110]
-    if not PredictionTopic.objects.filter(prediction_id=prediction_id, topic_key=candidate).exists():
-        return candidate
+def _unique_topic_key(base: str, index: int, taken: set, *, max_length: int = 110) -> str:
+    """Pick a slug not already in `taken` (in memory) and reserve it."""
+    base = slugify(base) or f"topic-{index + 1}"
+    candidate = base[:max_length]
     suffix = 2
-    while True:
-        alt = f"{base[:100]}-{suffix}"
-        if not PredictionTopic.objects.filter(prediction_id=prediction_id, topic_key=alt).exists():
-            return alt
+    while candidate in taken:
+        candidate = f"{base[:100]}-{suffix}"
         suffix += 1
+    taken.add(candidate)
+    return candidate
+
+
+def _build_topic_row(prediction, item, index, taken, *, dedupe_key=False):
+    """Return an unsaved PredictionTopic for `item`, or None when it has no title."""
+    if not isinstance(item, dict):
+        return None
+    title = str(item.get("title") or "").strip()
+    if not title:
+        return None
+    topic_key = str(item.get("topic_key") or "").strip()
+    if dedupe_key or not topic_key or not slugify(topic_key):
+        topic_key = _unique_topic_key(topic_key or title, index, taken)
+    else:
+        topic_key = _unique_topic_key(topic_key, index, taken, max_length=120)
+
+    anchors = item.get("study_anchors") or []
+    if isinstance(anchors, str):
+        anchors = [anchors]
+    if not isinstance(anchors, list):
+        anchors = []
+    anchors = [str(a).strip() for a in anchors if str(a).strip()][:8]
+
+    return PredictionTopic(
+        prediction=prediction,
+        topic_key=topic_key,
+        title=title[:255],
+        emoji=str(item.get("emoji") or "").strip()[:16],
+        likelihood=_normalize_likelihood(item.get("likelihood")),
+        why=str(item.get("why") or "").strip(),
+        study_anchors=anchors,
+        sort_order=int(item.get("sort_order") if item.get("sort_order") is not None else index),
+    )
 
 
 def replace_prediction_topics(prediction, topics_payload):
     """
     Replace all topics for a prediction from the AI topics list.
     Returns the created PredictionTopic queryset values as dicts.
+
+    Keys are de-duplicated in memory and the delete plus a single bulk insert
+    run in one transaction, so the query count does not grow with the number
+    of topics.
     """
     topics_payload = topics_payload if isinstance(topics_payload, list) else []
-    PredictionTopic.objects.filter(prediction=prediction).delete()
-
-    created = []
+    taken = set()
+    rows = []
     for index, item in enumerate(topics_payload):
-        if not isinstance(item, dict):
-            continue
-        title = str(item.get("title") or "").strip()
-        if not title:
-            continue
-        topic_key = str(item.get("topic_key") or "").strip()
-        if not topic_key:
-            topic_key = _unique_topic_key(prediction.id, title, index)
-        else:
-            topic_key = slugify(topic_key)[:120] or _unique_topic_key(prediction.id, title, index)
-
-        anchors = item.get("study_anchors") or []
-        if isinstance(anchors, str):
-            anchors = [anchors]
-        if not isinstance(anchors, list):
-            anchors = []
-        anchors = [str(a).strip() for a in anchors if str(a).strip()][:8]
-
-        row = PredictionTopic.objects.create(
-            prediction=prediction,
-            topic_key=topic_key,
-            title=title[:255],
-            emoji=str(item.get("emoji") or "").strip()[:16],
-            likelihood=_normalize_likelihood(item.get("likelihood")),
-            why=str(item.get("why") or "").strip(),
-            study_anchors=anchors,
-            sort_order=int(item.get("sort_order") if item.get("sort_order") is not None else index),
-        )
-        created.append(row)
+        row = _build_topic_row(prediction, item, index, taken)
+        if row is not None:
+            rows.append(row)
+
+    with transaction.atomic():
+        PredictionTopic.objects.filter(prediction=prediction).delete()
+        created = PredictionTopic.objects.bulk_create(rows)
     return [serialize_prediction_topic(row) for row in created]
 
 
+def append_prediction_topic(prediction, item):
+    """
+    Persist one topic streamed from a still-running generation.
+    The final result later goes through replace_prediction_topics.
+    """
+    index = item.get("sort_order") if isinstance(item, dict) else None
+    taken = set(
+        PredictionTopic.objects.filter(prediction=prediction).values_list("topic_key", flat=True)
+    )
+    row = _build_topic_row(prediction, item, index or 0, taken, dedupe_key=True)
+    if row is None:
+        return None
+    row.save()
+    return serialize_prediction_topic(row)
+
+
+def clear_prediction_topics(prediction):
+    PredictionTopic.objects.filter(prediction=prediction).delete()
+
+
 def serialize_prediction_topic(topic):
     return {
         "id": topic.id,
@@ -97,3 +130,10 @@ def topics_for_prediction(prediction):
         return []
     rows = prediction.topics.order_by("sort_order", "id")
     return [serialize_prediction_topic(row) for row in rows]
+
+
+async def atopics_for_prediction(prediction):
+    if prediction is None:
+        return []
+    rows = prediction.topics.order_by("sort_order", "id")
+    return [serialize_prediction_topic(row) async for row in rows]
@@ -6,6 +6,8 @@ from .views import (
     get_prep_session_role_profile,
     interviewee_baseline_profile,
     predict_questions,
+    prediction_detail,
+    prediction_events,
     prep_session_detail,
     prep_sessions,
     submit_prep_profile,
@@ -37,6 +39,16 @@ urlpatterns = [
         get_prep_prediction,
         name="get_prep_prediction",
     ),
+    path(
+        "predictions/<str:fingerprint>",
+        prediction_detail,
+        name="prediction_detail",
+    ),
+    path(
+        "predictions/<str:fingerprint>/events",
+        prediction_events,
+        name="prediction_events",
+    ),
     path(
         "profile-baseline/interviewee",
         interviewee_baseline_profile,
@@ -0,0 +1,111 @@
+"""
+Auth0 subject -> `User` row cache.
+
+Every authenticated request resolves its `User`, and most of them are cheap
+polls, so the row is cached in two tiers: a small per-process LRU with a
+few seconds' TTL and Redis with USER_CACHE_TTL. Rows are only cached once
+their transaction commits. Saving or deleting a `User` drops both entries
+(the local tier only in the saving process, which is why its TTL is short);
+`QuerySet.update()` bypasses signals and is only bounded by the TTLs.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .local_cache import LocalLRU
+from .models import User
+
+
+def user_cache_enabled():
+    return bool(getattr(settings, "USER_CACHE_ENABLED", True))
+
+
+def _build_user_key(sub):
+    return f"user:sub:{sub}"
+
+
+def _user_fields():
+    return [field.attname for field in User._meta.concrete_fields]
+
+
+def _serialize_user(user):
+    return {name: getattr(user, name) for name in _user_fields()}
+
+
+def _deserialize_user(data):
+    names = _user_fields()
+    if not isinstance(data, dict) or any(name not in data for name in names):
+        return None
+    return User.from_db(DEFAULT_DB_ALIAS, names, [data[name] for name in names])
+
+
+local_users = LocalLRU("USER_CACHE_LOCAL_SIZE", 2048, "USER_CACHE_LOCAL_TTL", 5)
+
+
+def get_cached_user(sub):
+    """Return the cached `User` for `sub`, or None on a miss."""
+    if not user_cache_enabled():
+        return None
+    data = local_users.get(sub)
+    if data is None:
+        try:
+            data = cache.get(_build_user_key(sub))
+        except Exception:
+            return None
+        if data is None:
+            return None
+        local_users.put(sub, data)
+    return _deserialize_user(data)
+
+
+async def aget_cached_user(sub):
+    if not user_cache_enabled():
+        return None
+    data = local_users.get(sub)
+    if data is None:
+        try:
+            data = await cache.aget(_build_user_key(sub))
+        except Exception:
+            return None
+        if data is None:
+            return None
+        local_users.put(sub, data)
+    return _deserialize_user(data)
+
+
+def cache_user(user):
+    if not user_cache_enabled():
+        return
+    data = _serialize_user(user)
+    local_users.put(user.auth0_sub, data)
+    try:
+        cache.set(_build_user_key(user.auth0_sub), data, timeout=int(getattr(settings, "USER_CACHE_TTL", 300)))
+    except Exception:
+        pass
+
+
+def cache_user_on_commit(user):
+    """Cache `user` once the current transaction commits (immediately under autocommit)."""
+    transaction.on_commit(lambda: cache_user(user))
+
+
+def invalidate_cached_user(sub):
+    local_users.discard(sub)
+    try:
+        cache.delete(_build_user_key(sub))
+    except Exception:
+        pass
+
+
+@receiver(post_save, sender=User, dispatch_uid="api.user_cache.saved")
+def _refresh_on_save(sender, instance, **kwargs):
+    invalidate_cached_user(instance.auth0_sub)
+    cache_user_on_commit(instance)
+
+
+@receiver(post_delete, sender=User, dispatch_uid="api.user_cache.deleted")
+def _invalidate_on_delete(sender, instance, **kwargs):
+    invalidate_cached_user(instance.auth0_sub)
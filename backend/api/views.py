@@ -1,22 +1,49 @@
 # backend/api/views.py
+import threading
 from urllib.parse import urlencode
 
+from adrf.decorators import api_view as async_api_view
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    renderer_classes,
+    throttle_classes,
+)
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from .ai_client import PROMPT_VERSION
+from .auth import aget_or_create_db_user, get_or_create_db_user
 from .models import (
     IntervieweeBaselineProfile,
     InterviewPrediction,
     PrepProfileSubmission,
     PrepSession,
-    User,
+)
+from .prediction_events import (
+    EVENT_STATUS,
+    TERMINAL_STATUSES,
+    EventStreamRenderer,
+    format_sse,
+    iter_prediction_events,
+    subscribe_prediction_events,
 )
 from .prediction_service import (
+    aenrich_completed_result,
+    aget_prediction_state_for_session,
+    aget_prediction_statuses_by_fingerprint,
+    compute_fingerprint,
     enrich_completed_result,
     get_prediction_state,
+    get_prediction_state_by_fingerprint,
+    get_prediction_state_for_session,
     mark_prediction_enqueue_failed,
     reserve_prediction_job,
     run_prediction_pipeline,
@@ -27,18 +54,12 @@ from .serializers import (
     PredictRequestSerializer,
     PrepProfileSubmissionSerializer,
     PrepSessionCreateSerializer,
+    PrepSessionListQuerySerializer,
     PrepSessionUpdateSerializer,
+    encode_prep_session_cursor,
 )
 from .tasks import run_prediction_task
-
-
-def get_or_create_db_user(auth_user):
-    payload = getattr(auth_user, "payload", None) or {}
-    db_user, _ = User.objects.get_or_create(
-        auth0_sub=str(auth_user.id),
-        defaults={"email": payload.get("email") or None},
-    )
-    return db_user
+from .throttling import DailyUserThrottle, GenerationThrottle
 
 
 def normalize_sections_to_text(extracted_sections):
@@ -89,11 +110,13 @@ def build_predict_payload_from_prep_session(prep_session, user_email=None):
 
 
 def build_prediction_response(
-    payload, response_status, *, db_user=None, fingerprint=None
+    payload, response_status, *, db_user=None, fingerprint=None, prediction=None
 ):
     if response_status == status.HTTP_200_OK:
         result = payload
-        if db_user and fingerprint:
+        if prediction is not None:
+            result = enrich_completed_result(prediction, payload)
+        elif db_user and fingerprint:
             result = _enrich_result_with_topics(db_user, fingerprint, payload)
         return {
             "status": "COMPLETED",
@@ -101,13 +124,15 @@ def build_prediction_response(
         }
 
     response_body = {"status": payload.get("status", "UNKNOWN")}
-    for key in ("fingerprint", "error", "last_good_fallback"):
+    for key in ("fingerprint", "topics", "result", "error", "last_good_fallback"):
         if key in payload:
             response_body[key] = payload[key]
     return response_body
 
 
 def _enrich_result_with_topics(db_user, fingerprint, payload):
+    if not isinstance(payload, dict) or payload.get("topics"):
+        return payload
     try:
         pred_obj = InterviewPrediction.objects.get(
             fingerprint=fingerprint, user=db_user
@@ -228,6 +253,12 @@ def build_generate_user_message(prediction, generation_source=None):
     if prediction_status == "FAILED":
         return "We could not generate prep right now. Open the Interview Lens Dashboard for details and retry options."
 
+    if prediction_status == "DRAFT":
+        return (
+            "A first draft of your interview prep is ready on the Interview Lens Dashboard. "
+            "It will update automatically when the full version is done."
+        )
+
     if generation_source == "in_progress":
         return (
             "Interview prep generation is already running for these profiles. "
@@ -272,7 +303,16 @@ def serialize_prep_profile_submission(submission):
     }
 
 
-def resolve_session_profile_state(prep_session, db_user):
+_BASELINE_NOT_LOADED = object()
+
+
+def resolve_session_profile_state(
+    prep_session, db_user, baseline_interviewee_profile=_BASELINE_NOT_LOADED
+):
+    """
+    Callers resolving many sessions for one user should prefetch
+    `profile_submissions` and pass the baseline profile they already loaded.
+    """
     session_submissions = {
         submission.role: submission
         for submission in prep_session.profile_submissions.all()
@@ -283,9 +323,10 @@ def resolve_session_profile_state(prep_session, db_user):
     interviewer_submission = session_submissions.get(
         PrepProfileSubmission.ROLE_INTERVIEWER
     )
-    baseline_interviewee_profile = IntervieweeBaselineProfile.objects.filter(
-        user=db_user
-    ).first()
+    if baseline_interviewee_profile is _BASELINE_NOT_LOADED:
+        baseline_interviewee_profile = IntervieweeBaselineProfile.objects.filter(
+            user=db_user
+        ).first()
 
     interviewee_source = "MISSING"
     if session_interviewee_submission:
@@ -319,6 +360,18 @@ def resolve_session_profile_state(prep_session, db_user):
     }
 
 
+async def aresolve_session_profile_state(prep_session, db_user):
+    """Async variant for sessions loaded with `profile_submissions` prefetched."""
+    baseline_interviewee_profile = await IntervieweeBaselineProfile.objects.filter(
+        user=db_user
+    ).afirst()
+    return resolve_session_profile_state(
+        prep_session,
+        db_user,
+        baseline_interviewee_profile=baseline_interviewee_profile,
+    )
+
+
 def _profile_display_name(profile_record, fallback):
     if not profile_record:
         return fallback
@@ -364,8 +417,143 @@ def build_predict_payload_from_profile_state(
     return interviewee, interviewer, interview_context
 
 
+def compute_prep_session_fingerprint(prep_session, db_user, profile_state=None):
+    if profile_state is None:
+        profile_state = resolve_session_profile_state(prep_session, db_user)
+    if profile_state["pipeline_status"] != "READY_FOR_TOPIC_GENERATION":
+        return None
+    interviewee, interviewer, interview_context = (
+        build_predict_payload_from_profile_state(
+            profile_state,
+            user_email=db_user.email,
+            prep_session=prep_session,
+        )
+    )
+    return compute_fingerprint(
+        db_user.auth0_sub,
+        interviewee,
+        interviewer,
+        interview_context=interview_context,
+    )
+
+
+def store_prep_session_fingerprint(prep_session, fingerprint, current_prediction=None):
+    """Persist derived fingerprint state without touching updated_at."""
+    prep_session.input_fingerprint = fingerprint
+    prep_session.input_fingerprint_version = PROMPT_VERSION
+    prep_session.current_prediction = current_prediction
+    PrepSession.objects.filter(pk=prep_session.pk).update(
+        input_fingerprint=fingerprint,
+        input_fingerprint_version=PROMPT_VERSION,
+        current_prediction=current_prediction,
+    )
+
+
+def refresh_prep_session_fingerprint(prep_session, db_user, profile_state=None):
+    """
+    Recompute the session's input fingerprint and current-prediction pointer.
+    Called on every write that changes prediction inputs (profiles, title,
+    company) so reads can skip rebuilding and rehashing the payload.
+    """
+    fingerprint = compute_prep_session_fingerprint(
+        prep_session, db_user, profile_state
+    )
+    current_prediction = None
+    if fingerprint:
+        current_prediction = InterviewPrediction.objects.filter(
+            fingerprint=fingerprint, user=db_user
+        ).first()
+    store_prep_session_fingerprint(prep_session, fingerprint, current_prediction)
+    return fingerprint
+
+
+def refresh_baseline_dependent_fingerprints(db_user):
+    """Sessions without their own interviewee profile fall back to the baseline."""
+    sessions = (
+        PrepSession.objects.filter(user=db_user)
+        .exclude(profile_submissions__role=PrepProfileSubmission.ROLE_INTERVIEWEE)
+        .prefetch_related("profile_submissions")
+    )
+    baseline_interviewee_profile = IntervieweeBaselineProfile.objects.filter(
+        user=db_user
+    ).first()
+    for prep_session in sessions:
+        profile_state = resolve_session_profile_state(
+            prep_session,
+            db_user,
+            baseline_interviewee_profile=baseline_interviewee_profile,
+        )
+        refresh_prep_session_fingerprint(prep_session, db_user, profile_state)
+
+
+def has_fresh_prep_session_fingerprint(prep_session):
+    return bool(
+        prep_session.input_fingerprint
+        and prep_session.input_fingerprint_version == PROMPT_VERSION
+    )
+
+
+def resolve_prep_session_fingerprint(prep_session, db_user, profile_state):
+    """Stored fingerprint for a ready session; recomputed for legacy or stale rows."""
+    if has_fresh_prep_session_fingerprint(prep_session):
+        return prep_session.input_fingerprint
+    return refresh_prep_session_fingerprint(prep_session, db_user, profile_state)
+
+
+async def aresolve_prep_session_fingerprint(prep_session, db_user, profile_state):
+    if has_fresh_prep_session_fingerprint(prep_session):
+        return prep_session.input_fingerprint
+    # Legacy or stale rows are rare; backfill them through the sync write path.
+    return await sync_to_async(refresh_prep_session_fingerprint)(
+        prep_session, db_user, profile_state
+    )
+
+
+def _with_last_success(prediction, pred_obj):
+    if (
+        prediction.get("status") == "COMPLETED"
+        and pred_obj is not None
+        and pred_obj.last_success_at
+    ):
+        return {
+            **prediction,
+            "last_success_at": pred_obj.last_success_at.isoformat(),
+        }
+    return prediction
+
+
+def build_session_prediction(prep_session, db_user, fingerprint):
+    payload, response_status, pred_obj = get_prediction_state_for_session(
+        db_user, prep_session, fingerprint
+    )
+    if payload is None:
+        return {"status": "NOT_STARTED", "fingerprint": fingerprint}, response_status
+    prediction = build_prediction_response(
+        payload,
+        response_status,
+        db_user=db_user,
+        fingerprint=fingerprint,
+        prediction=pred_obj,
+    )
+    return _with_last_success(prediction, pred_obj), response_status
+
+
+async def abuild_session_prediction(prep_session, db_user, fingerprint):
+    payload, response_status, pred_obj = await aget_prediction_state_for_session(
+        db_user, prep_session, fingerprint
+    )
+    if payload is None:
+        return {"status": "NOT_STARTED", "fingerprint": fingerprint}, response_status
+    if response_status == status.HTTP_200_OK:
+        # Without a row there are no stored topics to attach.
+        payload = await aenrich_completed_result(pred_obj, payload)
+    prediction = build_prediction_response(payload, response_status)
+    return _with_last_success(prediction, pred_obj), response_status
+
+
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
+@throttle_classes([DailyUserThrottle, GenerationThrottle])
 def predict_questions(request):
     s = PredictRequestSerializer(data=request.data)
     if not s.is_valid():
@@ -376,7 +564,7 @@ def predict_questions(request):
     prompt_version = s.validated_data.get("prompt_version", "") or ""
     regenerate_nonce = s.validated_data.get("regenerate_nonce", "") or ""
     interview_context = build_interview_context()
-    db_user = get_or_create_db_user(request.user)
+    db_user = get_or_create_db_user(request)
     if getattr(settings, "ENABLE_CACHING", True):
         payload, response_status, _fingerprint, _generation_source = (
             start_prediction_job(
@@ -402,138 +590,210 @@ def predict_questions(request):
     return Response(payload, status=response_status)
 
 
-def compute_prep_session_row(
-    prep_session, db_user, user_identifier, *, is_latest=False
-):
+PREP_ROW_STATUS_BY_PREDICTION = {
+    "COMPLETED": "ready",
+    "FAILED": "failed",
+    "RUNNING": "generating",
+    "DRAFT": "generating",
+}
+
+PREP_ROW_PREDICTION_FIELDS = {"prediction_status", "row_status"}
+PREP_ROW_PROFILE_FIELDS = {
+    "pipeline_status",
+    "interviewee_source",
+    "has_interviewee_profile",
+    "has_interviewer_profile",
+} | PREP_ROW_PREDICTION_FIELDS
+
+
+async def acompute_prep_session_rows(prep_sessions, db_user, *, latest_id=None, fields=None):
     """
-    One row for GET /prep-sessions/ — includes human-oriented row_status for the dashboard list.
+    Rows for GET /prep-sessions/ — includes human-oriented row_status for the dashboard list.
+
+    Batched so the query count does not grow with the number of sessions:
+    submissions must be prefetched, the baseline profile is loaded once,
+    stored fingerprints are reused (legacy rows are backfilled in one
+    bulk_update), and prediction states are resolved with a single
+    fingerprint__in lookup.
+    With a `fields` projection, profile and prediction state are only
+    resolved when a requested field needs them.
     """
-    profile_state = resolve_session_profile_state(prep_session, db_user)
-    pipeline_status = profile_state["pipeline_status"]
+    needs_profile_state = fields is None or bool(fields & PREP_ROW_PROFILE_FIELDS)
+    needs_prediction = fields is None or bool(fields & PREP_ROW_PREDICTION_FIELDS)
+
+    baseline_interviewee_profile = None
+    if needs_profile_state:
+        baseline_interviewee_profile = await IntervieweeBaselineProfile.objects.filter(
+            user=db_user
+        ).afirst()
+
+    rows = []
+    fingerprints_by_row = {}
+    stale_sessions = []
+    for idx, prep_session in enumerate(prep_sessions):
+        row = {
+            "prep_id": str(prep_session.prep_id),
+            "title": prep_session.title,
+            "company_name": prep_session.company_name,
+            "created_at": prep_session.created_at.isoformat(),
+            "is_latest": prep_session.id == latest_id,
+        }
+        rows.append(row)
+        if not needs_profile_state:
+            continue
+
+        profile_state = resolve_session_profile_state(
+            prep_session,
+            db_user,
+            baseline_interviewee_profile=baseline_interviewee_profile,
+        )
+        pipeline_status = profile_state["pipeline_status"]
+        row.update(
+            {
+                "pipeline_status": pipeline_status,
+                "interviewee_source": profile_state["interviewee_source"],
+                "has_interviewee_profile": profile_state["has_interviewee_profile"],
+                "has_interviewer_profile": profile_state["has_interviewer_profile"],
+            }
+        )
 
-    row = {
-        "prep_id": str(prep_session.prep_id),
-        "title": prep_session.title,
-        "company_name": prep_session.company_name,
-        "created_at": prep_session.created_at.isoformat(),
-        "pipeline_status": pipeline_status,
-        "interviewee_source": profile_state["interviewee_source"],
-        "has_interviewee_profile": profile_state["has_interviewee_profile"],
-        "has_interviewer_profile": profile_state["has_interviewer_profile"],
-        "is_latest": is_latest,
-    }
+        if pipeline_status != "READY_FOR_TOPIC_GENERATION":
+            row["row_status"] = "waiting_for_profiles"
+            continue
+        if not needs_prediction:
+            continue
 
-    if pipeline_status != "READY_FOR_TOPIC_GENERATION":
-        row["row_status"] = "waiting_for_profiles"
-        return row
+        if not has_fresh_prep_session_fingerprint(prep_session):
+            prep_session.input_fingerprint = compute_prep_session_fingerprint(
+                prep_session, db_user, profile_state
+            )
+            prep_session.input_fingerprint_version = PROMPT_VERSION
+            stale_sessions.append(prep_session)
+        fingerprints_by_row[idx] = prep_session.input_fingerprint
 
-    interviewee, interviewer, interview_context = (
-        build_predict_payload_from_profile_state(
-            profile_state,
-            user_email=db_user.email,
-            prep_session=prep_session,
+    if stale_sessions:
+        await PrepSession.objects.abulk_update(
+            stale_sessions, ["input_fingerprint", "input_fingerprint_version"]
         )
+
+    statuses = await aget_prediction_statuses_by_fingerprint(
+        db_user, fingerprints_by_row.values()
     )
-    payload, response_status, fingerprint = get_prediction_state(
-        user_identifier=user_identifier,
-        db_user=db_user,
-        interviewee=interviewee,
-        interviewer=interviewer,
-        interview_context=interview_context,
-    )
-    prediction = (
-        build_prediction_response(
-            payload,
-            response_status,
-            db_user=db_user,
-            fingerprint=fingerprint,
-        )
-        if payload is not None
-        else {"status": "NOT_STARTED", "fingerprint": fingerprint}
-    )
-    row["prediction_status"] = prediction.get("status")
-    pred_status = prediction.get("status")
-    if pred_status == "COMPLETED":
-        row["row_status"] = "ready"
-    elif pred_status == "FAILED":
-        row["row_status"] = "failed"
-    elif pred_status == "RUNNING":
-        row["row_status"] = "generating"
-    else:
-        row["row_status"] = "ready_to_generate"
+    for idx, fingerprint in fingerprints_by_row.items():
+        pred_status = statuses.get(fingerprint, "NOT_STARTED")
+        rows[idx]["prediction_status"] = pred_status
+        rows[idx]["row_status"] = PREP_ROW_STATUS_BY_PREDICTION.get(
+            pred_status, "ready_to_generate"
+        )
 
-    return row
+    if fields is not None:
+        keep = fields | {"prep_id"}
+        rows = [{key: value for key, value in row.items() if key in keep} for row in rows]
+    return rows
 
 
-def list_prep_sessions(request):
-    db_user = get_or_create_db_user(request.user)
-    sessions = PrepSession.objects.filter(user=db_user).order_by("-created_at")
-    results = []
-    for idx, prep_session in enumerate(sessions):
-        results.append(
-            compute_prep_session_row(
-                prep_session,
-                db_user,
-                request.user.id,
-                is_latest=(idx == 0),
-            )
+async def list_prep_sessions(request):
+    query = PrepSessionListQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response({"detail": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+    limit = query.validated_data.get("limit") or getattr(
+        settings, "PREP_SESSIONS_PAGE_SIZE", 50
+    )
+    cursor = query.validated_data.get("cursor")
+    statuses = query.validated_data.get("status") or []
+    fields = query.validated_data.get("fields")
+
+    db_user = await aget_or_create_db_user(request)
+    sessions = PrepSession.objects.filter(user=db_user).order_by("-created_at", "-id")
+    if statuses:
+        sessions = sessions.filter(status__in=statuses)
+    if cursor is not None:
+        cursor_created_at, cursor_id = cursor
+        sessions = sessions.filter(
+            Q(created_at__lt=cursor_created_at)
+            | Q(created_at=cursor_created_at, id__lt=cursor_id)
         )
-    return Response({"results": results})
+    if fields is None or fields & PREP_ROW_PROFILE_FIELDS:
+        sessions = sessions.prefetch_related("profile_submissions")
+
+    page = [prep_session async for prep_session in sessions[: limit + 1]]
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_prep_session_cursor(page[-1])
+
+    latest_id = None
+    if fields is None or "is_latest" in fields:
+        if cursor is None and not statuses:
+            latest_id = page[0].id if page else None
+        else:
+            latest_id = await (
+                PrepSession.objects.filter(user=db_user)
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)
+                .afirst()
+            )
+
+    results = await acompute_prep_session_rows(
+        page, db_user, latest_id=latest_id, fields=fields
+    )
+    return Response({"results": results, "next_cursor": next_cursor})
 
 
 def get_owned_prep_session(db_user, prep_id):
     try:
-        return PrepSession.objects.get(prep_id=prep_id, user=db_user)
+        return PrepSession.objects.select_related("current_prediction").get(
+            prep_id=prep_id, user=db_user
+        )
     except PrepSession.DoesNotExist:
         return None
 
 
-def build_prep_session_detail(prep_session, db_user, user_identifier):
+async def aget_owned_prep_session(db_user, prep_id):
+    """Async lookup; submissions are prefetched so profile state needs no more queries."""
+    return await (
+        PrepSession.objects.select_related("current_prediction")
+        .prefetch_related("profile_submissions")
+        .filter(prep_id=prep_id, user=db_user)
+        .afirst()
+    )
+
+
+def build_prep_session_detail(prep_session, db_user):
     profile_state = resolve_session_profile_state(prep_session, db_user)
-    pipeline_status = profile_state["pipeline_status"]
-    fingerprint = None
 
-    if pipeline_status == "READY_FOR_TOPIC_GENERATION":
-        interviewee, interviewer, interview_context = (
-            build_predict_payload_from_profile_state(
-                profile_state,
-                user_email=db_user.email,
-                prep_session=prep_session,
-            )
+    if profile_state["pipeline_status"] == "READY_FOR_TOPIC_GENERATION":
+        fingerprint = resolve_prep_session_fingerprint(
+            prep_session, db_user, profile_state
         )
-        payload, response_status, fingerprint = get_prediction_state(
-            user_identifier=user_identifier,
-            db_user=db_user,
-            interviewee=interviewee,
-            interviewer=interviewer,
-            interview_context=interview_context,
+        prediction, _ = build_session_prediction(prep_session, db_user, fingerprint)
+    else:
+        prediction = {"status": "NOT_READY"}
+
+    submissions = prep_session.profile_submissions.order_by("submitted_at").all()
+    return _prep_session_detail_body(prep_session, profile_state, prediction, submissions)
+
+
+async def abuild_prep_session_detail(prep_session, db_user):
+    profile_state = await aresolve_session_profile_state(prep_session, db_user)
+
+    if profile_state["pipeline_status"] == "READY_FOR_TOPIC_GENERATION":
+        fingerprint = await aresolve_prep_session_fingerprint(
+            prep_session, db_user, profile_state
+        )
+        prediction, _ = await abuild_session_prediction(
+            prep_session, db_user, fingerprint
         )
-        prediction = (
-            build_prediction_response(
-                payload,
-                response_status,
-                db_user=db_user,
-                fingerprint=fingerprint,
-            )
-            if payload is not None
-            else {"status": "NOT_STARTED", "fingerprint": fingerprint}
-        )
-        if prediction.get("status") == "COMPLETED" and fingerprint:
-            pred_obj = (
-                InterviewPrediction.objects.filter(
-                    fingerprint=fingerprint, user=db_user
-                )
-                .values("last_success_at")
-                .first()
-            )
-            if pred_obj and pred_obj["last_success_at"]:
-                prediction = {
-                    **prediction,
-                    "last_success_at": pred_obj["last_success_at"].isoformat(),
-                }
     else:
         prediction = {"status": "NOT_READY"}
 
+    submissions = sorted(
+        prep_session.profile_submissions.all(), key=lambda sub: sub.submitted_at
+    )
+    return _prep_session_detail_body(prep_session, profile_state, prediction, submissions)
+
+
+def _prep_session_detail_body(prep_session, profile_state, prediction, submissions):
     profile_submissions = [
         {
             "role": sub.role,
@@ -541,7 +801,7 @@ def build_prep_session_detail(prep_session, db_user, user_identifier):
             "profile_name": (sub.metadata or {}).get("profile_name", ""),
             "submitted_at": sub.submitted_at.isoformat(),
         }
-        for sub in prep_session.profile_submissions.order_by("submitted_at").all()
+        for sub in submissions
     ]
 
     response_body = {
@@ -558,19 +818,22 @@ def build_prep_session_detail(prep_session, db_user, user_identifier):
     return response_body
 
 
-@api_view(["GET", "POST"])
+@async_api_view(["GET", "POST"])
 @permission_classes([permissions.IsAuthenticated])
-def prep_sessions(request):
+async def prep_sessions(request):
     if request.method == "GET":
-        return list_prep_sessions(request)
+        return await list_prep_sessions(request)
+    return await sync_to_async(create_prep_session)(request)
+
 
+def create_prep_session(request):
     serializer = PrepSessionCreateSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(
             {"detail": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    db_user = get_or_create_db_user(request.user)
+    db_user = get_or_create_db_user(request)
     prep_session = PrepSession.objects.create(
         user=db_user,
         title=serializer.validated_data.get("title") or None,
@@ -588,55 +851,62 @@ def prep_sessions(request):
     )
 
 
-@api_view(["GET", "PATCH", "DELETE"])
+@async_api_view(["GET", "PATCH", "DELETE"])
 @permission_classes([permissions.IsAuthenticated])
-def prep_session_detail(request, prep_id):
-    db_user = get_or_create_db_user(request.user)
-    prep_session = get_owned_prep_session(db_user, prep_id)
+async def prep_session_detail(request, prep_id):
+    db_user = await aget_or_create_db_user(request)
+    prep_session = await aget_owned_prep_session(db_user, prep_id)
     if prep_session is None:
         return Response(
             {"detail": "Prep session not found."}, status=status.HTTP_404_NOT_FOUND
         )
 
     if request.method == "GET":
+        return Response(await abuild_prep_session_detail(prep_session, db_user))
+    if request.method == "PATCH":
+        return await sync_to_async(update_prep_session)(request, prep_session, db_user)
+    return await sync_to_async(archive_prep_session)(prep_session)
+
+
+def update_prep_session(request, prep_session, db_user):
+    serializer = PrepSessionUpdateSerializer(data=request.data, partial=True)
+    if not serializer.is_valid():
         return Response(
-            build_prep_session_detail(prep_session, db_user, request.user.id)
+            {"detail": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if not serializer.validated_data:
+        return Response(
+            {
+                "detail": "At least one of title, company_name, or status must be provided."
+            },
+            status=status.HTTP_400_BAD_REQUEST,
         )
 
-    if request.method == "PATCH":
-        serializer = PrepSessionUpdateSerializer(data=request.data, partial=True)
-        if not serializer.is_valid():
-            return Response(
-                {"detail": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
-            )
-        if not serializer.validated_data:
-            return Response(
-                {
-                    "detail": "At least one of title, company_name, or status must be provided."
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+    updated_fields = []
+    if "title" in serializer.validated_data:
+        prep_session.title = serializer.validated_data["title"] or None
+        updated_fields.append("title")
+    if "company_name" in serializer.validated_data:
+        prep_session.company_name = (
+            serializer.validated_data["company_name"] or None
+        )
+        updated_fields.append("company_name")
+    if "status" in serializer.validated_data:
+        prep_session.status = serializer.validated_data["status"]
+        updated_fields.append("status")
 
-        updated_fields = []
-        if "title" in serializer.validated_data:
-            prep_session.title = serializer.validated_data["title"] or None
-            updated_fields.append("title")
-        if "company_name" in serializer.validated_data:
-            prep_session.company_name = (
-                serializer.validated_data["company_name"] or None
-            )
-            updated_fields.append("company_name")
-        if "status" in serializer.validated_data:
-            prep_session.status = serializer.validated_data["status"]
-            updated_fields.append("status")
+    if updated_fields:
+        prep_session.save(update_fields=[*updated_fields, "updated_at"])
+    if {"title", "company_name"} & set(updated_fields):
+        # Title and company feed interview_context, which is part of the fingerprint.
+        refresh_prep_session_fingerprint(prep_session, db_user)
 
-        if updated_fields:
-            prep_session.save(update_fields=[*updated_fields, "updated_at"])
+    return Response(
+        build_prep_session_detail(prep_session, db_user)
+    )
 
-        return Response(
-            build_prep_session_detail(prep_session, db_user, request.user.id)
-        )
 
+def archive_prep_session(prep_session):
     if prep_session.status != PrepSession.STATUS_CLOSED:
         prep_session.status = PrepSession.STATUS_CLOSED
         prep_session.save(update_fields=["status", "updated_at"])
@@ -653,7 +923,7 @@ def prep_session_detail(request, prep_id):
 @api_view(["GET", "PUT"])
 @permission_classes([permissions.IsAuthenticated])
 def interviewee_baseline_profile(request):
-    db_user = get_or_create_db_user(request.user)
+    db_user = get_or_create_db_user(request)
     existing_profile = IntervieweeBaselineProfile.objects.filter(user=db_user).first()
 
     if request.method == "GET":
@@ -693,6 +963,7 @@ def interviewee_baseline_profile(request):
             "metadata": serializer.validated_data.get("metadata", {}),
         },
     )
+    refresh_baseline_dependent_fingerprints(db_user)
     return Response(
         {
             "exists": True,
@@ -718,7 +989,7 @@ def submit_prep_profile(request, prep_id):
             {"detail": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    db_user = get_or_create_db_user(request.user)
+    db_user = get_or_create_db_user(request)
     try:
         prep_session = PrepSession.objects.get(
             prep_id=prep_id, user=db_user, status=PrepSession.STATUS_ACTIVE
@@ -748,6 +1019,7 @@ def submit_prep_profile(request, prep_id):
     )
 
     profile_state = resolve_session_profile_state(prep_session, db_user)
+    refresh_prep_session_fingerprint(prep_session, db_user, profile_state)
 
     return Response(
         {
@@ -781,7 +1053,7 @@ def get_prep_session_role_profile(request, prep_id, role):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    db_user = get_or_create_db_user(request.user)
+    db_user = get_or_create_db_user(request)
     prep_session = get_owned_prep_session(db_user, prep_id)
     if prep_session is None:
         return Response(
@@ -818,8 +1090,9 @@ def get_prep_session_role_profile(request, prep_id, role):
 
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
+@throttle_classes([DailyUserThrottle, GenerationThrottle])
 def generate_prep_session_prediction(request, prep_id):
-    db_user = get_or_create_db_user(request.user)
+    db_user = get_or_create_db_user(request)
     try:
         prep_session = PrepSession.objects.get(
             prep_id=prep_id, user=db_user, status=PrepSession.STATUS_ACTIVE
@@ -878,11 +1151,20 @@ def generate_prep_session_prediction(request, prep_id):
         generation_source = (
             "cache" if prediction_status == status.HTTP_200_OK else "queued"
         )
+    if payload_fp:
+        store_prep_session_fingerprint(
+            prep_session,
+            payload_fp,
+            InterviewPrediction.objects.filter(
+                fingerprint=payload_fp, user=db_user
+            ).first(),
+        )
     prediction = build_prediction_response(
         prediction_payload,
         prediction_status,
         db_user=db_user,
         fingerprint=payload_fp,
+        prediction=prep_session.current_prediction,
     )
 
     return Response(
@@ -902,18 +1184,17 @@ def generate_prep_session_prediction(request, prep_id):
     )
 
 
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
-def get_prep_prediction(request, prep_id):
-    db_user = get_or_create_db_user(request.user)
-    try:
-        prep_session = PrepSession.objects.get(prep_id=prep_id, user=db_user)
-    except PrepSession.DoesNotExist:
+async def get_prep_prediction(request, prep_id):
+    db_user = await aget_or_create_db_user(request)
+    prep_session = await aget_owned_prep_session(db_user, prep_id)
+    if prep_session is None:
         return Response(
             {"detail": "Prep session not found."}, status=status.HTTP_404_NOT_FOUND
         )
 
-    profile_state = resolve_session_profile_state(prep_session, db_user)
+    profile_state = await aresolve_session_profile_state(prep_session, db_user)
     pipeline_status = profile_state["pipeline_status"]
 
     if pipeline_status != "READY_FOR_TOPIC_GENERATION":
@@ -926,47 +1207,142 @@ def get_prep_prediction(request, prep_id):
             status=status.HTTP_200_OK,
         )
 
-    interviewee, interviewer, interview_context = (
-        build_predict_payload_from_profile_state(
-            profile_state,
-            user_email=db_user.email,
-            prep_session=prep_session,
-        )
+    fingerprint = await aresolve_prep_session_fingerprint(
+        prep_session, db_user, profile_state
     )
-    payload, response_status, fingerprint = get_prediction_state(
-        user_identifier=request.user.id,
-        db_user=db_user,
-        interviewee=interviewee,
-        interviewer=interviewer,
-        interview_context=interview_context,
+    prediction, response_status = await abuild_session_prediction(
+        prep_session, db_user, fingerprint
     )
-    prediction = (
-        build_prediction_response(
-            payload,
-            response_status,
-            db_user=db_user,
-            fingerprint=fingerprint,
-        )
-        if payload is not None
-        else {"status": "NOT_STARTED", "fingerprint": fingerprint}
-    )
-    if prediction.get("status") == "COMPLETED":
-        pred_obj = (
-            InterviewPrediction.objects.filter(fingerprint=fingerprint, user=db_user)
-            .values("last_success_at")
-            .first()
-        )
-        if pred_obj and pred_obj["last_success_at"]:
-            prediction = {
-                **prediction,
-                "last_success_at": pred_obj["last_success_at"].isoformat(),
-            }
 
     return Response(
         {
             "prep_id": str(prep_session.prep_id),
             "prediction": prediction,
+            "fingerprint": fingerprint,
             **profile_state_response_fields(profile_state),
         },
         status=response_status or status.HTTP_200_OK,
     )
+
+
+def _prediction_event_snapshot(db_user, fingerprint):
+    payload, response_status = get_prediction_state_by_fingerprint(db_user, fingerprint)
+    if payload is None:
+        return {"status": "NOT_STARTED", "fingerprint": fingerprint}
+    prediction = build_prediction_response(
+        payload,
+        response_status,
+        db_user=db_user,
+        fingerprint=fingerprint,
+    )
+    return {**prediction, "fingerprint": fingerprint}
+
+
+async def astream_prediction_events(db_user, fingerprint):
+    """
+    SSE body for one prediction: the current state first, then relayed
+    pub/sub events until the job reaches a terminal status or the stream
+    times out (clients reconnect). Blocking pub/sub reads run in worker
+    threads and DB snapshots go through the thread-sensitive path.
+    """
+    # Subscribe before reading the snapshot so no transition can slip between them.
+    pubsub = await sync_to_async(subscribe_prediction_events, thread_sensitive=False)(
+        fingerprint
+    )
+    snapshot = await sync_to_async(_prediction_event_snapshot)(db_user, fingerprint)
+    yield format_sse(EVENT_STATUS, snapshot)
+    if pubsub is None or snapshot["status"] in TERMINAL_STATUSES:
+        if pubsub is not None:
+            pubsub.close()
+        return
+
+    stop = threading.Event()
+    events = iter_prediction_events(pubsub, stop=stop)
+    next_event = sync_to_async(next, thread_sensitive=False)
+    reading = False
+    try:
+        while True:
+            reading = True
+            item = await next_event(events, None)
+            reading = False
+            if item is None:
+                return
+            event_type, data = item
+            if event_type is None:
+                yield ": keepalive\n\n"
+                continue
+            if event_type == EVENT_STATUS and (data or {}).get("status") in TERMINAL_STATUSES:
+                snapshot = await sync_to_async(_prediction_event_snapshot)(db_user, fingerprint)
+                yield format_sse(EVENT_STATUS, snapshot)
+                return
+            yield format_sse(event_type, data)
+    finally:
+        stop.set()
+        # A disconnect while `next` runs in its worker thread cannot close the
+        # generator from here ("generator already executing"); that thread
+        # sees `stop` within one pub/sub poll and closes the subscription.
+        if not reading:
+            events.close()
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def prediction_detail(request, fingerprint):
+    """
+    Current state of one of the user's predictions. Failure payloads carry
+    `last_good_fallback` as `{"id", "fingerprint"}`; clients load the full
+    fallback result from here only when they show it.
+
+    Fingerprints mix in the owner, so a state-cache hit needs no ownership
+    query; the row is only read on a miss.
+    """
+    db_user = get_or_create_db_user(request)
+    payload, response_status = get_prediction_state_by_fingerprint(db_user, fingerprint)
+    if payload is None:
+        if not InterviewPrediction.objects.filter(fingerprint=fingerprint, user=db_user).exists():
+            return Response(
+                {"detail": "Prediction not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({"status": "NOT_STARTED", "fingerprint": fingerprint})
+    return Response(
+        {
+            **build_prediction_response(
+                payload, response_status, db_user=db_user, fingerprint=fingerprint
+            ),
+            "fingerprint": fingerprint,
+        },
+        status=response_status or status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def prediction_events(request, fingerprint):
+    """
+    Server-sent events for one of the user's predictions. ASGI only: under
+    WSGI a stream would pin a sync worker for its whole lifetime, so those
+    deployments get a 501 and poll `prediction_detail` instead. Browsers
+    cannot send the Bearer header through `EventSource`; consume this with
+    a streaming `fetch` that sets `Authorization`.
+    """
+    if not isinstance(request._request, ASGIRequest):
+        return Response(
+            {"detail": "Prediction events need the ASGI server; poll the prediction instead."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+
+    db_user = get_or_create_db_user(request)
+    if not InterviewPrediction.objects.filter(
+        fingerprint=fingerprint, user=db_user
+    ).exists():
+        return Response(
+            {"detail": "Prediction not found."}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    response = StreamingHttpResponse(
+        astream_prediction_events(db_user, fingerprint), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -106,10 +106,28 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ["api.auth.Auth0JWTAuthentication"],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "DEFAULT_THROTTLE_CLASSES": ["api.throttling.DailyUserThrottle"],
-    "DEFAULT_THROTTLE_RATES": {"user": f"{os.getenv('DAILY_RATELIMIT', '200')}/day"}
+    # `<scope>_premium` rates apply to PREMIUM users; the generation scope is
+    # counted in THROTTLE_GENERATION_COST units per generate call.
+    "DEFAULT_THROTTLE_RATES": {
+        "user": f"{os.getenv('DAILY_RATELIMIT', '200')}/day",
+        "user_premium": f"{os.getenv('PREMIUM_DAILY_RATELIMIT', '1000')}/day",
+        "generation": f"{os.getenv('GENERATION_DAILY_QUOTA', '30')}/day",
+        "generation_premium": f"{os.getenv('PREMIUM_GENERATION_DAILY_QUOTA', '300')}/day",
+    },
 }
 
 THROTTLE_EXEMPT_SUBS = os.getenv("THROTTLE_EXEMPT_SUBS", "")
+THROTTLE_GENERATION_COST = int(os.getenv("THROTTLE_GENERATION_COST", "1"))
+
+# Auth0 sub -> User rows are cached in Redis for USER_CACHE_TTL seconds and in
+# a per-process LRU (USER_CACHE_LOCAL_SIZE entries) for USER_CACHE_LOCAL_TTL.
+USER_CACHE_ENABLED = getenv_bool("USER_CACHE_ENABLED", "True")
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+USER_CACHE_LOCAL_TTL = float(os.getenv("USER_CACHE_LOCAL_TTL", "5"))
+USER_CACHE_LOCAL_SIZE = int(os.getenv("USER_CACHE_LOCAL_SIZE", "2048"))
+
+# Default page size for GET /api/prep-sessions/ (callers may pass ?limit= up to 200).
+PREP_SESSIONS_PAGE_SIZE = int(os.getenv("PREP_SESSIONS_PAGE_SIZE", "50"))
 
 from corsheaders.defaults import default_headers  # noqa: E402
 
@@ -120,6 +138,12 @@ CORS_ALLOW_HEADERS = list(default_headers) + ["authorization"]
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN", "")
 AUTH0_ISSUER = os.getenv("AUTH0_ISSUER", "")
 AUTH0_API_AUDIENCE = os.getenv("AUTH0_API_AUDIENCE", "")
+# Signing keys are cached process-wide for AUTH0_JWKS_TTL seconds; a token with
+# an unknown kid triggers a refresh at most every AUTH0_JWKS_MIN_REFRESH seconds.
+AUTH0_JWKS_TTL = int(os.getenv("AUTH0_JWKS_TTL", "3600"))
+AUTH0_JWKS_MIN_REFRESH = int(os.getenv("AUTH0_JWKS_MIN_REFRESH", "30"))
+# Recently verified tokens skip RS256 verification until they expire (0 = off).
+AUTH0_TOKEN_CACHE_SIZE = int(os.getenv("AUTH0_TOKEN_CACHE_SIZE", "1024"))
 FRONTEND_DASHBOARD_URL = os.getenv("FRONTEND_DASHBOARD_URL", "http://localhost:5173")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -135,6 +159,98 @@ AI_PROVIDER_PRIORITY = os.getenv("AI_PROVIDER_PRIORITY", "anthropic,openai")
 AI_COST_SCORE_ANTHROPIC = float(os.getenv("AI_COST_SCORE_ANTHROPIC", "1.0"))
 AI_COST_SCORE_OPENAI = float(os.getenv("AI_COST_SCORE_OPENAI", "1.2"))
 
+# AI_SELECTION_STRATEGY=adaptive routes each job to the provider with the best
+# expected completion time from rolling success, truncation and latency stats
+# (see api/provider_health.py). AI_BREAKER_THRESHOLD consecutive failures eject
+# a provider for AI_BREAKER_COOLDOWN seconds.
+AI_ADAPTIVE_MIN_SAMPLES = int(os.getenv("AI_ADAPTIVE_MIN_SAMPLES", "20"))
+AI_ADAPTIVE_REFRESH_SECONDS = float(os.getenv("AI_ADAPTIVE_REFRESH_SECONDS", "5"))
+AI_BREAKER_THRESHOLD = int(os.getenv("AI_BREAKER_THRESHOLD", "5"))
+AI_BREAKER_COOLDOWN = int(os.getenv("AI_BREAKER_COOLDOWN", "60"))  # seconds
+
+# Ask providers for the topic map as a structured object (Anthropic forced tool
+# call, OpenAI strict json_schema) instead of free-form JSON text. Opt-in:
+# truncated structured output is salvaged but never continued, so enabling it
+# gives up AI_TRUNCATION_RECOVERY continuations.
+AI_STRUCTURED_OUTPUT = getenv_bool("AI_STRUCTURED_OUTPUT", "False")
+
+# Recovery for provider responses cut off at max_tokens. Anthropic text output
+# is continued from where it stopped (assistant prefill) up to
+# AI_TRUNCATION_CONTINUATIONS times; otherwise complete topics are salvaged.
+AI_TRUNCATION_RECOVERY = getenv_bool("AI_TRUNCATION_RECOVERY", "True")
+AI_TRUNCATION_CONTINUATIONS = int(os.getenv("AI_TRUNCATION_CONTINUATIONS", "1"))
+# 429/5xx responses are retried AI_RETRY_ATTEMPTS times. Retry-After is honoured
+# up to AI_RETRY_MAX_DELAY; otherwise exponential backoff with jitter.
+AI_RETRY_ATTEMPTS = int(os.getenv("AI_RETRY_ATTEMPTS", "2"))
+AI_RETRY_BACKOFF = float(os.getenv("AI_RETRY_BACKOFF", "1.0"))  # seconds
+AI_RETRY_MAX_DELAY = float(os.getenv("AI_RETRY_MAX_DELAY", "30"))  # seconds
+
+# Pooled keep-alive HTTP sessions for provider calls (see api/provider_transport.py).
+# AI_HTTP_POOL_CONNECTIONS = distinct hosts cached per provider session,
+# AI_HTTP_POOL_MAXSIZE = open connections kept per host.
+AI_HTTP_POOL_CONNECTIONS = int(os.getenv("AI_HTTP_POOL_CONNECTIONS", "2"))
+AI_HTTP_POOL_MAXSIZE = int(os.getenv("AI_HTTP_POOL_MAXSIZE", "10"))
+
+# Stream provider responses and persist each topic as it completes, so RUNNING
+# polls can show partial topics before the full response has arrived.
+AI_STREAM_RESPONSES = getenv_bool("AI_STREAM_RESPONSES", "False")
+
+# Mark the static PROMPT_SYSTEM block as a cacheable prefix (Anthropic
+# cache_control); cached-token counts are stored on InterviewPrediction.usage.
+AI_PROMPT_CACHING = getenv_bool("AI_PROMPT_CACHING", "True")
+
+# Shared input-token budget for both profiles' text, estimated per provider.
+# Profiles under budget are sent untouched; over it, the oldest and
+# lowest-priority lines are dropped first.
+AI_PROFILE_TOKEN_BUDGET = int(os.getenv("AI_PROFILE_TOKEN_BUDGET", "6000"))
+
+# How the Celery worker runs prediction jobs (see api/async_executor.py):
+# "sync" runs each job inside its task; "asyncio" hands it to a per-process
+# event loop so one worker multiplexes up to AI_ASYNC_CONCURRENCY provider calls.
+PREDICTION_EXECUTION_MODE = os.getenv("PREDICTION_EXECUTION_MODE", "sync").strip().lower()
+AI_ASYNC_CONCURRENCY = int(os.getenv("AI_ASYNC_CONCURRENCY", "32"))
+AI_ASYNC_MAX_CONNECTIONS = int(os.getenv("AI_ASYNC_MAX_CONNECTIONS", "100"))  # per provider
+AI_ASYNC_DRAIN_TIMEOUT = int(os.getenv("AI_ASYNC_DRAIN_TIMEOUT", "60"))  # seconds on shutdown
+# asyncio mode acks a task once its job is on the loop, so a hard-killed worker
+# loses in-flight jobs. A poll that finds a (non-batch) RUNNING row untouched
+# for this long fails it so the user can regenerate; a DRAFT row is settled
+# as COMPLETED with its draft. 0 disables the check.
+PREDICTION_RUNNING_TIMEOUT = int(os.getenv("PREDICTION_RUNNING_TIMEOUT", "1800"))
+
+# Hedged provider requests: if the primary provider has not answered within
+# its observed AI_HEDGE_PERCENTILE latency (or fails outright), the same
+# request goes to the other configured provider and the first valid result
+# wins. Latency histograms cover the last AI_LATENCY_WINDOW_HOURS hours; until
+# AI_HEDGE_MIN_SAMPLES calls are recorded, AI_HEDGE_DEFAULT_DEADLINE is used.
+AI_HEDGING = getenv_bool("AI_HEDGING", "False")
+AI_HEDGE_PERCENTILE = float(os.getenv("AI_HEDGE_PERCENTILE", "95"))
+AI_HEDGE_MIN_SAMPLES = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))
+AI_HEDGE_DEFAULT_DEADLINE = float(os.getenv("AI_HEDGE_DEFAULT_DEADLINE", "60"))  # seconds
+AI_LATENCY_WINDOW_HOURS = int(os.getenv("AI_LATENCY_WINDOW_HOURS", "24"))
+
+# Two-tier generation: a fast draft model answers alongside the main model, its
+# topic map is stored with DRAFT status and replaced by the refined result when
+# ready. Replaces per-topic streaming while enabled. No draft is made when the
+# draft model equals the main one.
+AI_DRAFT_TIER = getenv_bool("AI_DRAFT_TIER", "False")
+AI_DRAFT_MODEL_ANTHROPIC = os.getenv("AI_DRAFT_MODEL_ANTHROPIC", "claude-haiku-4-5")
+AI_DRAFT_MODEL_OPENAI = os.getenv("AI_DRAFT_MODEL_OPENAI", "gpt-4o-mini")
+
+# Bulk regeneration through provider batch APIs (see api/prediction_batch.py and
+# `manage.py batch_regenerate_predictions`). AI_BATCH_PROVIDER overrides the
+# interactive provider choice; the base URLs exist for local fake servers.
+AI_BATCH_PROVIDER = os.getenv("AI_BATCH_PROVIDER", "")
+AI_BATCH_MAX_REQUESTS = int(os.getenv("AI_BATCH_MAX_REQUESTS", "1000"))  # per submitted batch
+AI_BATCH_POLL_INTERVAL = int(os.getenv("AI_BATCH_POLL_INTERVAL", "60"))  # seconds
+# Batch rows stay RUNNING (so those sessions get no interactive result) until
+# the batch ends; polling gives up and fails them after this many seconds.
+# Provider batches expire after 24h, so the default leaves an hour of slack.
+# If the poll task itself is lost, reads fail such rows past this age and
+# `manage.py batch_regenerate_predictions --expire-stale` closes the batches.
+AI_BATCH_MAX_AGE = int(os.getenv("AI_BATCH_MAX_AGE", "90000"))  # seconds
+AI_BATCH_ANTHROPIC_BASE_URL = os.getenv("AI_BATCH_ANTHROPIC_BASE_URL", "https://api.anthropic.com")
+AI_BATCH_OPENAI_BASE_URL = os.getenv("AI_BATCH_OPENAI_BASE_URL", "https://api.openai.com")
+
 # ------- CACHING / REDIS CONFIGURATION -------
 
 # Feature flag: ENABLE_CACHING
@@ -153,6 +269,34 @@ CACHES = {
 # Tuneable TTLs (seconds)
 CACHE_TTL_RUNNING = int(os.getenv("CACHE_TTL_RUNNING", "300"))   # lock TTL (default 5m)
 CACHE_TTL_RESULT = int(os.getenv("CACHE_TTL_RESULT", "86400"))  # result cache (default 24h)
+CACHE_TTL_STATUS = int(os.getenv("CACHE_TTL_STATUS", "15"))     # RUNNING/DRAFT/FAILED state cache
+
+# Prediction polls read a per-process LRU of completed results, then Redis,
+# and only then the database; jobs write every state transition through.
+PREDICTION_STATE_CACHE_ENABLED = getenv_bool("PREDICTION_STATE_CACHE_ENABLED", "True")
+PREDICTION_STATE_LOCAL_TTL = float(os.getenv("PREDICTION_STATE_LOCAL_TTL", "60"))
+PREDICTION_STATE_LOCAL_SIZE = int(os.getenv("PREDICTION_STATE_LOCAL_SIZE", "1024"))
+
+# Opt-in cross-user generation cache: identical (profiles, context, prompt
+# version, model) jobs coalesce into one provider call and reuse its result.
+AI_SHARED_GENERATION_CACHE = getenv_bool("AI_SHARED_GENERATION_CACHE", "False")
+CACHE_TTL_SHARED_GENERATION = int(os.getenv("CACHE_TTL_SHARED_GENERATION", "86400"))
+# Max seconds a job waits on an in-flight twin before generating on its own;
+# waiting blocks the worker, so keep this far below CACHE_TTL_RUNNING.
+AI_SHARED_GENERATION_WAIT = float(os.getenv("AI_SHARED_GENERATION_WAIT", "20"))
+
+# Opt-in two-stage pipeline: an interviewer digest ("Map B") is generated once
+# per interviewer profile and reused by every candidate prepping against them.
+AI_INTERVIEWER_DIGEST = getenv_bool("AI_INTERVIEWER_DIGEST", "False")
+INTERVIEWER_DIGEST_TTL = int(os.getenv("INTERVIEWER_DIGEST_TTL", str(30 * 86400)))  # default 30d
+INTERVIEWER_DIGEST_MAX_ROWS = int(os.getenv("INTERVIEWER_DIGEST_MAX_ROWS", "5000"))  # LRU cap
+# Fraction of digest misses that also run expiry + LRU trimming; the cap is
+# approximate in exchange for keeping the DELETE scans off most misses.
+INTERVIEWER_DIGEST_EVICT_RATE = float(os.getenv("INTERVIEWER_DIGEST_EVICT_RATE", "0.05"))
+
+# Server-Sent Events for prediction progress (GET /api/predictions/<fingerprint>/events).
+PREDICTION_EVENTS_TIMEOUT = int(os.getenv("PREDICTION_EVENTS_TIMEOUT", "60"))   # max stream length
+PREDICTION_EVENTS_KEEPALIVE = int(os.getenv("PREDICTION_EVENTS_KEEPALIVE", "15"))  # idle comment interval
 
 # ------- CELERY CONFIGURATION -------
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://127.0.0.1:6379/0"
@@ -24,6 +24,24 @@ function estimateTokensFromChars(charCount) {
   return Math.max(0, Math.ceil(charCount / 4));
 }
 
+// Mirrors estimate_tokens() in backend/api/profile_trim.py: word pieces of up
+// to 6 characters count as one token, digits group in threes and each
+// punctuation mark is its own token.
+const TOKEN_PIECE_RE = /\p{L}+|\p{N}+|[^\p{L}\p{N}\s]|\n/gu;
+
+function estimateTokensFromText(text) {
+  const pieces = String(text ?? "").match(TOKEN_PIECE_RE) || [];
+  return pieces.reduce((sum, piece) => {
+    if (/^\p{N}+$/u.test(piece)) {
+      return sum + Math.ceil(piece.length / 3);
+    }
+    if (/^\p{L}+$/u.test(piece)) {
+      return sum + Math.ceil(piece.length / 6);
+    }
+    return sum + 1;
+  }, 0);
+}
+
 function sectionCharCount(sections, key) {
   const values = sections?.[key];
   if (!Array.isArray(values)) {
@@ -32,6 +50,14 @@ function sectionCharCount(sections, key) {
   return values.reduce((sum, item) => sum + String(item ?? "").length, 0);
 }
 
+function sectionTokenCount(sections, key) {
+  const values = sections?.[key];
+  if (!Array.isArray(values)) {
+    return 0;
+  }
+  return values.reduce((sum, item) => sum + estimateTokensFromText(item), 0);
+}
+
 function hasAnySectionContent(sections) {
   return SECTION_KEYS.some((key) => sectionCharCount(sections, key) > 0);
 }
@@ -42,7 +68,10 @@ function formatSectionLabel(key) {
 
 function estimateProfileSize(sections) {
   const chars = SECTION_KEYS.reduce((sum, key) => sum + sectionCharCount(sections, key), 0);
-  const estimatedTokens = estimateTokensFromChars(chars);
+  const estimatedTokens = SECTION_KEYS.reduce(
+    (sum, key) => sum + sectionTokenCount(sections, key),
+    0
+  );
   const blockTokens = PROFILE_SIZE_LIMITS.BLOCK_TOKENS;
   const percent =
     blockTokens > 0 ? Math.min(100, Math.round((estimatedTokens / blockTokens) * 100)) : 0;
@@ -67,7 +96,7 @@ function estimateProfileSize(sections) {
       key,
       label: formatSectionLabel(key),
       chars: sectionChars,
-      estimatedTokens: estimateTokensFromChars(sectionChars),
+      estimatedTokens: sectionTokenCount(sections, key),
     };
   }).filter((row) => row.chars > 0);
 
@@ -89,4 +118,5 @@ export {
   PROFILE_SIZE_LIMITS,
   estimateProfileSize,
   estimateTokensFromChars,
+  estimateTokensFromText,
 };
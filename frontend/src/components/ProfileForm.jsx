@@ -1,10 +1,21 @@
-import React, { useCallback, useEffect, useMemo, useState } from 'react'
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react'
 import { Form, Button, Row, Col, Spinner, Card, Alert, ListGroup, Badge, FormControl } from 'react-bootstrap'
 import axios from 'axios'
 import { useAuth0 } from '@auth0/auth0-react'
 import ReactMarkdown from 'react-markdown'
 import remarkGfm from 'remark-gfm'
 
+// GET /api/prep-sessions/ is keyset-paginated; the list loads one page and
+// fetches older ones as it is scrolled. Only active sessions and the row
+// fields rendered below are requested.
+const SESSIONS_PAGE_LIMIT = 50
+// Largest page the API accepts (PrepSessionListQuerySerializer.MAX_LIMIT).
+const SESSIONS_MAX_LIMIT = 200
+const SESSION_LIST_PARAMS = {
+  status: 'ACTIVE',
+  fields: 'prep_id,title,company_name,created_at,is_latest,row_status',
+}
+
 function formatSessionPrimaryLabel(session) {
   const parts = []
   if (session.title?.trim()) parts.push(session.title.trim())
@@ -86,6 +97,42 @@ function extractMarkdown(result) {
   return raw
 }
 
+/**
+ * Reads GET /api/predictions/<fingerprint>/events and calls onEvent(type, data)
+ * for each server-sent event. EventSource cannot send the Bearer header, so
+ * the stream is read through fetch. Resolves when the server ends the stream
+ * (terminal status or timeout); rejects when events are unavailable, e.g. the
+ * 501 a WSGI deployment answers with.
+ */
+async function streamPredictionEvents(url, token, signal, onEvent) {
+  const resp = await fetch(url, {
+    headers: { Authorization: `Bearer ${token}`, Accept: 'text/event-stream' },
+    signal,
+  })
+  if (!resp.ok || !resp.body) {
+    throw new Error(`Prediction events unavailable (${resp.status})`)
+  }
+  const reader = resp.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) return
+    buffer += value
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      let type = 'message'
+      const data = []
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event:')) type = line.slice(6).trim()
+        else if (line.startsWith('data:')) data.push(line.slice(5).trim())
+      }
+      if (data.length) onEvent(type, JSON.parse(data.join('\n')))
+    }
+  }
+}
+
 function likelihoodBadgeVariant(likelihood) {
   if (likelihood === 'HIGH') return 'danger'
   if (likelihood === 'MEDIUM') return 'warning'
@@ -138,6 +185,12 @@ export default function ProfileForm() {
   const [sessions, setSessions] = useState([])
   const [sessionsLoading, setSessionsLoading] = useState(true)
   const [sessionsError, setSessionsError] = useState(null)
+  const [sessionsCursor, setSessionsCursor] = useState(null)
+  const [sessionsLoadingMore, setSessionsLoadingMore] = useState(false)
+  const loadedSessionCount = useRef(0)
+  // Set once the events stream is refused (WSGI deployments answer 501);
+  // from then on running predictions are polled.
+  const predictionEventsUnavailable = useRef(false)
   const [sessionFilter, setSessionFilter] = useState('')
   const [selectedPrepId, setSelectedPrepId] = useState('')
   const [createTitle, setCreateTitle] = useState('')
@@ -212,13 +265,24 @@ export default function ProfileForm() {
     setSessionsError(null)
     try {
       const token = await getToken()
+      // A silent refresh re-reads the rows already on screen in one request,
+      // so statuses update without dropping pages loaded by scrolling.
+      const limit = silent
+        ? Math.min(Math.max(loadedSessionCount.current, SESSIONS_PAGE_LIMIT), SESSIONS_MAX_LIMIT)
+        : SESSIONS_PAGE_LIMIT
       const resp = await axios.get(`${apiBase}/api/prep-sessions/`, {
         headers: { Authorization: `Bearer ${token}` },
+        params: { ...SESSION_LIST_PARAMS, limit },
       })
-      setSessions(resp.data?.results || [])
+      const rows = resp.data?.results || []
+      loadedSessionCount.current = rows.length
+      setSessions(rows)
+      setSessionsCursor(resp.data?.next_cursor || null)
     } catch (err) {
       setSessionsError(err?.response?.data?.detail || err.message || 'Failed to load prep sessions')
+      loadedSessionCount.current = 0
       setSessions([])
+      setSessionsCursor(null)
     } finally {
       if (!silent) {
         setSessionsLoading(false)
@@ -226,6 +290,40 @@ export default function ProfileForm() {
     }
   }, [apiBase, getToken])
 
+  const loadMoreSessions = useCallback(async () => {
+    if (!sessionsCursor || sessionsLoadingMore) return
+    setSessionsLoadingMore(true)
+    try {
+      const token = await getToken()
+      const resp = await axios.get(`${apiBase}/api/prep-sessions/`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { ...SESSION_LIST_PARAMS, limit: SESSIONS_PAGE_LIMIT, cursor: sessionsCursor },
+      })
+      const rows = resp.data?.results || []
+      setSessions((current) => {
+        const known = new Set(current.map((s) => s.prep_id))
+        const merged = [...current, ...rows.filter((s) => !known.has(s.prep_id))]
+        loadedSessionCount.current = merged.length
+        return merged
+      })
+      setSessionsCursor(resp.data?.next_cursor || null)
+    } catch (err) {
+      setSessionsError(err?.response?.data?.detail || err.message || 'Failed to load more prep sessions')
+    } finally {
+      setSessionsLoadingMore(false)
+    }
+  }, [apiBase, getToken, sessionsCursor, sessionsLoadingMore])
+
+  const onSessionListScroll = useCallback(
+    (e) => {
+      const el = e.currentTarget
+      if (el.scrollTop + el.clientHeight >= el.scrollHeight - 48) {
+        loadMoreSessions()
+      }
+    },
+    [loadMoreSessions]
+  )
+
   useEffect(() => {
     loadSessions()
   }, [loadSessions])
@@ -241,16 +339,18 @@ export default function ProfileForm() {
 
   useEffect(() => {
     if (sessionsLoading) return
-    if (!sessions.length) {
-      setSelectedPrepId('')
-      return
-    }
     if (selectedPrepId && sessions.some((s) => s.prep_id === selectedPrepId)) {
       return
     }
+    // A ?prep_id= deep link may point past the loaded page or at a closed
+    // session; selecting it loads that session by id through the detail call.
     const fromUrl = new URLSearchParams(window.location.search).get('prep_id')
-    if (fromUrl && sessions.some((s) => s.prep_id === fromUrl)) {
-      setSelectedPrepId(fromUrl)
+    if (fromUrl) {
+      if (fromUrl !== selectedPrepId) setSelectedPrepId(fromUrl)
+      return
+    }
+    if (!sessions.length) {
+      setSelectedPrepId('')
       return
     }
     const first = sessions[0].prep_id
@@ -306,6 +406,49 @@ export default function ProfileForm() {
 
     let cancelled = false
     let pollTimer
+    let refetchTimer
+    let eventsAbort
+    let watching = false
+
+    // Running predictions are refreshed on server events; each burst of
+    // events triggers one re-read. Without events, poll every 3s.
+    function scheduleRefetch(delay) {
+      if (refetchTimer) return
+      refetchTimer = setTimeout(() => {
+        refetchTimer = null
+        fetchPrediction(false)
+      }, delay)
+    }
+
+    async function watchPrediction(fingerprint) {
+      watching = true
+      eventsAbort = new AbortController()
+      try {
+        const token = await getToken()
+        await streamPredictionEvents(
+          `${apiBase}/api/predictions/${encodeURIComponent(fingerprint)}/events`,
+          token,
+          eventsAbort.signal,
+          () => scheduleRefetch(500)
+        )
+      } catch (_) {
+        if (cancelled) return
+        predictionEventsUnavailable.current = true
+      } finally {
+        watching = false
+      }
+      // The stream ended (terminal status or server timeout): re-read, which
+      // reconnects if the prediction is still running.
+      if (!cancelled) scheduleRefetch(0)
+    }
+
+    function followRunningPrediction(fingerprint) {
+      if (fingerprint && !predictionEventsUnavailable.current) {
+        if (!watching) watchPrediction(fingerprint)
+        return
+      }
+      pollTimer = setTimeout(() => fetchPrediction(false), 3000)
+    }
 
     async function fetchPrediction(isFirst) {
       try {
@@ -323,8 +466,8 @@ export default function ProfileForm() {
         if (cancelled) return
         setPredictionData(resp.data)
         const st = resp.data?.prediction?.status
-        if (st === 'RUNNING') {
-          pollTimer = setTimeout(() => fetchPrediction(false), 3000)
+        if (st === 'RUNNING' || st === 'DRAFT') {
+          followRunningPrediction(resp.data?.fingerprint)
         } else if (st === 'COMPLETED' || st === 'FAILED') {
           loadSessions({ silent: true })
         }
@@ -345,9 +488,11 @@ export default function ProfileForm() {
     return () => {
       cancelled = true
       if (pollTimer) clearTimeout(pollTimer)
+      if (refetchTimer) clearTimeout(refetchTimer)
+      if (eventsAbort) eventsAbort.abort()
     }
   // predictionRefreshKey in deps allows manual re-trigger: incrementing it
-  // causes the cleanup to cancel any pending poll and starts a fresh fetch.
+  // causes the cleanup to cancel any pending poll or event stream and starts a fresh fetch.
   }, [selectedPrepId, apiBase, getToken, predictionRefreshKey, loadSessions])
 
   const manualRefreshPrediction = useCallback(() => {
@@ -592,7 +737,7 @@ export default function ProfileForm() {
           </div>
 
           {/* Session list */}
-          <div className="px-2 py-1" style={{ overflowY: 'auto', flex: 1 }}>
+          <div className="px-2 py-1" style={{ overflowY: 'auto', flex: 1 }} onScroll={onSessionListScroll}>
             {sessionsLoading && (
               <div className="text-muted py-3 px-2 small">
                 <Spinner animation="border" size="sm" className="me-2" />
@@ -648,6 +793,19 @@ export default function ProfileForm() {
                 })}
               </ListGroup>
             )}
+            {!sessionsLoading && sessionsCursor && (
+              <div className="text-center py-2">
+                <Button
+                  variant="link"
+                  size="sm"
+                  onClick={loadMoreSessions}
+                  disabled={sessionsLoadingMore}
+                  style={{ fontSize: '0.78rem' }}
+                >
+                  {sessionsLoadingMore ? <Spinner animation="border" size="sm" /> : 'Load older sessions'}
+                </Button>
+              </div>
+            )}
           </div>
         </div>
 
@@ -862,8 +1020,14 @@ export default function ProfileForm() {
                           : 'Waiting for both interviewee and interviewer profiles for this session. Submit the missing profile from the extension.'}
                     </Alert>
                   )}
+                  {predictionData.pipeline_status === 'READY_FOR_TOPIC_GENERATION' &&
+                    predictionData.prediction?.status === 'DRAFT' && (
+                      <Alert variant="info" className="mb-2">
+                        This is a quick first draft. The full version will replace it automatically.
+                      </Alert>
+                    )}
                                     {predictionData.pipeline_status === 'READY_FOR_TOPIC_GENERATION' &&
-                    predictionData.prediction?.status === 'COMPLETED' &&
+                    ['COMPLETED', 'DRAFT'].includes(predictionData.prediction?.status) &&
                     (predictionData.prediction?.result?.topics?.length > 0 ||
                       predictionData.prediction?.result?.markdown ||
                       predictionData.prediction?.result?.html) && (